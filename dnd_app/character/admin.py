@@ -34,13 +34,17 @@ class InventoryAdmin(admin.ModelAdmin):
         "total_value",
         "available_capacity",
     )
+    readonly_fields = ("total_weight", "total_value", "available_capacity")
     search_fields = ("name",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("characterinventory_set")
+
     # Custom method to display related Character IDs
     def character_ids(self, obj):
         # Get the related CharacterInventory objects and return the Character IDs
         return ", ".join(
-            str(ci.character.id) for ci in obj.characterinventory_set.all()
+            str(ci.character_id) for ci in obj.characterinventory_set.all()
         )
 
     character_ids.short_description = "Character ID(s)"
@@ -87,6 +91,17 @@ class CharacterSkillInline(LockedInline):
     extra = 0
     readonly_fields = ("total_bonus",)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("skill")
+
+    def get_formset(self, request, obj=None, **kwargs):
+        # totals of every row come from the sheet of the character, prefetched by CharacterAdmin
+        self.skill_totals = obj.sheet.skill_totals if obj else {}
+        return super().get_formset(request, obj, **kwargs)
+
+    def total_bonus(self, obj):
+        return self.skill_totals.get(obj.skill.name)
+
 
 @admin.register(Character)
 class CharacterAdmin(admin.ModelAdmin):
@@ -112,3 +127,6 @@ class CharacterAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     list_filter = ("alignment", "level")
     raw_id_fields = ("additionally_learned_languages",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_sheet_data()
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CharacterConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "character"
+
+    def ready(self):
+        from character.signals import connect_signals
+
+        connect_signals()
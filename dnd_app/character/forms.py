@@ -5,10 +5,9 @@ from common.models import Ability, Language
 from feat.models import Feat
 from .models import (
     Character,
-    CharacterSkill,
-    CharacterLanguage,
     CharacterCharacterClass,
 )
+from .services import add_automatic_languages, add_class_skills
 
 
 class CharacterCharacterClassForm(forms.ModelForm):
@@ -21,13 +20,7 @@ class CharacterCharacterClassForm(forms.ModelForm):
         """
         Adds the skills from the character's class to the character.
         """
-        # Get the character class linked to this character
-        character_class = character_character_class.character_class
-
-        for class_skill in character_class.class_skills.all():
-            CharacterSkill.objects.get_or_create(
-                character=character_character_class.character, skill=class_skill
-            )
+        add_class_skills([character_character_class])
 
     class Meta:
         model = CharacterCharacterClass
@@ -39,11 +32,7 @@ class CharacterForm(forms.ModelForm):
         """
         Creates the many-to-many relationship between character and automatic languages from race
         """
-        race_languages = character.race.racelanguage_set.filter(is_automatic=True)
-        for race_language in race_languages:
-            CharacterLanguage.objects.get_or_create(
-                character=character, language=race_language.language, is_automatic=True
-            )
+        add_automatic_languages([character])
 
     def save(self, commit=True):
         character = super().save(commit=True)
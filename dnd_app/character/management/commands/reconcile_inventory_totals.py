@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from character.models import Inventory
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates the stored total weight and value of inventories "
+        "that no longer match the items they hold"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the inventories with stale totals",
+        )
+
+    def handle(self, *args, **kwargs):
+        stale = list(Inventory.objects.with_stale_totals())
+        for inventory in stale:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"'{inventory.name}': weight {inventory.total_weight} -> "
+                    f"{inventory.expected_weight}, value {inventory.total_value} -> "
+                    f"{inventory.expected_value}"
+                )
+            )
+        if kwargs["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"Found {len(stale)} inventories with stale totals")
+            )
+            return
+
+        Inventory.objects.filter(
+            pk__in=[inventory.pk for inventory in stale]
+        ).update_totals()
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled totals of {len(stale)} inventories")
+        )
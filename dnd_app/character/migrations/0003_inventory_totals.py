@@ -0,0 +1,59 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:34
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def calculate_inventory_totals(apps, schema_editor):
+    Inventory = apps.get_model("character", "Inventory")
+    InventoryItem = apps.get_model("character", "InventoryItem")
+    stacks = (
+        InventoryItem.objects.filter(inventory=OuterRef("pk"))
+        .values("inventory")
+        .annotate(
+            weight=Sum(
+                F("quantity") * Coalesce("item__weight_in_lb", Value(Decimal(0)))
+            ),
+            value=Sum(F("quantity") * Coalesce("item__price_in_gp", Value(Decimal(0)))),
+        )
+    )
+    Inventory.objects.update(
+        total_weight=Coalesce(
+            Subquery(stacks.values("weight")),
+            Value(Decimal(0)),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+        total_value=Coalesce(
+            Subquery(stacks.values("value")),
+            Value(Decimal(0)),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("character", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="inventory",
+            name="total_value",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=12
+            ),
+        ),
+        migrations.AddField(
+            model_name="inventory",
+            name="total_weight",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=12
+            ),
+        ),
+        migrations.RunPython(calculate_inventory_totals, migrations.RunPython.noop),
+    ]
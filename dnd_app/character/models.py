@@ -1,8 +1,10 @@
+from functools import cached_property
+
 from django.db import models
 
+from character.querysets import CharacterQuerySet, InventoryQuerySet
 from character_class.models import CharacterClass
 from common.models import Ability, Alignment, Language
-from utils.string_formatters import format_bab_into_multiattack
 from feat.models import Feat
 from item.models import Item
 from race.models import Race
@@ -14,33 +16,22 @@ class Inventory(models.Model):
     This model represents the inventory of a character.
     """
 
+    objects = InventoryQuerySet.as_manager()
+
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100, unique=True)
     capacity = models.IntegerField(default=0)
+    # kept up to date by character.signals whenever an inventory item or an item changes
+    total_weight = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, editable=False
+    )
+    total_value = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, editable=False
+    )
 
     # M2M
     items = models.ManyToManyField(Item, blank=True, through="InventoryItem")
 
-    @property
-    def total_weight(self):
-        """
-        Returns the total weight of all items in the inventory, considering their quantity.
-        """
-        return sum(
-            inventory_item.item_stack_weight
-            for inventory_item in self.inventoryitem_set.all()
-        )
-
-    @property
-    def total_value(self):
-        """
-        Returns the total value of all items in the inventory.
-        """
-        return sum(
-            inventory_item.item_stack_value
-            for inventory_item in self.inventoryitem_set.all()
-        )
-
     @property
     def available_capacity(self):
         """
@@ -62,6 +53,7 @@ class InventoryItem(models.Model):
 
     id = models.AutoField(primary_key=True)
     quantity = models.IntegerField(default=1)
+    is_equipped = models.BooleanField(default=False)
 
     # FK
     inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE)
@@ -81,6 +73,14 @@ class InventoryItem(models.Model):
         """
         return self.item.price_in_gp * self.quantity
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the inventory the stack was loaded in, whose totals change if it is moved
+        if "inventory_id" in instance.__dict__:
+            instance._loaded_inventory_id = instance.inventory_id
+        return instance
+
     def __str__(self):
         return f"{self.inventory.name} - {self.item.name}: {self.quantity}"
 
@@ -93,6 +93,8 @@ class Character(models.Model):
     This model represent player character
     """
 
+    objects = CharacterQuerySet.as_manager()
+
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=100)
     level = models.IntegerField(default=1)
@@ -134,76 +136,65 @@ class Character(models.Model):
     )
     skills = models.ManyToManyField(Skill, blank=True, through="CharacterSkill")
 
+    @cached_property
+    def sheet(self):
+        """
+        Returns the character sheet, which computes all derived stats from prefetched data.
+        The sheet is built once per instance; `save()` and `refresh_from_db()` drop it.
+        """
+        from character.sheet import CharacterSheet
+
+        return CharacterSheet(self)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.__dict__.pop("sheet", None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop("sheet", None)
+
     @property
     def class_levels(self):
         """
         Returns the character's level based on the sum of levels in all character classes.
         """
-        return sum(
-            [
-                character_class.level
-                for character_class in self.charactercharacterclass_set.all()
-            ]
-        )
+        return self.sheet.class_levels
 
     def get_save_for_ability(self, ability):
         """
         Returns the character's save bonus for the specified ability.
         It consists of all the bonuses from the character's classes + selected ability modifier.
         """
-        bonus_from_classes = sum(
-            character_class.character_class.bsb_progression.filter(
-                ability__name=ability
-            )
-            .first()
-            .get_save_bonus_for_lvl(character_class.level)
-            for character_class in self.charactercharacterclass_set.all()
-            if character_class.character_class.bsb_progression.filter(
-                ability__name=ability
-            ).first()
-        )
-
-        ability_score = self.characterabilityscore_set.filter(
-            ability__name=ability
-        ).first()
-
-        if ability_score:
-            return bonus_from_classes + ability_score.modifier
-        else:
-            return bonus_from_classes
+        return self.sheet.get_save_for_ability(ability)
 
     @property
     def fortitude_save(self):
         """
         Returns the character's fortitude save bonus.
         """
-        return self.get_save_for_ability("Constitution") + self.fortitude_save_bonus
+        return self.sheet.fortitude_save
 
     @property
     def reflex_save(self):
         """
         Returns the character's reflex save bonus.
         """
-        return self.get_save_for_ability("Dexterity") + self.reflex_save_bonus
+        return self.sheet.reflex_save
 
     @property
     def will_save(self):
         """
         Returns the character's will save bonus.
         """
-        return self.get_save_for_ability("Wisdom") + self.will_save_bonus
+        return self.sheet.will_save
 
     @property
     def initiative(self):
         """
         Returns the character's initiative, including bonus.
         """
-        return (
-            self.initiative_bonus
-            + self.characterabilityscore_set.filter(ability__name="Dexterity")
-            .first()
-            .modifier
-        )
+        return self.sheet.initiative
 
     @property
     def list_of_languages(self):
@@ -211,19 +202,7 @@ class Character(models.Model):
         Returns a list of languages known by the character.
         Combines languages from the character's race and additionally learned languages.
         """
-        race_languages = [
-            race_language.language.name
-            for race_language in self.race.racelanguage_set.all()
-            if race_language.is_automatic
-        ]
-
-        learned_languages = [
-            character_language.language.name
-            for character_language in self.characterlanguage_set.all()
-        ]
-        all_languages = set(race_languages + learned_languages)
-
-        return ", ".join(all_languages)
+        return ", ".join(self.sheet.languages)
 
     @property
     def multiattack_bab(self):
@@ -231,17 +210,7 @@ class Character(models.Model):
         Fetches the full attack bonus for character from sum of his classes in a form of +W/+X/+Y/+Z
         where W, X, Y, Z are the attack bonuses for subsequent attacks.
         """
-
-        bab_from_classes = sum(
-            character_class.character_class.bab_progression.get_attack_bonus_for_lvl(
-                character_class.level
-            )
-            for character_class in self.charactercharacterclass_set.all()
-        )
-        if bab_from_classes is None:
-            return None
-
-        return format_bab_into_multiattack(bab_from_classes)
+        return self.sheet.multiattack_bab
 
     def __str__(self):
         return self.name
@@ -375,16 +344,15 @@ class CharacterSkill(models.Model):
     @property
     def total_bonus(self):
         """
-        Returns the total bonus for the skill, which is the sum of ranks, misc bonus, and ability modifier.
+        Returns the total bonus for the skill, which is the sum of ranks, misc bonus, ability modifier
+        and, for skills affected by armor, the armor check penalty of the character's equipped armor.
+        Bonuses of many skills are loaded at once with `character.skills.load_skill_bonuses`.
         """
-        ability_score = self.character.characterabilityscore_set.filter(
-            ability__name=self.skill.ability.name
-        ).first()
-
-        if ability_score:
-            return self.ranks + self.misc_bonus + ability_score.modifier
-        else:
-            return self.ranks + self.misc_bonus
+        from character.skills import get_skill_total, load_skill_bonuses
+
+        if not hasattr(self, "_skill_bonuses"):
+            load_skill_bonuses([self])
+        return get_skill_total(self, *self._skill_bonuses)
 
     def __str__(self):
         return f"{self.character.name} - {self.skill.name}"
@@ -0,0 +1,188 @@
+"""
+Prestige class eligibility of many characters at once.
+
+Requirements of every prestige class and the stats of every character are read in a fixed
+number of queries, whatever the number of characters or prestige classes, and compared in memory.
+Base attack bonuses are read from the cached progression tables.
+"""
+
+from collections import defaultdict
+
+from character.models import (
+    CharacterCharacterClass,
+    CharacterFeat,
+    CharacterLanguage,
+    CharacterSkill,
+)
+from character_class.models import (
+    PrestigeCharacterClass,
+    PrestigeClassFeatRequirement,
+    PrestigeClassLanguageRequirement,
+    PrestigeClassRaceRequirement,
+    PrestigeClassSkillRankRequirement,
+)
+from race.models import RaceLanguage
+
+
+class PrestigeClassRequirements:
+    """
+    Requirements of one prestige class, keyed by ids.
+    """
+
+    def __init__(self, prestige_class_id, name, required_bab):
+        self.id = prestige_class_id
+        self.name = name
+        self.required_bab = required_bab
+        # {skill id: required ranks}
+        self.skill_ranks = {}
+        # a character must be of one of the races, when there are any
+        self.race_ids = set()
+        self.language_ids = set()
+        self.feat_ids = set()
+
+    def get_missing(self, stats):
+        """
+        Returns what a character with the given stats lacks to take the prestige class.
+        An empty dict means the character qualifies.
+        """
+        missing = {}
+        if stats.base_attack_bonus < self.required_bab:
+            missing["base_attack_bonus"] = self.required_bab
+        skills = {
+            skill_id: ranks
+            for skill_id, ranks in self.skill_ranks.items()
+            if stats.skill_ranks.get(skill_id, 0) < ranks
+        }
+        if skills:
+            missing["skill_ranks"] = skills
+        if self.race_ids and stats.race_id not in self.race_ids:
+            missing["race"] = sorted(self.race_ids)
+        languages = sorted(self.language_ids - stats.language_ids)
+        if languages:
+            missing["languages"] = languages
+        feats = sorted(self.feat_ids - stats.feat_ids)
+        if feats:
+            missing["feats"] = feats
+        return missing
+
+
+class CharacterPrestigeStats:
+    """
+    Stats of one character checked by prestige class requirements.
+    """
+
+    def __init__(self, character_id, name, race_id):
+        self.id = character_id
+        self.name = name
+        self.race_id = race_id
+        self.base_attack_bonus = 0
+        # {skill id: ranks}
+        self.skill_ranks = {}
+        self.language_ids = set()
+        self.feat_ids = set()
+
+
+def load_prestige_requirements():
+    """
+    Returns the requirements of every prestige class, ordered by name, in five queries.
+    """
+    prestige_classes = PrestigeCharacterClass.objects.order_by("name", "id")
+    requirements = {
+        prestige_class_id: PrestigeClassRequirements(
+            prestige_class_id, name, required_bab
+        )
+        for prestige_class_id, name, required_bab in prestige_classes.values_list(
+            "id", "name", "required_bab"
+        )
+    }
+    skill_ranks = PrestigeClassSkillRankRequirement.objects.values_list(
+        "prestige_class_id", "skill_id", "required_ranks"
+    )
+    for prestige_class_id, skill_id, ranks in skill_ranks:
+        requirements[prestige_class_id].skill_ranks[skill_id] = ranks
+    for model, field_name, attribute in (
+        (PrestigeClassRaceRequirement, "race_id", "race_ids"),
+        (PrestigeClassLanguageRequirement, "language_id", "language_ids"),
+        (PrestigeClassFeatRequirement, "feat_id", "feat_ids"),
+    ):
+        for prestige_class_id, target_id in model.objects.values_list(
+            "prestige_class_id", field_name
+        ):
+            getattr(requirements[prestige_class_id], attribute).add(target_id)
+    return list(requirements.values())
+
+
+def load_character_stats(characters):
+    """
+    Returns the prestige stats of every character in the queryset, in six queries.
+    Known languages are the learned ones and the automatic languages of the character's race.
+    """
+    characters = characters.select_related(None).prefetch_related(None)
+    character_ids = characters.values("pk")
+    stats = {
+        character_id: CharacterPrestigeStats(character_id, name, race_id)
+        for character_id, name, race_id in characters.values_list(
+            "id", "name", "race_id"
+        )
+    }
+
+    for character_class in CharacterCharacterClass.objects.filter(
+        character__in=character_ids
+    ).select_related("character_class__bab_progression"):
+        stats[character_class.character_id].base_attack_bonus += (
+            character_class.character_class.bab_progression.get_attack_bonus_for_lvl(
+                character_class.level
+            )
+            or 0
+        )
+    for character_id, skill_id, ranks in CharacterSkill.objects.filter(
+        character__in=character_ids
+    ).values_list("character_id", "skill_id", "ranks"):
+        stats[character_id].skill_ranks[skill_id] = ranks
+    for character_id, feat_id in CharacterFeat.objects.filter(
+        character__in=character_ids
+    ).values_list("character_id", "feat_id"):
+        stats[character_id].feat_ids.add(feat_id)
+    for character_id, language_id in CharacterLanguage.objects.filter(
+        character__in=character_ids
+    ).values_list("character_id", "language_id"):
+        stats[character_id].language_ids.add(language_id)
+
+    race_languages = defaultdict(set)
+    for race_id, language_id in RaceLanguage.objects.filter(
+        is_automatic=True,
+        race__in={character.race_id for character in stats.values()},
+    ).values_list("race_id", "language_id"):
+        race_languages[race_id].add(language_id)
+    for character in stats.values():
+        character.language_ids |= race_languages[character.race_id]
+    return list(stats.values())
+
+
+def get_prestige_eligibility(characters):
+    """
+    Returns, for every character in the queryset, every prestige class with whether
+    the character qualifies for it and what it is missing.
+    """
+    requirements = load_prestige_requirements()
+    eligibility = []
+    for character in load_character_stats(characters):
+        prestige_classes = []
+        for prestige_class in requirements:
+            missing = prestige_class.get_missing(character)
+            prestige_classes.append(
+                {
+                    "id": prestige_class.id,
+                    "name": prestige_class.name,
+                    "eligible": not missing,
+                    "missing": missing,
+                }
+            )
+        eligibility.append(
+            {
+                "id": character.id,
+                "name": character.name,
+                "prestige_classes": prestige_classes,
+            }
+        )
+    return eligibility
@@ -0,0 +1,220 @@
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Sum,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Floor
+
+DECIMAL = models.DecimalField(max_digits=12, decimal_places=2)
+# class levels are limited to 20 by validate_max_class_level
+CLASS_LEVELS = range(1, 21)
+
+
+class LevelTableValue(Func):
+    """
+    Value stored for a level in a JSON table keyed by level. Django's key transforms
+    read digit keys as array indexes, so the object key is looked up explicitly.
+    """
+
+    output_field = TextField()
+
+    def __init__(self, table, level, **extra):
+        self.level = level
+        super().__init__(table, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        copy = self.copy()
+        copy.set_source_expressions(
+            [*self.get_source_expressions(), Value(f'$."{self.level}"')]
+        )
+        return super(LevelTableValue, copy).as_sql(
+            compiler, connection, function="JSON_EXTRACT", **extra_context
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        copy = self.copy()
+        copy.set_source_expressions(
+            [
+                *self.get_source_expressions(),
+                Cast(Value(str(self.level)), TextField()),
+            ]
+        )
+        return super(LevelTableValue, copy).as_sql(
+            compiler,
+            connection,
+            template="(%(expressions)s)",
+            arg_joiner=" ->> ",
+            **extra_context,
+        )
+
+
+def get_level_table_bonus(table):
+    """
+    Returns an expression reading the bonus for the row's level from a JSON table keyed by level.
+    """
+    return Case(
+        *(
+            When(
+                level=level,
+                then=Cast(LevelTableValue(table, level), IntegerField()),
+            )
+            for level in CLASS_LEVELS
+        ),
+        output_field=IntegerField(),
+    )
+
+
+def sum_subquery(queryset, expression):
+    """
+    Returns a subquery summing expression over the queryset rows of the outer character, or 0.
+    """
+    total = (
+        queryset.filter(character=OuterRef("pk"))
+        .values("character")
+        .annotate(total=Sum(expression))
+        .values("total")
+    )
+    return Coalesce(Subquery(total), Value(0), output_field=IntegerField())
+
+
+class CharacterQuerySet(models.QuerySet):
+    def with_sheet_data(self):
+        """
+        Loads everything the character sheet needs in a fixed number of queries,
+        no matter how many classes, skills or languages a character has.
+        """
+        from character.sheet import get_sheet_prefetch_lookups
+
+        return self.select_related("race", "alignment").prefetch_related(
+            *get_sheet_prefetch_lookups()
+        )
+
+    def with_sheet_stats(self):
+        """
+        Annotates every character with the derived stats of its sheet, computed by the database,
+        so characters can be filtered and ordered by them: `sheet_class_levels`,
+        `sheet_base_attack_bonus`, `sheet_<ability>_modifier` for save and initiative abilities,
+        `sheet_fortitude_save`, `sheet_reflex_save`, `sheet_will_save` and `sheet_initiative`.
+        """
+        from character.models import CharacterAbilityScore, CharacterCharacterClass
+        from character.sheet import SAVE_ABILITIES
+        from character_class.models import BSBProgression
+
+        modifiers = {}
+        for ability in sorted({*SAVE_ABILITIES.values(), "Dexterity"}):
+            modifier = (
+                CharacterAbilityScore.objects.filter(
+                    character=OuterRef("pk"), ability__name=ability
+                )
+                .annotate(
+                    modifier=Cast(
+                        Floor(Cast(F("value") + F("bonus") - 10, FloatField()) / 2),
+                        IntegerField(),
+                    )
+                )
+                .values("modifier")[:1]
+            )
+            modifiers[f"sheet_{ability.lower()}_modifier"] = Coalesce(
+                Subquery(modifier), Value(0), output_field=IntegerField()
+            )
+
+        saves = {}
+        for save, ability in SAVE_ABILITIES.items():
+            # like the sheet, each class counts only its first progression for the ability
+            save_bonus_table = BSBProgression.objects.filter(
+                classbsbprogression__character_class=OuterRef("character_class"),
+                ability__name=ability,
+            ).values("save_bonus_table")[:1]
+            saves[f"sheet_{save}_save"] = (
+                sum_subquery(
+                    CharacterCharacterClass.objects.annotate(
+                        save_bonus_table=Subquery(save_bonus_table)
+                    ),
+                    get_level_table_bonus("save_bonus_table"),
+                )
+                + F(f"sheet_{ability.lower()}_modifier")
+                + F(f"{save}_save_bonus")
+            )
+
+        return self.annotate(
+            sheet_class_levels=sum_subquery(
+                CharacterCharacterClass.objects.all(), F("level")
+            ),
+            sheet_base_attack_bonus=sum_subquery(
+                CharacterCharacterClass.objects.all(),
+                get_level_table_bonus(
+                    "character_class__bab_progression__attack_bonus_table"
+                ),
+            ),
+            **modifiers,
+        ).annotate(
+            **saves,
+            sheet_initiative=F("initiative_bonus") + F("sheet_dexterity_modifier"),
+        )
+
+
+class InventoryQuerySet(models.QuerySet):
+    def with_expected_totals(self):
+        """
+        Annotates every inventory with the weight and value its items currently add up to.
+        """
+        from character.models import InventoryItem
+
+        stacks = (
+            InventoryItem.objects.filter(inventory=OuterRef("pk"))
+            .values("inventory")
+            .annotate(
+                weight=Sum(
+                    F("quantity") * Coalesce("item__weight_in_lb", Value(Decimal(0)))
+                ),
+                value=Sum(
+                    F("quantity") * Coalesce("item__price_in_gp", Value(Decimal(0)))
+                ),
+            )
+        )
+        return self.annotate(
+            expected_weight=Coalesce(
+                Subquery(stacks.values("weight")), Value(0), output_field=DECIMAL
+            ),
+            expected_value=Coalesce(
+                Subquery(stacks.values("value")), Value(0), output_field=DECIMAL
+            ),
+        )
+
+    def with_stale_totals(self):
+        """
+        Returns inventories whose stored totals differ from the items they hold.
+        """
+        return self.with_expected_totals().exclude(
+            total_weight=F("expected_weight"), total_value=F("expected_value")
+        )
+
+    def update_totals(self):
+        """
+        Recalculates the stored totals of the inventories in a single UPDATE.
+        The inventory rows are locked first, so concurrent writers of the same inventory
+        recalculate one after another and the last of them sees every committed item.
+        """
+        with transaction.atomic():
+            inventory_ids = list(
+                self.select_for_update().order_by("pk").values_list("pk", flat=True)
+            )
+            expected = self.model.objects.with_expected_totals().filter(
+                pk=OuterRef("pk")
+            )
+            return self.model.objects.filter(pk__in=inventory_ids).update(
+                total_weight=Subquery(expected.values("expected_weight")),
+                total_value=Subquery(expected.values("expected_value")),
+            )
@@ -1,3 +1,4 @@
+from django.db.models import Manager
 from rest_framework import serializers
 
 from character.models import (
@@ -11,13 +12,20 @@ from character.models import (
     CharacterInventory,
     CharacterSkill,
 )
+from character.services import create_character_document
+from character.skills import load_skill_bonuses
 from common.models import Ability, Language
 from feat.models import Feat
 from item.models import Item
 from skill.models import Skill
+from utils.serializers import (
+    DynamicFieldsModelSerializer,
+    ReferenceModelSerializer,
+    ReferenceRelatedField,
+)
 
 
-class InventorySerializer(serializers.ModelSerializer):
+class InventorySerializer(DynamicFieldsModelSerializer):
     items = serializers.PrimaryKeyRelatedField(
         queryset=Item.objects.all(), many=True, required=False
     )
@@ -27,14 +35,14 @@ class InventorySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class InventoryItemSerializer(serializers.ModelSerializer):
+class InventoryItemSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = InventoryItem
         fields = "__all__"
 
 
-class CharacterSerializer(serializers.ModelSerializer):
-    ability_scores = serializers.PrimaryKeyRelatedField(
+class CharacterSerializer(ReferenceModelSerializer):
+    ability_scores = ReferenceRelatedField(
         queryset=Ability.objects.all(), many=True, required=False
     )
     feats = serializers.PrimaryKeyRelatedField(
@@ -55,37 +63,227 @@ class CharacterSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class CharacterAbilityScoreSerializer(serializers.ModelSerializer):
+class CharacterAbilityScoreSerializer(ReferenceModelSerializer):
     class Meta:
         model = CharacterAbilityScore
         fields = "__all__"
 
 
-class CharacterCharacterClassSerializer(serializers.ModelSerializer):
+class CharacterCharacterClassSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CharacterCharacterClass
         fields = "__all__"
 
 
-class CharacterFeatSerializer(serializers.ModelSerializer):
+class CharacterFeatSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CharacterFeat
         fields = "__all__"
 
 
-class CharacterLanguageSerializer(serializers.ModelSerializer):
+class CharacterLanguageSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CharacterLanguage
         fields = "__all__"
 
 
-class CharacterInventorySerializer(serializers.ModelSerializer):
+class CharacterInventorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CharacterInventory
         fields = "__all__"
 
 
-class CharacterSkillSerializer(serializers.ModelSerializer):
+class CharacterSkillListSerializer(serializers.ListSerializer):
+    """
+    Loads the bonuses of all listed character skills at once before serializing them.
+    """
+
+    def to_representation(self, data):
+        character_skills = list(data.all() if isinstance(data, Manager) else data)
+        load_skill_bonuses(character_skills)
+        return super().to_representation(character_skills)
+
+
+class CharacterSkillSerializer(DynamicFieldsModelSerializer):
+    total_bonus = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = CharacterSkill
+        fields = "__all__"
+        list_serializer_class = CharacterSkillListSerializer
+
+
+class CharacterDocumentAbilityScoreSerializer(ReferenceModelSerializer):
+    class Meta:
+        model = CharacterAbilityScore
+        exclude = ("id", "character")
+
+
+class CharacterDocumentCharacterClassSerializer(ReferenceModelSerializer):
+    class Meta:
+        model = CharacterCharacterClass
+        exclude = ("id", "character")
+
+
+class CharacterDocumentSkillSerializer(ReferenceModelSerializer):
     class Meta:
         model = CharacterSkill
+        exclude = ("id", "character")
+
+
+class CharacterDocumentFeatSerializer(ReferenceModelSerializer):
+    class Meta:
+        model = CharacterFeat
+        exclude = ("id", "character")
+
+
+class CharacterDocumentLanguageSerializer(ReferenceModelSerializer):
+    class Meta:
+        model = CharacterLanguage
+        exclude = ("id", "character")
+        read_only_fields = ("is_automatic",)
+
+
+class CharacterDocumentInventoryItemSerializer(ReferenceModelSerializer):
+    class Meta:
+        model = InventoryItem
+        exclude = ("id", "inventory")
+
+
+class CharacterDocumentInventorySerializer(ReferenceModelSerializer):
+    items = CharacterDocumentInventoryItemSerializer(
+        many=True, required=False, source="inventoryitem_set"
+    )
+
+    class Meta:
+        model = Inventory
         fields = "__all__"
+
+
+class CharacterDocumentSerializer(ReferenceModelSerializer):
+    """
+    Character with all its through-table rows, created in one transaction.
+    """
+
+    ability_scores = CharacterDocumentAbilityScoreSerializer(
+        many=True, required=False, source="characterabilityscore_set"
+    )
+    character_classes = CharacterDocumentCharacterClassSerializer(
+        many=True, required=False, source="charactercharacterclass_set"
+    )
+    skills = CharacterDocumentSkillSerializer(
+        many=True, required=False, source="characterskill_set"
+    )
+    feats = CharacterDocumentFeatSerializer(
+        many=True, required=False, source="characterfeat_set"
+    )
+    languages = CharacterDocumentLanguageSerializer(
+        many=True, required=False, source="characterlanguage_set"
+    )
+    inventories = CharacterDocumentInventorySerializer(many=True, required=False)
+
+    # rows of a list that must not repeat, by the field they are unique on
+    unique_rows = {
+        "ability_scores": "ability",
+        "character_classes": "character_class",
+        "skills": "skill",
+        "languages": "language",
+        "inventories": "name",
+    }
+
+    class Meta:
+        model = Character
+        exclude = ("additionally_learned_languages",)
+
+    def validate(self, attrs):
+        errors = {}
+        for field_name, key in self.unique_rows.items():
+            rows = attrs.get(self.fields[field_name].source, [])
+            values = [row[key] for row in rows]
+            if len(set(values)) != len(values):
+                errors[field_name] = f"Every {key} can only be listed once."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        rows = {
+            field_name: validated_data.pop(self.fields[field_name].source, [])
+            for field_name in (
+                "ability_scores",
+                "character_classes",
+                "skills",
+                "feats",
+                "languages",
+                "inventories",
+            )
+        }
+        for inventory in rows["inventories"]:
+            inventory["items"] = inventory.pop("inventoryitem_set", [])
+        return create_character_document(validated_data, **rows)
+
+
+class CharacterSheetClassSerializer(serializers.Serializer):
+    id = serializers.IntegerField(source="character_class.id")
+    name = serializers.CharField(source="character_class.name")
+    level = serializers.IntegerField()
+
+
+class CharacterSheetAbilityScoreSerializer(serializers.Serializer):
+    ability = serializers.CharField(source="ability.name")
+    value = serializers.IntegerField()
+    bonus = serializers.IntegerField()
+    modifier = serializers.IntegerField()
+
+
+class CharacterSheetSerializer(serializers.Serializer):
+    """
+    Read-only serializer of a fully resolved CharacterSheet.
+    """
+
+    id = serializers.IntegerField(source="character.id")
+    name = serializers.CharField(source="character.name")
+    level = serializers.IntegerField(source="character.level")
+    experience = serializers.IntegerField(source="character.experience")
+    race = serializers.CharField(source="character.race.name")
+    alignment = serializers.CharField(source="character.alignment.name")
+    current_hit_points = serializers.IntegerField(source="character.current_hit_points")
+    max_hit_points = serializers.IntegerField(source="character.max_hit_points")
+    armor_class = serializers.IntegerField(source="character.armor_class")
+    speed = serializers.IntegerField(source="character.speed")
+    spell_resistance = serializers.IntegerField(source="character.spell_resistance")
+    class_levels = serializers.IntegerField()
+    classes = CharacterSheetClassSerializer(source="character_classes", many=True)
+    ability_scores = serializers.SerializerMethodField()
+    saves = serializers.SerializerMethodField()
+    initiative = serializers.IntegerField()
+    base_attack_bonus = serializers.IntegerField()
+    multiattack_bab = serializers.CharField()
+    skills = serializers.SerializerMethodField()
+    languages = serializers.ListField(child=serializers.CharField())
+    armor_check_penalty = serializers.IntegerField()
+    inventory_weight = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+    def get_ability_scores(self, sheet):
+        return CharacterSheetAbilityScoreSerializer(
+            sheet.ability_scores.values(), many=True
+        ).data
+
+    def get_saves(self, sheet):
+        return {
+            "fortitude": sheet.fortitude_save,
+            "reflex": sheet.reflex_save,
+            "will": sheet.will_save,
+        }
+
+    def get_skills(self, sheet):
+        return [
+            {
+                "id": character_skill.skill.id,
+                "name": character_skill.skill.name,
+                "ranks": character_skill.ranks,
+                "misc_bonus": character_skill.misc_bonus,
+                "total_bonus": sheet.skill_totals[character_skill.skill.name],
+            }
+            for character_skill in sheet.character.characterskill_set.all()
+        ]
@@ -0,0 +1,153 @@
+"""
+Batched writes of characters and their through-table rows.
+
+Every function reads the rows that already exist in one query and creates the missing ones
+with a single bulk_create, whatever the number of characters, classes, skills or languages.
+bulk_create sends no signals, so inventory totals are recalculated explicitly.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from character.models import (
+    Character,
+    CharacterAbilityScore,
+    CharacterCharacterClass,
+    CharacterFeat,
+    CharacterInventory,
+    CharacterLanguage,
+    CharacterSkill,
+    Inventory,
+    InventoryItem,
+)
+from character_class.models import ClassSkill
+from race.models import RaceLanguage
+
+
+def add_class_skills(character_character_classes):
+    """
+    Adds the class skills of every given character class row to its character,
+    skipping skills the character already has.
+    """
+    classes_by_character = defaultdict(set)
+    for character_character_class in character_character_classes:
+        classes_by_character[character_character_class.character_id].add(
+            character_character_class.character_class_id
+        )
+    if not classes_by_character:
+        return []
+
+    skills_by_class = defaultdict(set)
+    for character_class_id, skill_id in ClassSkill.objects.filter(
+        character_class__in={
+            character_class_id
+            for character_class_ids in classes_by_character.values()
+            for character_class_id in character_class_ids
+        }
+    ).values_list("character_class_id", "skill_id"):
+        skills_by_class[character_class_id].add(skill_id)
+    existing = set(
+        CharacterSkill.objects.filter(character__in=classes_by_character).values_list(
+            "character_id", "skill_id"
+        )
+    )
+
+    missing = {
+        (character_id, skill_id)
+        for character_id, character_class_ids in classes_by_character.items()
+        for character_class_id in character_class_ids
+        for skill_id in skills_by_class[character_class_id]
+    } - existing
+    return CharacterSkill.objects.bulk_create(
+        CharacterSkill(character_id=character_id, skill_id=skill_id)
+        for character_id, skill_id in sorted(missing)
+    )
+
+
+def add_automatic_languages(characters):
+    """
+    Adds the automatic languages of every given character's race to the character,
+    skipping languages the character already knows.
+    """
+    races_by_character = {character.pk: character.race_id for character in characters}
+    if not races_by_character:
+        return []
+
+    languages_by_race = defaultdict(set)
+    for race_id, language_id in RaceLanguage.objects.filter(
+        race__in=set(races_by_character.values()), is_automatic=True
+    ).values_list("race_id", "language_id"):
+        languages_by_race[race_id].add(language_id)
+    existing = set(
+        CharacterLanguage.objects.filter(character__in=races_by_character).values_list(
+            "character_id", "language_id"
+        )
+    )
+
+    missing = {
+        (character_id, language_id)
+        for character_id, race_id in races_by_character.items()
+        for language_id in languages_by_race[race_id]
+    } - existing
+    return CharacterLanguage.objects.bulk_create(
+        CharacterLanguage(
+            character_id=character_id, language_id=language_id, is_automatic=True
+        )
+        for character_id, language_id in sorted(missing)
+    )
+
+
+@transaction.atomic
+def create_character_document(
+    character_data,
+    ability_scores=(),
+    character_classes=(),
+    skills=(),
+    feats=(),
+    languages=(),
+    inventories=(),
+):
+    """
+    Creates a character with all its through-table rows in one transaction.
+    Rows are dicts of model field values, without the character. Inventories are new inventories,
+    each with a list of `items`. The character also gets the class skills of its classes
+    and the automatic languages of its race, as the admin forms do.
+    """
+    character = Character.objects.create(**character_data)
+    created_rows = {
+        model: model.objects.bulk_create(
+            model(character=character, **row) for row in rows
+        )
+        for model, rows in (
+            (CharacterAbilityScore, ability_scores),
+            (CharacterCharacterClass, character_classes),
+            (CharacterSkill, skills),
+            (CharacterFeat, feats),
+            (CharacterLanguage, languages),
+        )
+    }
+
+    created_inventories = Inventory.objects.bulk_create(
+        Inventory(
+            **{name: value for name, value in inventory.items() if name != "items"}
+        )
+        for inventory in inventories
+    )
+    InventoryItem.objects.bulk_create(
+        InventoryItem(inventory=created_inventory, **item)
+        for created_inventory, inventory in zip(created_inventories, inventories)
+        for item in inventory.get("items", ())
+    )
+    CharacterInventory.objects.bulk_create(
+        CharacterInventory(character=character, inventory=inventory)
+        for inventory in created_inventories
+    )
+    if created_inventories:
+        Inventory.objects.filter(
+            pk__in=[inventory.pk for inventory in created_inventories]
+        ).update_totals()
+
+    add_class_skills(created_rows[CharacterCharacterClass])
+    add_automatic_languages([character])
+    return character
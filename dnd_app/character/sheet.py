@@ -0,0 +1,227 @@
+from functools import cached_property
+
+from django.db.models import F, Prefetch, prefetch_related_objects
+
+from utils.string_formatters import format_bab_into_multiattack
+
+# Ability used by each saving throw
+SAVE_ABILITIES = {
+    "fortitude": "Constitution",
+    "reflex": "Dexterity",
+    "will": "Wisdom",
+}
+
+
+def get_sheet_prefetch_lookups():
+    """
+    Returns the prefetch lookups required to compute a character sheet in memory.
+    """
+    from character.models import (
+        CharacterAbilityScore,
+        CharacterCharacterClass,
+        CharacterLanguage,
+        CharacterSkill,
+        InventoryItem,
+    )
+    from race.models import RaceLanguage
+
+    return (
+        Prefetch(
+            "charactercharacterclass_set",
+            queryset=CharacterCharacterClass.objects.select_related(
+                "character_class__bab_progression"
+            ),
+        ),
+        "charactercharacterclass_set__character_class__bsb_progression__ability",
+        Prefetch(
+            "characterabilityscore_set",
+            queryset=CharacterAbilityScore.objects.select_related("ability"),
+        ),
+        Prefetch(
+            "characterskill_set",
+            queryset=CharacterSkill.objects.select_related("skill__ability"),
+        ),
+        Prefetch(
+            "characterlanguage_set",
+            queryset=CharacterLanguage.objects.select_related("language"),
+        ),
+        Prefetch(
+            "race__racelanguage_set",
+            queryset=RaceLanguage.objects.select_related("language"),
+        ),
+        "characterinventory_set__inventory",
+        Prefetch(
+            "characterinventory_set__inventory__inventoryitem_set",
+            queryset=InventoryItem.objects.filter(
+                is_equipped=True, item__armor__armor_check_penalty__isnull=False
+            ).annotate(armor_check_penalty=F("item__armor__armor_check_penalty")),
+            to_attr="equipped_armor",
+        ),
+    )
+
+
+class CharacterSheet:
+    """
+    Computes every derived stat of a character from data loaded in one prefetch pass.
+    Characters fetched with `Character.objects.with_sheet_data()` are used as they are,
+    any other character gets its sheet data prefetched on first use.
+    """
+
+    def __init__(self, character):
+        self.character = character
+        prefetched = getattr(character, "_prefetched_objects_cache", {})
+        if "charactercharacterclass_set" not in prefetched:
+            prefetch_related_objects([character], *get_sheet_prefetch_lookups())
+
+    @classmethod
+    def for_characters(cls, queryset):
+        """
+        Returns sheets for all characters in the queryset, using a fixed number of queries.
+        """
+        return [cls(character) for character in queryset.with_sheet_data()]
+
+    @cached_property
+    def character_classes(self):
+        return list(self.character.charactercharacterclass_set.all())
+
+    @cached_property
+    def ability_scores(self):
+        return {
+            ability_score.ability.name: ability_score
+            for ability_score in self.character.characterabilityscore_set.all()
+        }
+
+    @cached_property
+    def ability_modifiers(self):
+        return {
+            name: ability_score.modifier
+            for name, ability_score in self.ability_scores.items()
+        }
+
+    @cached_property
+    def class_levels(self):
+        """
+        Returns the character's level based on the sum of levels in all character classes.
+        """
+        return sum(character_class.level for character_class in self.character_classes)
+
+    def get_ability_modifier(self, ability):
+        """
+        Returns the modifier for the given ability, or 0 if character has no score for it.
+        """
+        return self.ability_modifiers.get(ability, 0)
+
+    def get_save_for_ability(self, ability):
+        """
+        Returns the character's save bonus for the specified ability.
+        It consists of all the bonuses from the character's classes + selected ability modifier.
+        """
+        bonus_from_classes = 0
+        for character_class in self.character_classes:
+            for (
+                bsb_progression
+            ) in character_class.character_class.bsb_progression.all():
+                if bsb_progression.ability.name == ability:
+                    bonus_from_classes += (
+                        bsb_progression.get_save_bonus_for_lvl(character_class.level)
+                        or 0
+                    )
+                    break
+
+        return bonus_from_classes + self.get_ability_modifier(ability)
+
+    @cached_property
+    def fortitude_save(self):
+        return (
+            self.get_save_for_ability(SAVE_ABILITIES["fortitude"])
+            + self.character.fortitude_save_bonus
+        )
+
+    @cached_property
+    def reflex_save(self):
+        return (
+            self.get_save_for_ability(SAVE_ABILITIES["reflex"])
+            + self.character.reflex_save_bonus
+        )
+
+    @cached_property
+    def will_save(self):
+        return (
+            self.get_save_for_ability(SAVE_ABILITIES["will"])
+            + self.character.will_save_bonus
+        )
+
+    @cached_property
+    def initiative(self):
+        return self.character.initiative_bonus + self.get_ability_modifier("Dexterity")
+
+    @cached_property
+    def base_attack_bonus(self):
+        """
+        Returns the sum of base attack bonuses from all character classes.
+        """
+        return sum(
+            character_class.character_class.bab_progression.get_attack_bonus_for_lvl(
+                character_class.level
+            )
+            or 0
+            for character_class in self.character_classes
+        )
+
+    @cached_property
+    def multiattack_bab(self):
+        return format_bab_into_multiattack(self.base_attack_bonus)
+
+    @cached_property
+    def languages(self):
+        """
+        Returns sorted names of languages known by the character.
+        Combines languages from the character's race and additionally learned languages.
+        """
+        race_languages = {
+            race_language.language.name
+            for race_language in self.character.race.racelanguage_set.all()
+            if race_language.is_automatic
+        }
+        learned_languages = {
+            character_language.language.name
+            for character_language in self.character.characterlanguage_set.all()
+        }
+        return sorted(race_languages | learned_languages)
+
+    @cached_property
+    def armor_check_penalty(self):
+        """
+        Returns the sum of armor check penalties of the armor equipped by the character.
+        """
+        return sum(
+            inventory_item.armor_check_penalty
+            for character_inventory in self.character.characterinventory_set.all()
+            for inventory_item in character_inventory.inventory.equipped_armor
+        )
+
+    @cached_property
+    def skill_totals(self):
+        """
+        Returns total bonus of every character skill, keyed by skill name.
+        """
+        from character.skills import get_skill_total
+
+        return {
+            character_skill.skill.name: get_skill_total(
+                character_skill,
+                self.get_ability_modifier(character_skill.skill.ability.name),
+                self.armor_check_penalty,
+            )
+            for character_skill in self.character.characterskill_set.all()
+        }
+
+    @cached_property
+    def inventory_weight(self):
+        """
+        Returns the total weight of items in all the character's inventories.
+        """
+        return sum(
+            character_inventory.inventory.total_weight
+            for character_inventory in self.character.characterinventory_set.all()
+        )
@@ -0,0 +1,64 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from character.models import Inventory, InventoryItem
+from item.models import Armor, Item, Weapon
+
+# fields of an item that count towards the totals of the inventories holding it
+INVENTORY_TOTAL_FIELDS = {"weight_in_lb", "price_in_gp"}
+
+
+def remember_previous_inventory(sender, instance, raw=False, **kwargs):
+    """
+    Keeps the inventory an existing inventory item is saved from, in case it is moved.
+    Items loaded or saved before remember it, others are looked up.
+    """
+    if raw or instance.pk is None:
+        instance._previous_inventory_id = None
+        return
+    if hasattr(instance, "_loaded_inventory_id"):
+        instance._previous_inventory_id = instance._loaded_inventory_id
+        return
+    instance._previous_inventory_id = (
+        InventoryItem.objects.filter(pk=instance.pk)
+        .values_list("inventory_id", flat=True)
+        .first()
+    )
+
+
+def update_inventory_item_totals(sender, instance, raw=False, **kwargs):
+    """
+    Recalculates the totals of the inventory an item stack was saved to, moved from or deleted from.
+    """
+    if raw:
+        return
+    inventory_ids = {
+        instance.inventory_id,
+        getattr(instance, "_previous_inventory_id", None),
+    }
+    inventory_ids.discard(None)
+    Inventory.objects.filter(pk__in=inventory_ids).update_totals()
+    instance._loaded_inventory_id = instance.inventory_id
+
+
+def update_item_inventory_totals(
+    sender, instance, created=False, raw=False, update_fields=None, **kwargs
+):
+    """
+    Recalculates the totals of every inventory holding an item whose weight or price may have changed.
+    """
+    if raw or created:
+        return
+    if update_fields is not None and not INVENTORY_TOTAL_FIELDS & set(update_fields):
+        return
+    Inventory.objects.filter(
+        pk__in=InventoryItem.objects.filter(item_id=instance.pk).values("inventory_id")
+    ).update_totals()
+
+
+def connect_signals():
+    pre_save.connect(remember_previous_inventory, sender=InventoryItem)
+    post_save.connect(update_inventory_item_totals, sender=InventoryItem)
+    post_delete.connect(update_inventory_item_totals, sender=InventoryItem)
+    # signals are sent for the concrete model, so item subclasses are connected too
+    for model in (Item, Weapon, Armor):
+        post_save.connect(update_item_inventory_totals, sender=model)
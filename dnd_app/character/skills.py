@@ -0,0 +1,78 @@
+"""
+Skill totals of many character skills at once.
+
+A skill total is the sum of its ranks, misc bonus, the modifier of its key ability and, for skills
+affected by armor, the armor check penalties of the armor the character has equipped.
+Ability modifiers and armor check penalties of all the characters are read in two queries,
+whatever the number of skills.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Sum
+
+from character.models import CharacterAbilityScore, InventoryItem
+
+
+def get_skill_total(character_skill, ability_modifier, armor_check_penalty):
+    """
+    Returns the total bonus of a character skill, given the modifier of its key ability
+    and the armor check penalty of the character.
+    """
+    total = character_skill.ranks + character_skill.misc_bonus + ability_modifier
+    if character_skill.skill.armor_check_penalty:
+        total += armor_check_penalty
+    return total
+
+
+def get_ability_modifiers(character_ids):
+    """
+    Returns {character id: {ability id: modifier}} of the given characters.
+    """
+    modifiers = defaultdict(dict)
+    for ability_score in CharacterAbilityScore.objects.filter(
+        character__in=character_ids
+    ).only("character_id", "ability_id", "value", "bonus"):
+        modifiers[ability_score.character_id][
+            ability_score.ability_id
+        ] = ability_score.modifier
+    return modifiers
+
+
+def get_armor_check_penalties(character_ids):
+    """
+    Returns {character id: sum of armor check penalties of its equipped armor} of the given characters.
+    Characters without equipped armor are left out.
+    """
+    return dict(
+        InventoryItem.objects.filter(
+            is_equipped=True,
+            inventory__character__in=character_ids,
+            item__armor__armor_check_penalty__isnull=False,
+        )
+        .values("inventory__character")
+        .annotate(penalty=Sum("item__armor__armor_check_penalty"))
+        .values_list("inventory__character", "penalty")
+    )
+
+
+def load_skill_bonuses(character_skills):
+    """
+    Loads the ability modifier and armor check penalty used by `CharacterSkill.total_bonus`
+    of every character skill in the list. Skills should be loaded with `select_related("skill")`.
+    """
+    character_ids = {
+        character_skill.character_id for character_skill in character_skills
+    }
+    if not character_ids:
+        return character_skills
+    modifiers = get_ability_modifiers(character_ids)
+    penalties = get_armor_check_penalties(character_ids)
+    for character_skill in character_skills:
+        character_skill._skill_bonuses = (
+            modifiers[character_skill.character_id].get(
+                character_skill.skill.ability_id, 0
+            ),
+            penalties.get(character_skill.character_id, 0),
+        )
+    return character_skills
@@ -1,3 +1,7 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
 from character.models import (
     Inventory,
     InventoryItem,
@@ -19,6 +23,15 @@ from character.serializers import (
     CharacterLanguageSerializer,
     CharacterInventorySerializer,
     CharacterSkillSerializer,
+    CharacterSheetSerializer,
+    CharacterDocumentSerializer,
+)
+from character.prestige import get_prestige_eligibility
+from character.services import add_automatic_languages, add_class_skills
+from character.sheet import CharacterSheet
+from feat.prerequisites import (
+    get_eligible_feats_for_character,
+    get_prerequisite_graph,
 )
 from utils.views import CustomModelViewSet
 
@@ -38,6 +51,75 @@ class CharacterViewSet(CustomModelViewSet):
     queryset = Character.objects.all()
     serializer_class = CharacterSerializer
 
+    def perform_create(self, serializer):
+        add_automatic_languages([serializer.save()])
+
+    def perform_update(self, serializer):
+        add_automatic_languages([serializer.save()])
+
+    def perform_batch_create(self, serializer):
+        characters = super().perform_batch_create(serializer)
+        add_automatic_languages(characters)
+        return characters
+
+    def perform_batch_update(self, serializers):
+        characters = super().perform_batch_update(serializers)
+        add_automatic_languages(characters)
+        return characters
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "sheet":
+            return queryset.with_sheet_data()
+        return queryset
+
+    @action(detail=True, methods=["get"], serializer_class=CharacterSheetSerializer)
+    def sheet(self, request, pk=None):
+        """
+        Returns the fully resolved character sheet with all derived stats.
+        """
+        sheet = CharacterSheet(self.get_object())
+        return self.get_conditional_response(
+            request, CharacterSheetSerializer(sheet).data
+        )
+
+    @action(
+        detail=False, methods=["post"], serializer_class=CharacterDocumentSerializer
+    )
+    def document(self, request):
+        """
+        Creates a character with its ability scores, classes, skills, feats, languages
+        and new inventories in one transaction.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        character = self.get_queryset().get(pk=serializer.save().pk)
+        return Response(
+            self.get_serializer(character).data, status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=["get"])
+    def eligible_feats(self, request, pk=None):
+        """
+        Returns the feats the character does not have yet but meets every ability score,
+        skill rank and feat prerequisite of.
+        """
+        feat_ids = get_eligible_feats_for_character(self.get_object())
+        feat_names = get_prerequisite_graph().feat_names
+        return Response(
+            [{"id": feat_id, "name": feat_names[feat_id]} for feat_id in feat_ids]
+        )
+
+    @action(detail=False, methods=["get"])
+    def prestige_eligibility(self, request):
+        """
+        Returns every prestige class each filtered character qualifies for,
+        and what it is missing for the others.
+        """
+        return Response(
+            get_prestige_eligibility(self.filter_queryset(self.get_queryset()))
+        )
+
 
 class CharacterAbilityScoreViewSet(CustomModelViewSet):
     queryset = CharacterAbilityScore.objects.all()
@@ -50,6 +132,22 @@ class CharacterCharacterClassViewSet(CustomModelViewSet):
     serializer_class = CharacterCharacterClassSerializer
     custom_view_name = "(Character - Character Class) List"
 
+    def perform_create(self, serializer):
+        add_class_skills([serializer.save()])
+
+    def perform_update(self, serializer):
+        add_class_skills([serializer.save()])
+
+    def perform_batch_create(self, serializer):
+        character_classes = super().perform_batch_create(serializer)
+        add_class_skills(character_classes)
+        return character_classes
+
+    def perform_batch_update(self, serializers):
+        character_classes = super().perform_batch_update(serializers)
+        add_class_skills(character_classes)
+        return character_classes
+
 
 class CharacterFeatViewSet(CustomModelViewSet):
     queryset = CharacterFeat.objects.all()
@@ -73,3 +171,4 @@ class CharacterSkillViewSet(CustomModelViewSet):
     queryset = CharacterSkill.objects.all()
     serializer_class = CharacterSkillSerializer
     custom_view_name = "(Character - Skill) List"
+    select_related_fields = ("skill",)
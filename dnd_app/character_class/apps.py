@@ -5,3 +5,8 @@ class CharacterClassConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "character_class"
     verbose_name = "Character Class"
+
+    def ready(self):
+        from character_class.signals import connect_signals
+
+        connect_signals()
@@ -1,5 +1,4 @@
 import json
-import os
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
@@ -7,15 +6,36 @@ from django.apps import apps
 from django.core.exceptions import ValidationError
 
 from common.models import Ability
+from utils.importers import (
+    BulkUpserter,
+    ImportLedger,
+    find_import_file,
+    write_import_result,
+    write_import_skipped,
+)
+from utils.reference_cache import get_by_name
 
 
 class Command(BaseCommand):
     help = "Command to import BSBProgression data from a JSON file located in character_class/initial_data/ into a model"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every entry even if the file has not changed",
+        )
+
     def handle(self, *args, **kwargs):
         model_name = "BSBProgression"
         app_name = "character_class"
-        json_file = "dnd_app/character_class/initial_data/bsbprogression_list.json"
+        json_file = "bsbprogression_list.json"
 
         try:
             model = apps.get_model(app_name, model_name)
@@ -28,59 +48,42 @@ class Command(BaseCommand):
             return
 
         try:
-            with open(json_file, mode="r") as file:
+            json_path = find_import_file(app_name, json_file)
+            ledger = ImportLedger(json_path, force=kwargs["force"])
+            if ledger.is_unchanged():
+                write_import_skipped(self, model_name, ledger)
+                return
+
+            with open(json_path, mode="r") as file:
                 data = json.load(file)
-                created = 0
-                exists = 0
 
                 ability_dict = {
-                    "Wisdom": ("Wil", ability.id)
-                    for ability in Ability.objects.filter(name="Wisdom")
+                    ability_name: (display_name, ability.id)
+                    for ability_name, display_name in (
+                        ("Wisdom", "Wil"),
+                        ("Dexterity", "Reflex"),
+                        ("Constitution", "Fortitude"),
+                    )
+                    if (ability := get_by_name(Ability, ability_name)) is not None
                 }
-                ability_dict.update(
-                    {
-                        "Dexterity": ("Reflex", ability.id)
-                        for ability in Ability.objects.filter(name="Dexterity")
-                    }
-                )
-                ability_dict.update(
-                    {
-                        "Constitution": ("Fortitude", ability.id)
-                        for ability in Ability.objects.filter(name="Constitution")
-                    }
-                )
 
-                for entry_key, entry_data in data.items():
-                    original_name = entry_data["name"]
+                entries = []
+                for entry_data in data.values():
                     for ability_name, (
                         display_name,
                         ability_id,
                     ) in ability_dict.items():
-                        entry_data["name"] = f"{display_name} ({original_name})"
-                        entry_data["ability_id"] = ability_id
-                        obj, created_flag = model.objects.get_or_create(**entry_data)
-                        if created_flag:
-                            created += 1
-                            if settings.IMPORT_DEBUG:
-                                self.stdout.write(
-                                    self.style.SUCCESS(
-                                        f"Successfully created '{model_name}' object: '{obj}'"
-                                    )
-                                )
-                        else:
-                            exists += 1
-                            if settings.IMPORT_DEBUG:
-                                self.stdout.write(
-                                    self.style.WARNING(
-                                        f"'{model_name}' object '{obj}' already exists"
-                                    )
-                                )
+                        entries.append(
+                            {
+                                **entry_data,
+                                "name": f"{display_name} ({entry_data['name']})",
+                                "ability_id": ability_id,
+                            }
+                        )
 
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Finished importing '{model_name}'. Created: {created}, Already exists: {exists}"
-                    )
-                )
+                upserter = BulkUpserter(model, batch_size=kwargs["batch_size"])
+                result = upserter.run(entries, ledger=ledger)
+                write_import_result(self, model_name, result)
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"JSON file '{json_file}' not found"))
         except ValidationError as e:
@@ -3,6 +3,7 @@ from functools import partial
 from django.db import models
 
 from utils.validators import validate_integer_in_range, validate_positive_integer
+from character_class.progressions import get_level_bonus
 from common.models import Trait, Source, Die, Ability, Alignment, Language
 from feat.models import Feat
 
@@ -26,9 +27,9 @@ class BSBProgression(models.Model):
 
     def get_save_bonus_for_lvl(self, level):
         """
-        Fetches the save bonus for a given level from the save_bonus_table JSON field.
+        Fetches the save bonus for a given level from the cached save_bonus_table lookup table.
         """
-        return self.save_bonus_table.get(str(level), None)
+        return get_level_bonus(self, "save_bonus_table", level)
 
     def __str__(self):
         bonuses = [str(self.get_save_bonus_for_lvl(level)) for level in range(1, 7)]
@@ -51,9 +52,9 @@ class BABProgression(models.Model):
 
     def get_attack_bonus_for_lvl(self, level):
         """
-        Fetches the save bonus for a given level from the save_bonus_table JSON field.
+        Fetches the attack bonus for a given level from the cached attack_bonus_table lookup table.
         """
-        return self.attack_bonus_table.get(str(level), None)
+        return get_level_bonus(self, "attack_bonus_table", level)
 
     def __str__(self):
         bonuses = [str(self.get_attack_bonus_for_lvl(level)) for level in range(1, 7)]
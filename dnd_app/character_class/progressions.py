@@ -0,0 +1,77 @@
+"""
+Process-wide lookup tables of class progressions.
+
+Every BSB and BAB progression is loaded once, in one query per model, into a tuple indexed by
+level, so reading a bonus is a plain index with no JSON decoding or database access.
+Saving or deleting a progression bumps the shared version of its model's tables once the
+transaction commits, and every process sharing utils.reference_cache versions reloads them.
+Bulk writes are picked up after `invalidate_progression_tables()` is called.
+"""
+
+from types import MappingProxyType
+
+from utils.reference_cache import bump_shared_version, get_shared_version
+
+# {model: (version, {progression id: level table})}
+_tables = {}
+
+
+def get_version_key(model):
+    return f"progressions:{model._meta.label}"
+
+
+def build_level_table(json_table):
+    """
+    Converts a JSON table keyed by level into a tuple of bonuses indexed by level.
+    Levels missing from the table are None.
+    """
+    bonuses = {int(level): bonus for level, bonus in json_table.items()}
+    return tuple(bonuses.get(level) for level in range(max(bonuses, default=0) + 1))
+
+
+def get_level_table(progression, field_name):
+    """
+    Returns the level table of a progression, loading the tables of all its model's progressions on first use.
+    Progressions created since the tables were loaded, or never saved, are converted on the fly.
+    """
+    model = type(progression)
+    version = get_shared_version(get_version_key(model))
+    cached = _tables.get(model)
+    if cached is None or cached[0] != version:
+        cached = _tables[model] = (
+            version,
+            MappingProxyType(
+                {
+                    pk: build_level_table(json_table)
+                    for pk, json_table in model.objects.values_list("pk", field_name)
+                }
+            ),
+        )
+    table = cached[1].get(progression.pk)
+    if table is None:
+        table = build_level_table(getattr(progression, field_name))
+    return table
+
+
+def get_level_bonus(progression, field_name, level):
+    """
+    Returns the bonus of a progression for the given level, or None if its table has no such level.
+    """
+    table = get_level_table(progression, field_name)
+    level = int(level)
+    return table[level] if 0 < level < len(table) else None
+
+
+def invalidate_progression_tables(sender, **kwargs):
+    """
+    Bumps the shared version of the sender model's tables once the current transaction commits,
+    so every process reloads them.
+    """
+    bump_shared_version(get_version_key(sender), using=kwargs.get("using"))
+
+
+def clear_progression_tables():
+    """
+    Drops the cached tables of every model in this process.
+    """
+    _tables.clear()
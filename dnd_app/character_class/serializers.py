@@ -19,55 +19,60 @@ from common.models import Alignment, Trait, Language, Die
 from feat.models import Feat
 from race.models import Race
 from skill.models import Skill
+from utils.serializers import (
+    DynamicFieldsModelSerializer,
+    ReferenceModelSerializer,
+    ReferenceRelatedField,
+)
 
 
-class BSBProgressionSerializer(serializers.ModelSerializer):
+class BSBProgressionSerializer(ReferenceModelSerializer):
     class Meta:
         model = BSBProgression
         fields = "__all__"
 
 
-class BABProgressionSerializer(serializers.ModelSerializer):
+class BABProgressionSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = BABProgression
         fields = "__all__"
 
 
-class ClassAlignmentSerializer(serializers.ModelSerializer):
+class ClassAlignmentSerializer(ReferenceModelSerializer):
     class Meta:
         model = ClassAlignment
         fields = "__all__"
 
 
-class ClassSkillSerializer(serializers.ModelSerializer):
+class ClassSkillSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ClassSkill
         fields = "__all__"
 
 
-class ClassTraitSerializer(serializers.ModelSerializer):
+class ClassTraitSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ClassTrait
         fields = "__all__"
 
 
-class ClassBsbProgressionSerializer(serializers.ModelSerializer):
+class ClassBsbProgressionSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ClassBsbProgression
         fields = "__all__"
 
 
-class ClassBonusLanguageSerializer(serializers.ModelSerializer):
+class ClassBonusLanguageSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ClassBonusLanguage
         fields = "__all__"
 
 
-class CharacterClassSerializer(serializers.ModelSerializer):
+class CharacterClassSerializer(ReferenceModelSerializer):
     bsb_progression = serializers.PrimaryKeyRelatedField(
         queryset=BSBProgression.objects.all(), many=True, required=False
     )
-    required_alignment = serializers.PrimaryKeyRelatedField(
+    required_alignment = ReferenceRelatedField(
         queryset=Alignment.objects.all(), many=True, required=False
     )
     class_skills = serializers.PrimaryKeyRelatedField(
@@ -105,25 +110,25 @@ class PrestigeCharacterClassSerializer(CharacterClassSerializer):
         fields = "__all__"
 
 
-class PrestigeClassSkillRankRequirementSerializer(serializers.ModelSerializer):
+class PrestigeClassSkillRankRequirementSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = PrestigeClassSkillRankRequirement
         fields = "__all__"
 
 
-class PrestigeClassRaceRequirementSerializer(serializers.ModelSerializer):
+class PrestigeClassRaceRequirementSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = PrestigeClassRaceRequirement
         fields = "__all__"
 
 
-class PrestigeClassLanguageRequirementSerializer(serializers.ModelSerializer):
+class PrestigeClassLanguageRequirementSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = PrestigeClassLanguageRequirement
         fields = "__all__"
 
 
-class PrestigeClassFeatRequirementSerializer(serializers.ModelSerializer):
+class PrestigeClassFeatRequirementSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = PrestigeClassFeatRequirement
         fields = "__all__"
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+
+from character_class.models import BABProgression, BSBProgression
+from character_class.progressions import invalidate_progression_tables
+
+
+def connect_signals():
+    for model in (BSBProgression, BABProgression):
+        post_save.connect(invalidate_progression_tables, sender=model)
+        post_delete.connect(invalidate_progression_tables, sender=model)
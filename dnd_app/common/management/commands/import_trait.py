@@ -4,62 +4,71 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from common.models import Trait, TraitClassification
+from utils.importers import (
+    BulkUpserter,
+    ImportLedger,
+    find_import_file,
+    write_import_result,
+    write_import_skipped,
+)
 
 
 class Command(BaseCommand):
     help = "Command to import 'Trait' data from a CSV file into the 'Trait' model"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every row even if the file has not changed",
+        )
+
     def handle(self, *args, **kwargs):
+        csv_path = find_import_file("common", "trait_list.csv")
+        ledger = ImportLedger(csv_path, force=kwargs["force"])
+        if ledger.is_unchanged():
+            write_import_skipped(self, "Trait", ledger)
+            return
+
         # Cache TraitClassification to avoid querying the database multiple times
         trait_classification_dict = {
             bonus.name: bonus.id for bonus in TraitClassification.objects.all()
         }
 
-        with open("dnd_app/common/initial_data/trait_list.csv", mode="r") as file:
+        with open(csv_path, mode="r") as file:
             reader = csv.DictReader(file, delimiter=";")
-            created = 0
-            exists = 0
-            for row in reader:
-                trait_classification_id = trait_classification_dict.get(
-                    row["Trait Classification"]
-                )
+            result = BulkUpserter(Trait, batch_size=kwargs["batch_size"]).run(
+                self.read_rows(reader, trait_classification_dict), ledger=ledger
+            )
+            write_import_result(self, "Trait", result)
 
-                if trait_classification_id is None:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"TraitClassification '{row['Trait Classification']}' not found"
-                        )
-                    )
-                    continue
+    def read_rows(self, reader, trait_classification_dict):
+        """
+        Yields the trait rows of the CSV reader one at a time,
+        skipping rows of unknown trait classifications.
+        """
+        for row in reader:
+            trait_classification_id = trait_classification_dict.get(
+                row["Trait Classification"]
+            )
 
-                try:
-                    trait = Trait.objects.get(
-                        short_description=row["Short Description"]
-                    )
-                    exists += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Trait '{trait.short_description}' already exists"
-                            )
-                        )
-                except Trait.DoesNotExist:
-                    trait = Trait.objects.create(
-                        short_description=row["Short Description"],
-                        long_description=row["Long Description"],
-                        link=row["Link"],
-                        trait_classification_id=trait_classification_id,
+            if trait_classification_id is None:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"TraitClassification '{row['Trait Classification']}' not found"
                     )
-                    created += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Successfully created Trait: '{trait.short_description}'"
-                            )
-                        )
-
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Finished importing 'Trait'. Created: {created}, Already exists: {exists}"
                 )
-            )
+                continue
+
+            yield {
+                "short_description": row["Short Description"],
+                "long_description": row["Long Description"],
+                "link": row["Link"],
+                "trait_classification_id": trait_classification_id,
+            }
@@ -1,4 +1,3 @@
-from rest_framework import serializers
 from .models import (
     Source,
     Die,
@@ -9,51 +8,52 @@ from .models import (
     Alignment,
     Language,
 )
+from utils.serializers import DynamicFieldsModelSerializer
 
 
-class SourceSerializer(serializers.ModelSerializer):
+class SourceSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Source
         fields = "__all__"
 
 
-class DieSerializer(serializers.ModelSerializer):
+class DieSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Die
         fields = "__all__"
 
 
-class TraitClassificationSerializer(serializers.ModelSerializer):
+class TraitClassificationSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = TraitClassification
         fields = "__all__"
 
 
-class TraitSerializer(serializers.ModelSerializer):
+class TraitSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Trait
         fields = "__all__"
 
 
-class DurationUnitSerializer(serializers.ModelSerializer):
+class DurationUnitSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = DurationUnit
         fields = "__all__"
 
 
-class AbilitySerializer(serializers.ModelSerializer):
+class AbilitySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Ability
         fields = "__all__"
 
 
-class AlignmentSerializer(serializers.ModelSerializer):
+class AlignmentSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Alignment
         fields = "__all__"
 
 
-class LanguageSerializer(serializers.ModelSerializer):
+class LanguageSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Language
         fields = "__all__"
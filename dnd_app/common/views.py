@@ -1,4 +1,5 @@
-from utils.views import CustomModelViewSet
+from utils.pagination import KeysetCursorPagination
+from utils.views import CustomModelViewSet, ExportMixin
 from .models import (
     Source,
     Die,
@@ -36,9 +37,11 @@ class TraitClassificationViewSet(CustomModelViewSet):
     serializer_class = TraitClassificationSerializer
 
 
-class TraitViewSet(CustomModelViewSet):
+class TraitViewSet(ExportMixin, CustomModelViewSet):
     queryset = Trait.objects.all()
     serializer_class = TraitSerializer
+    pagination_class = KeysetCursorPagination
+    cursor_ordering = ("short_description", "id")
 
 
 class DurationUnitViewSet(CustomModelViewSet):
@@ -0,0 +1,451 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from character.models import (
+    Character,
+    CharacterAbilityScore,
+    CharacterCharacterClass,
+    CharacterFeat,
+    CharacterInventory,
+    CharacterLanguage,
+    CharacterSkill,
+    Inventory,
+    InventoryItem,
+)
+from character_class.models import (
+    BABProgression,
+    BSBProgression,
+    CharacterClass,
+    ClassAlignment,
+    ClassBsbProgression,
+    ClassSkill,
+)
+from common.models import Ability, Alignment, Die, Language
+from feat.models import Feat, FeatFeatPrerequisite, FeatTypeOfFeat, TypeOfFeat
+from item.models import Item, ItemCategory
+from race.models import Race, RaceLanguage, Size
+from skill.models import Skill
+from spell.models import CastingTime, MagicSchool, Spell, SpellLevel, SpellRange
+from spell.search import update_search_documents
+
+FIRST_NAMES = ["Ara", "Bor", "Cel", "Dun", "Eli", "Fen", "Gar", "Hal", "Ith", "Jor"]
+LAST_NAMES = ["brand", "dir", "wen", "mir", "thas", "gorn", "riel", "dan", "wyn", "mar"]
+
+
+class Command(BaseCommand):
+    help = "Generates a large, reproducible world of races, classes, spells, feats, items and characters for load testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument("--characters", type=int, default=100_000)
+        parser.add_argument("--races", type=int, default=20)
+        parser.add_argument("--classes", type=int, default=40)
+        parser.add_argument("--spells", type=int, default=3_000)
+        parser.add_argument(
+            "--classes-per-spell",
+            type=int,
+            default=8,
+            help="Maximum number of classes a spell is linked to",
+        )
+        parser.add_argument("--feats", type=int, default=1_000)
+        parser.add_argument(
+            "--feat-chain-depth",
+            type=int,
+            default=10,
+            help="Length of the feat prerequisite chains",
+        )
+        parser.add_argument("--items", type=int, default=5_000)
+        parser.add_argument("--inventories", type=int, default=500)
+        parser.add_argument(
+            "--inventory-size",
+            type=int,
+            default=2_000,
+            help="Number of items held by every inventory",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5_000,
+            help="Number of rows inserted per query",
+        )
+
+    def handle(self, *args, **kwargs):
+        self.rng = random.Random(kwargs["seed"])
+        self.batch_size = kwargs["batch_size"]
+        self.prefix = f"World {kwargs['seed']}"
+        self.created = {}
+        started = time.perf_counter()
+
+        if Race.objects.filter(name__startswith=f"{self.prefix} ").exists():
+            raise CommandError(
+                f"A world with seed {kwargs['seed']} was already generated, use another --seed"
+            )
+        self.load_reference_data()
+
+        with transaction.atomic():
+            races = self.generate_races(kwargs["races"])
+            classes = self.generate_classes(kwargs["classes"])
+            self.generate_spells(kwargs["spells"], classes, kwargs["classes_per_spell"])
+            feats = self.generate_feats(kwargs["feats"], kwargs["feat_chain_depth"])
+            items = self.generate_items(kwargs["items"])
+            character_ids = self.generate_characters(
+                kwargs["characters"], races, classes, feats
+            )
+            self.generate_inventories(
+                kwargs["inventories"], kwargs["inventory_size"], items, character_ids
+            )
+
+        for model_name, (count, elapsed) in self.created.items():
+            self.stdout.write(f"{model_name}: {count} rows in {elapsed:.2f}s")
+        total = sum(count for count, elapsed in self.created.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total} rows in {time.perf_counter() - started:.2f}s"
+            )
+        )
+
+    def load_reference_data(self):
+        """
+        Loads the ids of the imported reference data the generated world is built on.
+        """
+        self.ability_ids = list(Ability.objects.values_list("id", flat=True))
+        self.alignment_ids = list(Alignment.objects.values_list("id", flat=True))
+        self.language_ids = list(Language.objects.values_list("id", flat=True))
+        self.skill_ids = list(Skill.objects.values_list("id", flat=True))
+        self.size_ids = list(Size.objects.values_list("id", flat=True))
+        self.die_ids = list(Die.objects.values_list("id", flat=True))
+        self.bab_progression_ids = list(
+            BABProgression.objects.values_list("id", flat=True)
+        )
+        self.bsb_progression_ids = {}
+        for bsb_progression in BSBProgression.objects.all():
+            self.bsb_progression_ids.setdefault(bsb_progression.ability_id, []).append(
+                bsb_progression.id
+            )
+        self.school_ids = list(MagicSchool.objects.values_list("id", flat=True))
+        self.casting_time_ids = list(CastingTime.objects.values_list("id", flat=True))
+        self.range_ids = list(SpellRange.objects.values_list("id", flat=True))
+        self.item_category_ids = list(ItemCategory.objects.values_list("id", flat=True))
+        self.type_of_feat_ids = list(TypeOfFeat.objects.values_list("id", flat=True))
+
+        missing = [
+            name
+            for name, ids in vars(self).items()
+            if name.endswith("_ids") and not ids
+        ]
+        if missing:
+            raise CommandError(
+                f"Reference data is missing ({', '.join(missing)}), run run_all_import_commands first"
+            )
+
+    def bulk_create(self, model, objects):
+        """
+        Inserts objects in batches, returning them with their primary keys set.
+        """
+        started = time.perf_counter()
+        objects = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        count, elapsed = self.created.get(model.__name__, (0, 0))
+        self.created[model.__name__] = (
+            count + len(objects),
+            elapsed + time.perf_counter() - started,
+        )
+        return objects
+
+    def generate_races(self, count):
+        races = self.bulk_create(
+            Race,
+            [
+                Race(
+                    name=f"{self.prefix} Race {index}",
+                    level_adjustment=self.rng.choice([0, 0, 0, 1, 2]),
+                    size_id=self.rng.choice(self.size_ids),
+                )
+                for index in range(count)
+            ],
+        )
+        self.bulk_create(
+            RaceLanguage,
+            [
+                RaceLanguage(race=race, language_id=language_id)
+                for race in races
+                for language_id in self.rng.sample(
+                    self.language_ids, min(2, len(self.language_ids))
+                )
+            ],
+        )
+        return races
+
+    def generate_classes(self, count):
+        classes = self.bulk_create(
+            CharacterClass,
+            [
+                CharacterClass(
+                    name=f"{self.prefix} Class {index}",
+                    max_level=20,
+                    skill_points_per_level=self.rng.choice([2, 4, 6, 8]),
+                    hit_die_id=self.rng.choice(self.die_ids),
+                    bab_progression_id=self.rng.choice(self.bab_progression_ids),
+                )
+                for index in range(count)
+            ],
+        )
+        self.bulk_create(
+            ClassBsbProgression,
+            [
+                ClassBsbProgression(
+                    character_class=character_class,
+                    bsb_progression_id=self.rng.choice(ids),
+                )
+                for character_class in classes
+                for ids in self.bsb_progression_ids.values()
+            ],
+        )
+        self.bulk_create(
+            ClassSkill,
+            [
+                ClassSkill(character_class=character_class, skill_id=skill_id)
+                for character_class in classes
+                for skill_id in self.rng.sample(
+                    self.skill_ids, min(8, len(self.skill_ids))
+                )
+            ],
+        )
+        self.bulk_create(
+            ClassAlignment,
+            [
+                ClassAlignment(
+                    character_class=character_class, alignment_id=alignment_id
+                )
+                for character_class in classes
+                for alignment_id in self.rng.sample(
+                    self.alignment_ids, self.rng.randint(1, len(self.alignment_ids))
+                )
+            ],
+        )
+        return classes
+
+    def generate_spells(self, count, classes, classes_per_spell):
+        spells = self.bulk_create(
+            Spell,
+            [
+                Spell(
+                    name=f"{self.prefix} Spell {index}",
+                    description=f"Generated spell number {index}",
+                    spell_resistance=self.rng.random() < 0.5,
+                    school_id=self.rng.choice(self.school_ids),
+                    casting_time_id=self.rng.choice(self.casting_time_ids),
+                    range_id=self.rng.choice(self.range_ids),
+                )
+                for index in range(count)
+            ],
+        )
+        self.bulk_create(
+            SpellLevel,
+            [
+                SpellLevel(
+                    spell=spell,
+                    character_class=character_class,
+                    level=self.rng.randint(0, 9),
+                )
+                for spell in spells
+                for character_class in self.rng.sample(
+                    classes, self.rng.randint(1, min(classes_per_spell, len(classes)))
+                )
+            ],
+        )
+        # bulk_create skips the signals maintaining spell search documents
+        update_search_documents(
+            Spell.objects.filter(name__startswith=f"{self.prefix} Spell ")
+        )
+
+    def generate_feats(self, count, chain_depth):
+        """
+        Generates feats in prerequisite chains of chain_depth feats, where every feat requires
+        the previous feat of its chain and sometimes a feat of an earlier chain.
+        """
+        feats = self.bulk_create(
+            Feat,
+            [
+                Feat(
+                    name=f"{self.prefix} Feat {index}",
+                    benefit=f"Generated feat number {index}",
+                )
+                for index in range(count)
+            ],
+        )
+        self.bulk_create(
+            FeatTypeOfFeat,
+            [
+                FeatTypeOfFeat(
+                    feat=feat, type_of_feat_id=self.rng.choice(self.type_of_feat_ids)
+                )
+                for feat in feats
+            ],
+        )
+        prerequisites = []
+        for index, feat in enumerate(feats):
+            chain_start = index - index % chain_depth
+            if index > chain_start:
+                prerequisites.append(
+                    FeatFeatPrerequisite(
+                        prerequisite_for_feat=feat, prerequisite=feats[index - 1]
+                    )
+                )
+            if chain_start > 0 and self.rng.random() < 0.2:
+                prerequisites.append(
+                    FeatFeatPrerequisite(
+                        prerequisite_for_feat=feat,
+                        prerequisite=feats[self.rng.randrange(chain_start)],
+                    )
+                )
+        self.bulk_create(FeatFeatPrerequisite, prerequisites)
+        return feats
+
+    def generate_items(self, count):
+        return self.bulk_create(
+            Item,
+            [
+                Item(
+                    name=f"{self.prefix} Item {index}",
+                    weight_in_lb=Decimal(self.rng.randint(0, 5000)) / 100,
+                    price_in_gp=Decimal(self.rng.randint(1, 1_000_000)) / 100,
+                    category_id=self.rng.choice(self.item_category_ids),
+                    size_id=self.rng.choice(self.size_ids),
+                )
+                for index in range(count)
+            ],
+        )
+
+    def generate_characters(self, count, races, classes, feats):
+        """
+        Generates characters batch by batch, each with multiclass levels, ability scores,
+        skills, languages and feats, and returns their ids.
+        """
+        character_ids = []
+        for batch_start in range(0, count, self.batch_size):
+            batch_count = min(self.batch_size, count - batch_start)
+            class_levels = [self.get_class_levels(classes) for _ in range(batch_count)]
+            characters = self.bulk_create(
+                Character,
+                [
+                    Character(
+                        name=f"{self.rng.choice(FIRST_NAMES)}{self.rng.choice(LAST_NAMES)}",
+                        level=sum(levels.values()),
+                        age=self.rng.randint(16, 400),
+                        race_id=self.rng.choice(races).id,
+                        alignment_id=self.rng.choice(self.alignment_ids),
+                    )
+                    for levels in class_levels
+                ],
+            )
+            character_ids.extend(character.id for character in characters)
+
+            self.bulk_create(
+                CharacterCharacterClass,
+                [
+                    CharacterCharacterClass(
+                        character=character,
+                        character_class=character_class,
+                        level=level,
+                    )
+                    for character, levels in zip(characters, class_levels)
+                    for character_class, level in levels.items()
+                ],
+            )
+            self.bulk_create(
+                CharacterAbilityScore,
+                [
+                    CharacterAbilityScore(
+                        character=character,
+                        ability_id=ability_id,
+                        value=sum(self.rng.randint(1, 6) for _ in range(3)),
+                    )
+                    for character in characters
+                    for ability_id in self.ability_ids
+                ],
+            )
+            self.bulk_create(
+                CharacterSkill,
+                [
+                    CharacterSkill(
+                        character=character,
+                        skill_id=skill_id,
+                        ranks=self.rng.randint(0, character.level + 3),
+                    )
+                    for character in characters
+                    for skill_id in self.rng.sample(
+                        self.skill_ids, min(4, len(self.skill_ids))
+                    )
+                ],
+            )
+            self.bulk_create(
+                CharacterLanguage,
+                [
+                    CharacterLanguage(character=character, language_id=language_id)
+                    for character in characters
+                    for language_id in self.rng.sample(
+                        self.language_ids, self.rng.randint(0, 2)
+                    )
+                ],
+            )
+            self.bulk_create(
+                CharacterFeat,
+                [
+                    CharacterFeat(character=character, feat=feat)
+                    for character in characters
+                    for feat in self.rng.sample(
+                        feats, min(len(feats), character.level // 3 + 1)
+                    )
+                ],
+            )
+        return character_ids
+
+    def get_class_levels(self, classes):
+        """
+        Returns a dict of one to three classes and their levels, adding up to at most 20.
+        """
+        class_count = self.rng.choices([1, 2, 3], weights=[70, 25, 5])[0]
+        levels = {}
+        remaining = 20
+        for character_class in self.rng.sample(classes, min(class_count, len(classes))):
+            level = self.rng.randint(1, max(1, remaining // 2))
+            levels[character_class] = level
+            remaining -= level
+        return levels
+
+    def generate_inventories(self, count, size, items, character_ids):
+        inventories = self.bulk_create(
+            Inventory,
+            [
+                Inventory(name=f"{self.prefix} Hoard {index}", capacity=size * 50)
+                for index in range(count)
+            ],
+        )
+        for inventory in inventories:
+            self.bulk_create(
+                InventoryItem,
+                [
+                    InventoryItem(
+                        inventory=inventory, item=item, quantity=self.rng.randint(1, 20)
+                    )
+                    for item in self.rng.choices(items, k=size)
+                ],
+            )
+        # bulk_create skips the signals maintaining the stored inventory totals
+        Inventory.objects.filter(
+            pk__in=[inventory.pk for inventory in inventories]
+        ).update_totals()
+        if character_ids:
+            self.bulk_create(
+                CharacterInventory,
+                [
+                    CharacterInventory(
+                        character_id=self.rng.choice(character_ids), inventory=inventory
+                    )
+                    for inventory in inventories
+                ],
+            )
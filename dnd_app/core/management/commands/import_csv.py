@@ -1,12 +1,18 @@
 import csv
-import os
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.apps import apps
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
-from django.template.defaultfilters import lower
+
+from utils.importers import (
+    BulkUpserter,
+    ImportLedger,
+    RejectWriter,
+    find_import_file,
+    write_import_result,
+    write_import_skipped,
+)
 
 
 class Command(BaseCommand):
@@ -20,13 +26,28 @@ class Command(BaseCommand):
             "model_name", type=str, help="The model name to import data into"
         )
         parser.add_argument("csv_file", type=str, help="The name of the CSV file")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every row even if the file has not changed",
+        )
+        parser.add_argument(
+            "--reject-file",
+            type=str,
+            help="CSV file the rows failing validation are written to, "
+            "defaults to <model_name>_rejects.csv",
+        )
 
     def handle(self, *args, **kwargs):
         model_name = kwargs["model_name"]
         app_name = kwargs["app_name"]
-        csv_file = os.path.join(
-            "dnd_app", app_name, "initial_data", lower(kwargs["csv_file"])
-        )
+        csv_file = kwargs["csv_file"]
 
         try:
             model = apps.get_model(app_name, model_name)
@@ -39,52 +60,21 @@ class Command(BaseCommand):
             return
 
         try:
-            with open(csv_file, mode="r") as file:
-                reader = csv.DictReader(file, delimiter=";")
-                created = 0
-                exists = 0
+            csv_path = find_import_file(app_name, csv_file)
+            ledger = ImportLedger(csv_path, force=kwargs["force"])
+            if ledger.is_unchanged():
+                write_import_skipped(self, model_name, ledger)
+                return
 
-                for row in reader:
-                    data = {}
-                    for key, value in row.items():
-                        formatted_key = key.lower().replace(" ", "_")
-                        if formatted_key in [f.name for f in model._meta.get_fields()]:
-                            data[formatted_key] = value
-                    try:
-                        obj = model.objects.get(**data)
-                        exists += 1
-                        if settings.IMPORT_DEBUG:
-                            self.stdout.write(
-                                self.style.WARNING(
-                                    f"'{model_name}' object '{obj}' already exists"
-                                )
-                            )
-                    except IntegrityError as e:
-                        if "duplicate key value violates unique constraint" in str(e):
-                            exists += 1
-                            if settings.IMPORT_DEBUG:
-                                self.stdout.write(
-                                    self.style.WARNING(
-                                        f"Unique constraint violation, skipping object with data: {data}"
-                                    )
-                                )
-                        else:
-                            raise
-                    except model.DoesNotExist:
-                        obj = model.objects.create(**data)
-                        created += 1
-                        if settings.IMPORT_DEBUG:
-                            self.stdout.write(
-                                self.style.SUCCESS(
-                                    f"Successfully created '{model_name}' object: '{obj}'"
-                                )
-                            )
-
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Finished importing '{model_name}'. Created: {created}, Already exists: {exists}"
-                    )
-                )
+            reject_file = kwargs["reject_file"] or f"{model_name.lower()}_rejects.csv"
+            with (
+                open(csv_path, mode="r", newline="") as file,
+                RejectWriter(reject_file) as rejects,
+            ):
+                reader = csv.DictReader(file, delimiter=";")
+                upserter = BulkUpserter(model, batch_size=kwargs["batch_size"])
+                result = upserter.run(reader, ledger=ledger, rejects=rejects)
+            write_import_result(self, model_name, result, rejects)
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"CSV file '{csv_file}' not found"))
         except ValidationError as e:
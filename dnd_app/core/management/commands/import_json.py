@@ -1,11 +1,18 @@
 import json
-import os
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.apps import apps
 from django.core.exceptions import ValidationError
 
+from utils.importers import (
+    BulkUpserter,
+    ImportLedger,
+    find_import_file,
+    write_import_result,
+    write_import_skipped,
+)
+
 
 class Command(BaseCommand):
     help = "Generalized command to import data from a JSON file located in <app>/initial_data/ into a model"
@@ -18,13 +25,22 @@ class Command(BaseCommand):
             "model_name", type=str, help="The model name to import data into"
         )
         parser.add_argument("json_file", type=str, help="The name of the JSON file")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every entry even if the file has not changed",
+        )
 
     def handle(self, *args, **kwargs):
         model_name = kwargs["model_name"]
         app_name = kwargs["app_name"]
-        json_file = os.path.join(
-            "dnd_app", app_name, "initial_data", kwargs["json_file"]
-        )
+        json_file = kwargs["json_file"]
 
         try:
             model = apps.get_model(app_name, model_name)
@@ -37,35 +53,17 @@ class Command(BaseCommand):
             return
 
         try:
-            with open(json_file, mode="r") as file:
-                data = json.load(file)
-                created = 0
-                exists = 0
-
-                for entry_key, entry_data in data.items():
-                    obj, created_flag = model.objects.get_or_create(**entry_data)
-                    if created_flag:
-                        created += 1
-                        if settings.IMPORT_DEBUG:
-                            self.stdout.write(
-                                self.style.SUCCESS(
-                                    f"Successfully created '{model_name}' object: '{obj}'"
-                                )
-                            )
-                    else:
-                        exists += 1
-                        if settings.IMPORT_DEBUG:
-                            self.stdout.write(
-                                self.style.WARNING(
-                                    f"'{model_name}' object '{obj}' already exists"
-                                )
-                            )
+            json_path = find_import_file(app_name, json_file)
+            ledger = ImportLedger(json_path, force=kwargs["force"])
+            if ledger.is_unchanged():
+                write_import_skipped(self, model_name, ledger)
+                return
 
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Finished importing '{model_name}'. Created: {created}, Already exists: {exists}"
-                    )
-                )
+            with open(json_path, mode="r") as file:
+                data = json.load(file)
+                upserter = BulkUpserter(model, batch_size=kwargs["batch_size"])
+                result = upserter.run(data.values(), ledger=ledger)
+                write_import_result(self, model_name, result)
         except FileNotFoundError:
             self.stdout.write(self.style.ERROR(f"JSON file '{json_file}' not found"))
         except ValidationError as e:
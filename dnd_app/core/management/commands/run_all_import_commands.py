@@ -1,141 +1,300 @@
-import glob
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import StringIO
 
-from django.conf import settings
-from django.core.management.base import BaseCommand
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
-
-
-class Command(BaseCommand):
-    help = "Lowercases names of all import files and then runs all import commands"
-
-    def lowercase_import_files(self):
-        """
-        This method lowercases all files inside initial_data folders
-        """
-        for app in settings.MY_APPS:
-            try:
-                app_path = os.path.join(settings.BASE_DIR, app.replace(".", "/"))
-                migrations_dir = os.path.join(app_path, "initial_data")
-                if not os.path.isdir(migrations_dir):
-                    continue
-                for migration_file in glob.glob(os.path.join(migrations_dir, "*.csv")):
-                    filename = os.path.basename(migration_file)
-                    if (
-                        not migration_file.endswith("__init__.py")
-                        and filename != filename.lower()
-                    ):
-                        os.rename(migration_file, migration_file.lower())
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Lowercased import file: {migration_file}"
-                            )
-                        )
-            except Exception as e:
-                self.stderr.write(
-                    self.style.ERROR(f"Error while renaming import files in {app}: {e}")
-                )
-
-    def handle(self, *args, **kwargs):
-        self.stdout.write(self.style.NOTICE("Lowercasing import files..."))
-        self.lowercase_import_files()
-
-        # Bulk imports with import_csv and import_json
-
-        self.stdout.write(self.style.NOTICE("Importing Die..."))
-        call_command("import_csv", "common", "Die", "Die_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing DurationUnit..."))
-        call_command("import_csv", "common", "DurationUnit", "DurationUnit_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing Source..."))
-        call_command("import_csv", "common", "Source", "Source_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing BABProgression..."))
-        call_command(
+from django.db import connections
+
+# Each import as (model label, command arguments). Dependencies between imports are
+# derived from the ForeignKeys of the target models, so the order here does not matter.
+IMPORT_COMMANDS = [
+    ("common.Die", ("import_csv", "common", "Die", "Die_list.csv")),
+    (
+        "common.DurationUnit",
+        ("import_csv", "common", "DurationUnit", "DurationUnit_list.csv"),
+    ),
+    ("common.Source", ("import_csv", "common", "Source", "Source_list.csv")),
+    (
+        "character_class.BABProgression",
+        (
             "import_json",
             "character_class",
             "BABProgression",
             "babprogression_list.json",
-        )
-
-        self.stdout.write(self.style.NOTICE("Importing TraitClassification..."))
-        call_command(
+        ),
+    ),
+    (
+        "common.TraitClassification",
+        (
             "import_csv",
             "common",
             "TraitClassification",
             "TraitClassification_list.csv",
-        )
-
-        self.stdout.write(self.style.NOTICE("Importing Alignment..."))
-        call_command("import_csv", "common", "Alignment", "Alignment_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing Ability..."))
-        call_command("import_csv", "common", "Ability", "Ability_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing BSBProgression..."))
-        call_command("import_bsbprogression")
-
-        self.stdout.write(self.style.NOTICE("Importing Skill..."))
-        call_command("import_skill")
+        ),
+    ),
+    ("common.Alignment", ("import_csv", "common", "Alignment", "Alignment_list.csv")),
+    ("common.Ability", ("import_csv", "common", "Ability", "Ability_list.csv")),
+    ("character_class.BSBProgression", ("import_bsbprogression",)),
+    ("skill.Skill", ("import_skill",)),
+    ("race.Size", ("import_csv", "race", "Size", "Size_list.csv")),
+    (
+        "spell.MagicAuraStrength",
+        ("import_csv", "spell", "MagicAuraStrength", "MagicAuraStrength_list.csv"),
+    ),
+    (
+        "spell.MagicSchool",
+        ("import_csv", "spell", "MagicSchool", "MagicSchool_list.csv"),
+    ),
+    (
+        "spell.MagicSubSchool",
+        ("import_csv", "spell", "MagicSubSchool", "MagicSubSchool_list.csv"),
+    ),
+    (
+        "spell.SpellDescriptor",
+        ("import_csv", "spell", "SpellDescriptor", "SpellDescriptor_list.csv"),
+    ),
+    (
+        "spell.SpellComponent",
+        ("import_csv", "spell", "SpellComponent", "SpellComponent_list.csv"),
+    ),
+    (
+        "spell.CastingTime",
+        ("import_csv", "spell", "CastingTime", "CastingTime_list.csv"),
+    ),
+    ("spell.SpellRange", ("import_csv", "spell", "SpellRange", "SpellRange_list.csv")),
+    (
+        "item.ItemCategory",
+        ("import_csv", "item", "ItemCategory", "ItemCategory_list.csv"),
+    ),
+    (
+        "item.WeaponCategory",
+        ("import_csv", "item", "WeaponCategory", "WeaponCategory_list.csv"),
+    ),
+    (
+        "item.WeaponDamageType",
+        ("import_csv", "item", "WeaponDamageType", "WeaponDamageType_list.csv"),
+    ),
+    ("item.ArmorType", ("import_csv", "item", "ArmorType", "ArmorType_list.csv")),
+    (
+        "item.SpecialMaterial",
+        ("import_csv", "item", "SpecialMaterial", "SpecialMaterial_list.csv"),
+    ),
+    ("common.Language", ("import_csv", "common", "Language", "Language_list.csv")),
+    ("feat.TypeOfFeat", ("import_csv", "feat", "TypeOfFeat", "TypeOfFeat_list.csv")),
+    ("common.Trait", ("import_trait",)),
+    ("race.AbilityModifier", ("generate_ability_modifier", "-6", "6")),
+]
+
+
+def get_import_dependencies(import_commands):
+    """
+    Returns a dict mapping each imported model label to the set of imported model labels
+    it references through a ForeignKey, OneToOneField or ManyToManyField.
+    """
+    labels = {label for label, command_args in import_commands}
+    dependencies = {}
+    for label, command_args in import_commands:
+        model = apps.get_model(label)
+        dependencies[label] = {
+            field.related_model._meta.label
+            for field in model._meta.fields + model._meta.many_to_many
+            if field.is_relation
+            and field.related_model is not model
+            and field.related_model._meta.label in labels
+        }
+    return dependencies
+
+
+def get_import_stages(dependencies):
+    """
+    Groups imported model labels into stages, where each stage only depends on earlier ones.
+    Raises CommandError naming the imports whose dependencies are circular or never imported.
+    """
+    stage_of = {}
+    waiting = dict(dependencies)
+    while waiting:
+        ready = [
+            label
+            for label, label_dependencies in waiting.items()
+            if label_dependencies <= stage_of.keys()
+        ]
+        if not ready:
+            raise get_unresolved_imports_error(waiting)
+        for label in ready:
+            stage_of[label] = 1 + max(
+                (stage_of[dependency] for dependency in waiting.pop(label)),
+                default=-1,
+            )
+
+    stages = []
+    for label in dependencies:
+        stage = stage_of[label]
+        while len(stages) <= stage:
+            stages.append([])
+        stages[stage].append(label)
+    return stages
+
+
+def get_unresolved_imports_error(labels):
+    return CommandError(
+        "Imports with circular or missing dependencies: " + ", ".join(sorted(labels))
+    )
+
+
+def get_critical_path(dependencies, durations):
+    """
+    Returns the chain of dependent imports with the longest total duration, and that duration.
+    """
+    finish = {}
+    previous = {}
+    for stage in get_import_stages(dependencies):
+        for label in stage:
+            previous[label] = max(
+                dependencies[label],
+                key=lambda dependency: finish[dependency],
+                default=None,
+            )
+            finish[label] = durations[label] + (
+                finish[previous[label]] if previous[label] else 0
+            )
+
+    label = max(finish, key=finish.get)
+    total = finish[label]
+    path = []
+    while label:
+        path.append(label)
+        label = previous[label]
+    return path[::-1], total
+
+
+def init_import_worker():
+    """
+    Sets up Django in a pool worker, which then opens its own database connections.
+    """
+    django.setup()
+    connections.close_all()
+
+
+def run_import_command(command_args, force=False):
+    """
+    Runs one import command and returns its output with start and end timestamps.
+    """
+    if force and command_args[0].startswith("import_"):
+        # Only the import_* commands read initial_data files tracked by the import ledger
+        command_args = (*command_args, "--force")
+    stdout = StringIO()
+    started = time.time()
+    call_command(*command_args, stdout=stdout)
+    return stdout.getvalue(), started, time.time()
 
-        self.stdout.write(self.style.NOTICE("Importing Size..."))
-        call_command("import_csv", "race", "Size", "Size_list.csv")
 
-        self.stdout.write(self.style.NOTICE("Importing MagicAuraStrength..."))
-        call_command(
-            "import_csv", "spell", "MagicAuraStrength", "MagicAuraStrength_list.csv"
-        )
-
-        self.stdout.write(self.style.NOTICE("Importing MagicSchool..."))
-        call_command("import_csv", "spell", "MagicSchool", "MagicSchool_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing MagicSubSchool..."))
-        call_command("import_csv", "spell", "MagicSubSchool", "MagicSubSchool_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing SpellDescriptor..."))
-        call_command(
-            "import_csv", "spell", "SpellDescriptor", "SpellDescriptor_list.csv"
+class Command(BaseCommand):
+    help = "Runs all import commands, independent ones in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes running independent imports concurrently",
         )
-
-        self.stdout.write(self.style.NOTICE("Importing SpellComponent..."))
-        call_command("import_csv", "spell", "SpellComponent", "SpellComponent_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing CastingTime..."))
-        call_command("import_csv", "spell", "CastingTime", "CastingTime_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing SpellRange..."))
-        call_command("import_csv", "spell", "SpellRange", "SpellRange_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing ItemCategory..."))
-        call_command("import_csv", "item", "ItemCategory", "ItemCategory_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing WeaponCategory..."))
-        call_command("import_csv", "item", "WeaponCategory", "WeaponCategory_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing WeaponDamageType..."))
-        call_command(
-            "import_csv", "item", "WeaponDamageType", "WeaponDamageType_list.csv"
+        parser.add_argument(
+            "--serial",
+            action="store_true",
+            help="Run all imports one after another in this process",
         )
-
-        self.stdout.write(self.style.NOTICE("Importing ArmorType..."))
-        call_command("import_csv", "item", "ArmorType", "ArmorType_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing SpecialMaterial..."))
-        call_command(
-            "import_csv", "item", "SpecialMaterial", "SpecialMaterial_list.csv"
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every file even if it has not changed",
         )
 
-        self.stdout.write(self.style.NOTICE("Importing Language..."))
-        call_command("import_csv", "common", "Language", "Language_list.csv")
-
-        self.stdout.write(self.style.NOTICE("Importing TypeOfFeat..."))
-        call_command("import_csv", "feat", "TypeOfFeat", "TypeOfFeat_list.csv")
+    def handle(self, *args, **kwargs):
+        commands = dict(IMPORT_COMMANDS)
+        dependencies = get_import_dependencies(IMPORT_COMMANDS)
+        started = time.time()
+        if kwargs["serial"] or kwargs["workers"] <= 1:
+            timings = self.run_serial(commands, dependencies, kwargs["force"])
+        else:
+            timings = self.run_parallel(
+                commands, dependencies, kwargs["workers"], kwargs["force"]
+            )
+
+        self.report_timings(dependencies, timings, time.time() - started)
+        self.stdout.write(self.style.SUCCESS("All commands ran successfully"))
 
-        self.stdout.write(self.style.NOTICE("Importing Trait..."))
-        call_command("import_trait")
+    def write_import_output(self, label, output):
+        self.stdout.write(self.style.NOTICE(f"Importing {label.split('.')[1]}..."))
+        self.stdout.write(output, ending="")
 
-        self.stdout.write(self.style.NOTICE("Running generate_ability_modifier..."))
-        call_command("generate_ability_modifier", "-6", "6")
+    def run_serial(self, commands, dependencies, force):
+        timings = {}
+        for stage in get_import_stages(dependencies):
+            for label in stage:
+                output, started, finished = run_import_command(commands[label], force)
+                self.write_import_output(label, output)
+                timings[label] = (started, finished)
+        return timings
 
-        self.stdout.write(self.style.SUCCESS("All commands ran successfully"))
+    def run_parallel(self, commands, dependencies, workers, force):
+        """
+        Submits every import as soon as all imports it depends on have finished.
+        """
+        timings = {}
+        waiting = dict(dependencies)
+        # Forked workers must not share the connections of this process
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_import_worker
+        ) as executor:
+            running = {}
+            while waiting or running:
+                for label, label_dependencies in list(waiting.items()):
+                    if label_dependencies <= timings.keys():
+                        del waiting[label]
+                        future = executor.submit(
+                            run_import_command, commands[label], force
+                        )
+                        running[future] = label
+                if not running:
+                    raise get_unresolved_imports_error(waiting)
+
+                done, not_done = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    label = running.pop(future)
+                    try:
+                        output, started, finished = future.result()
+                    except Exception as e:
+                        for pending_future in not_done:
+                            pending_future.cancel()
+                        raise CommandError(f"Importing {label} failed: {e}") from e
+                    self.write_import_output(label, output)
+                    timings[label] = (started, finished)
+        return timings
+
+    def report_timings(self, dependencies, timings, total):
+        self.stdout.write(self.style.NOTICE("Import timings:"))
+        for index, stage in enumerate(get_import_stages(dependencies), start=1):
+            stage_started = min(timings[label][0] for label in stage)
+            stage_finished = max(timings[label][1] for label in stage)
+            self.stdout.write(
+                f"Stage {index} ({stage_finished - stage_started:.2f}s): "
+                + ", ".join(
+                    f"{label.split('.')[1]} {timings[label][1] - timings[label][0]:.2f}s"
+                    for label in stage
+                )
+            )
+
+        durations = {
+            label: finished - started for label, (started, finished) in timings.items()
+        }
+        path, path_duration = get_critical_path(dependencies, durations)
+        self.stdout.write(
+            f"Critical path ({path_duration:.2f}s): "
+            + " -> ".join(label.split(".")[1] for label in path)
+        )
+        self.stdout.write(f"Total wall-clock time: {total:.2f}s")
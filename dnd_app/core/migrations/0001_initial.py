@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportedFile",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("path", models.CharField(max_length=255, unique=True)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("imported_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ImportedRow",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("row_key", models.TextField()),
+                ("row_hash", models.CharField(max_length=64)),
+                (
+                    "imported_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.importedfile",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("imported_file", "row_key")},
+            },
+        ),
+    ]
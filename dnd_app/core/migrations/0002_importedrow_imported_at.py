@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importedrow",
+            name="imported_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ImportedFile(models.Model):
+    """
+    This model represents an initial_data file that has been imported, with the hash of its content
+    """
+
+    id = models.AutoField(primary_key=True)
+    path = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=64)
+    imported_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.path
+
+
+class ImportedRow(models.Model):
+    """
+    This model represents a row of an imported file, identified by its natural key, with the hash of its content
+    """
+
+    id = models.AutoField(primary_key=True)
+    row_key = models.TextField()
+    row_hash = models.CharField(max_length=64)
+    imported_at = models.DateTimeField(default=timezone.now)
+
+    # FK
+    imported_file = models.ForeignKey(ImportedFile, on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"{self.imported_file}: {self.row_key}"
+
+    class Meta:
+        unique_together = ("imported_file", "row_key")
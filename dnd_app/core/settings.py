@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -25,6 +26,39 @@ SECRET_KEY = "django-insecure-uc)a+d3q&d934#qn!bt*h&#orlt3j&w(-!k4sk#5v+1-tgs+oa
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 IMPORT_DEBUG = False
+IMPORT_BATCH_SIZE = 500
+
+# Small, rarely changing tables served from utils.reference_cache,
+# mapped to the field get_by_name() finds their rows by
+REFERENCE_CACHE_MODELS = {
+    "common.Ability": "name",
+    "common.Alignment": "name",
+    "common.Die": "sides",
+    "race.Size": "name",
+    "spell.SpellComponent": "name",
+    "spell.MagicSchool": "name",
+    "spell.CastingTime": "name",
+    "item.ItemCategory": "name",
+    "item.WeaponDamageType": "name",
+    "item.ArmorType": "name",
+    "feat.TypeOfFeat": "name",
+}
+# Alias of a cache in CACHES shared by every process, holding reference cache versions.
+# The file based cache below is shared by the processes of one host; deployments over several
+# hosts should point it to a database, Memcached or Redis cache. None keeps versions per process.
+REFERENCE_CACHE_ALIAS = "reference"
+# Seconds a process serves a reference table before checking whether another process changed it
+REFERENCE_CACHE_CHECK_INTERVAL = 1
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "reference": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": Path(tempfile.gettempdir()) / "dnd_app_reference_cache",
+    },
+}
 
 ALLOWED_HOSTS = ["127.0.0.1", "localhost", "127.0.0.1:8000"]
 
@@ -102,7 +136,9 @@ DATABASES = {
 }
 
 REST_FRAMEWORK = {
-    "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"]
+    "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_PAGINATION_CLASS": "utils.pagination.OptionalPageNumberPagination",
+    "PAGE_SIZE": 100,
 }
 
 # Password validation
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class FeatConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "feat"
+
+    def ready(self):
+        from feat.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,193 @@
+"""
+Feat prerequisite graph.
+
+The whole graph of feat, ability score and skill rank prerequisites is loaded once per process
+in four queries, and kept until a feat or a prerequisite row is saved or deleted in this process.
+Feats added by bulk writes or other processes are picked up when they are looked up;
+other changes made that way after `clear_prerequisite_graph()` is called or the process restarts.
+"""
+
+from collections import defaultdict, deque
+from functools import cached_property
+
+from feat.models import (
+    Feat,
+    FeatAbilityPrerequisite,
+    FeatFeatPrerequisite,
+    FeatSkillPrerequisite,
+)
+
+_graph = None
+
+
+class FeatPrerequisiteGraph:
+    """
+    In-memory graph of feat prerequisites, with the transitive closure of every feat's feat
+    prerequisites and a topological order of all feats computed on first use.
+    """
+
+    def __init__(self, feat_names, feat_prerequisites, ability_scores, skill_ranks):
+        # {feat id: name}
+        self.feat_names = feat_names
+        # {feat id: set of feat ids required directly}
+        self.feat_prerequisites = feat_prerequisites
+        # {feat id: {ability id: required score}}
+        self.ability_scores = ability_scores
+        # {feat id: {skill id: required ranks}}
+        self.skill_ranks = skill_ranks
+
+    @classmethod
+    def load(cls):
+        feat_prerequisites = defaultdict(set)
+        for feat_id, prerequisite_id in FeatFeatPrerequisite.objects.values_list(
+            "prerequisite_for_feat_id", "prerequisite_id"
+        ):
+            feat_prerequisites[feat_id].add(prerequisite_id)
+        ability_scores = defaultdict(dict)
+        for feat_id, ability_id, score in FeatAbilityPrerequisite.objects.values_list(
+            "feat_id", "ability_id", "required_ability_value"
+        ):
+            ability_scores[feat_id][ability_id] = score
+        skill_ranks = defaultdict(dict)
+        for feat_id, skill_id, ranks in FeatSkillPrerequisite.objects.values_list(
+            "feat_id", "skill_id", "required_ranks"
+        ):
+            skill_ranks[feat_id][skill_id] = ranks
+        return cls(
+            dict(Feat.objects.values_list("id", "name")),
+            dict(feat_prerequisites),
+            dict(ability_scores),
+            dict(skill_ranks),
+        )
+
+    @cached_property
+    def topological_order(self):
+        """
+        Returns feat ids ordered so every feat comes after all of its prerequisites.
+        Feats on a prerequisite cycle, which can never be taken, are left out.
+        """
+        dependents = defaultdict(list)
+        remaining = {}
+        for feat_id in self.feat_names:
+            prerequisites = self.feat_prerequisites.get(feat_id, set())
+            remaining[feat_id] = len(prerequisites)
+            for prerequisite_id in prerequisites:
+                dependents[prerequisite_id].append(feat_id)
+
+        ready = deque(
+            sorted(feat_id for feat_id, count in remaining.items() if count == 0)
+        )
+        order = []
+        while ready:
+            feat_id = ready.popleft()
+            order.append(feat_id)
+            for dependent_id in dependents[feat_id]:
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    ready.append(dependent_id)
+        return order
+
+    @cached_property
+    def all_prerequisites(self):
+        """
+        Returns {feat id: frozenset of every feat id required directly or indirectly}.
+        """
+        closure = {}
+        for feat_id in self.topological_order:
+            required = set()
+            for prerequisite_id in self.feat_prerequisites.get(feat_id, ()):
+                required.add(prerequisite_id)
+                required |= closure[prerequisite_id]
+            closure[feat_id] = frozenset(required)
+        return closure
+
+    def get_all_prerequisites(self, feat_id):
+        """
+        Returns the ids of every feat required to take the feat, in the order they can be taken.
+        Returns None for feats on a prerequisite cycle, and raises KeyError for unknown feats.
+        """
+        if feat_id not in self.feat_names:
+            raise KeyError(feat_id)
+        required = self.all_prerequisites.get(feat_id)
+        if required is None:
+            return None
+        return [
+            prerequisite_id
+            for prerequisite_id in self.topological_order
+            if prerequisite_id in required
+        ]
+
+    def get_missing_prerequisites(self, feat_id, ability_scores, skill_ranks, feat_ids):
+        """
+        Returns what a character lacks to take the feat, given its {ability id: score},
+        {skill id: ranks} and the set of its feat ids. An empty dict means the feat can be taken.
+        """
+        missing = {}
+        abilities = {
+            ability_id: score
+            for ability_id, score in self.ability_scores.get(feat_id, {}).items()
+            if ability_scores.get(ability_id, 0) < score
+        }
+        if abilities:
+            missing["ability_scores"] = abilities
+        skills = {
+            skill_id: ranks
+            for skill_id, ranks in self.skill_ranks.get(feat_id, {}).items()
+            if skill_ranks.get(skill_id, 0) < ranks
+        }
+        if skills:
+            missing["skill_ranks"] = skills
+        feats = sorted(self.feat_prerequisites.get(feat_id, set()) - feat_ids)
+        if feats:
+            missing["feats"] = feats
+        return missing
+
+    def get_eligible_feats(self, ability_scores, skill_ranks, feat_ids):
+        """
+        Returns ids of the feats a character does not have yet but meets every prerequisite of,
+        in topological order.
+        """
+        feat_ids = set(feat_ids)
+        return [
+            feat_id
+            for feat_id in self.topological_order
+            if feat_id not in feat_ids
+            and not self.get_missing_prerequisites(
+                feat_id, ability_scores, skill_ranks, feat_ids
+            )
+        ]
+
+
+def get_prerequisite_graph(feat_ids=()):
+    """
+    Returns the process-wide feat prerequisite graph, loading it on first use.
+    The graph is reloaded when it does not know one of the given feat ids,
+    as the feat may have been added by another process or a bulk write.
+    """
+    global _graph
+    if _graph is None or not _graph.feat_names.keys() >= set(feat_ids):
+        _graph = FeatPrerequisiteGraph.load()
+    return _graph
+
+
+def clear_prerequisite_graph(sender=None, **kwargs):
+    global _graph
+    _graph = None
+
+
+def get_eligible_feats_for_character(character):
+    """
+    Returns ids of the feats the character can take next, reading its ability scores,
+    skill ranks and feats in three queries.
+    """
+    ability_scores = {
+        ability_id: value + bonus
+        for ability_id, value, bonus in character.characterabilityscore_set.values_list(
+            "ability_id", "value", "bonus"
+        )
+    }
+    skill_ranks = dict(character.characterskill_set.values_list("skill_id", "ranks"))
+    feat_ids = set(character.characterfeat_set.values_list("feat_id", flat=True))
+    return get_prerequisite_graph().get_eligible_feats(
+        ability_scores, skill_ranks, feat_ids
+    )
@@ -10,19 +10,24 @@ from .models import (
     FeatFeatPrerequisite,
     FeatSkillPrerequisite,
 )
+from utils.serializers import (
+    DynamicFieldsModelSerializer,
+    ReferenceModelSerializer,
+    ReferenceRelatedField,
+)
 
 
-class TypeOfFeatSerializer(serializers.ModelSerializer):
+class TypeOfFeatSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = TypeOfFeat
         fields = "__all__"
 
 
-class FeatSerializer(serializers.ModelSerializer):
+class FeatSerializer(ReferenceModelSerializer):
     feat_type = serializers.PrimaryKeyRelatedField(
         queryset=TypeOfFeat.objects.all(), many=True
     )
-    ability_prerequisite = serializers.PrimaryKeyRelatedField(
+    ability_prerequisite = ReferenceRelatedField(
         queryset=Ability.objects.all(), many=True, required=False
     )
     skill_prerequisite = serializers.PrimaryKeyRelatedField(
@@ -37,25 +42,25 @@ class FeatSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class FeatTypeOfFeatSerializer(serializers.ModelSerializer):
+class FeatTypeOfFeatSerializer(ReferenceModelSerializer):
     class Meta:
         model = FeatTypeOfFeat
         fields = "__all__"
 
 
-class FeatAbilityPrerequisiteSerializer(serializers.ModelSerializer):
+class FeatAbilityPrerequisiteSerializer(ReferenceModelSerializer):
     class Meta:
         model = FeatAbilityPrerequisite
         fields = "__all__"
 
 
-class FeatFeatPrerequisiteSerializer(serializers.ModelSerializer):
+class FeatFeatPrerequisiteSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = FeatFeatPrerequisite
         fields = "__all__"
 
 
-class FeatSkillPrerequisiteSerializer(serializers.ModelSerializer):
+class FeatSkillPrerequisiteSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = FeatSkillPrerequisite
         fields = "__all__"
@@ -0,0 +1,27 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from feat.models import (
+    Feat,
+    FeatAbilityPrerequisite,
+    FeatFeatPrerequisite,
+    FeatSkillPrerequisite,
+)
+from feat.prerequisites import clear_prerequisite_graph
+
+
+def connect_signals():
+    for model in (
+        Feat,
+        FeatAbilityPrerequisite,
+        FeatFeatPrerequisite,
+        FeatSkillPrerequisite,
+    ):
+        post_save.connect(clear_prerequisite_graph, sender=model)
+        post_delete.connect(clear_prerequisite_graph, sender=model)
+    # serializers set prerequisites with bulk writes, which only send m2m_changed
+    for through in (
+        FeatAbilityPrerequisite,
+        FeatFeatPrerequisite,
+        FeatSkillPrerequisite,
+    ):
+        m2m_changed.connect(clear_prerequisite_graph, sender=through)
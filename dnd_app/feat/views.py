@@ -1,4 +1,9 @@
-from utils.views import CustomModelViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from utils.pagination import KeysetCursorPagination
+from utils.views import CustomModelViewSet, ExportMixin
 from .models import (
     TypeOfFeat,
     Feat,
@@ -7,6 +12,7 @@ from .models import (
     FeatFeatPrerequisite,
     FeatSkillPrerequisite,
 )
+from .prerequisites import get_prerequisite_graph
 from .serializers import (
     TypeOfFeatSerializer,
     FeatSerializer,
@@ -22,9 +28,28 @@ class TypeOfFeatViewSet(CustomModelViewSet):
     serializer_class = TypeOfFeatSerializer
 
 
-class FeatViewSet(CustomModelViewSet):
+class FeatViewSet(ExportMixin, CustomModelViewSet):
     queryset = Feat.objects.all()
     serializer_class = FeatSerializer
+    pagination_class = KeysetCursorPagination
+
+    @action(detail=True, methods=["get"])
+    def prerequisites(self, request, pk=None):
+        """
+        Returns every feat required directly or indirectly to take the feat,
+        in an order they can be taken in.
+        """
+        feat = self.get_object()
+        graph = get_prerequisite_graph(feat_ids=[feat.pk])
+        feat_ids = graph.get_all_prerequisites(feat.pk)
+        if feat_ids is None:
+            return Response(
+                {"detail": "This feat's prerequisites form a cycle."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            [{"id": feat_id, "name": graph.feat_names[feat_id]} for feat_id in feat_ids]
+        )
 
 
 class FeatTypeOfFeatViewSet(CustomModelViewSet):
@@ -5,6 +5,7 @@ from django.db import models
 from utils.constraints import at_least_one_not_null_field
 from common.models import Source
 from utils.validators import validate_integer_in_range, validate_positive_integer
+from utils.reference_cache import get_id_by_name
 from feat.models import Feat
 from race.models import Size
 from spell.models import MagicAuraStrength, MagicSchool, Spell
@@ -23,10 +24,7 @@ class ItemCategory(models.Model):
 
     @staticmethod
     def get_default_category_id():
-        try:
-            return ItemCategory.objects.get(name="Item").id
-        except ItemCategory.DoesNotExist:
-            return None
+        return get_id_by_name(ItemCategory, "Item")
 
     def __str__(self):
         return self.name
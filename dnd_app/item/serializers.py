@@ -22,27 +22,28 @@ from item.models import (
     Armor,
 )
 from spell.models import Spell
+from utils.serializers import DynamicFieldsModelSerializer, ReferenceModelSerializer
 
 
-class ItemCategorySerializer(serializers.ModelSerializer):
+class ItemCategorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ItemCategory
         fields = "__all__"
 
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(ReferenceModelSerializer):
     class Meta:
         model = Item
         fields = "__all__"
 
 
-class SpecialMaterialSerializer(serializers.ModelSerializer):
+class SpecialMaterialSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpecialMaterial
         fields = "__all__"
 
 
-class WeaponMagicAbilitySerializer(serializers.ModelSerializer):
+class WeaponMagicAbilitySerializer(ReferenceModelSerializer):
     feats_required = serializers.PrimaryKeyRelatedField(
         queryset=Feat.objects.all(), many=True, required=False
     )
@@ -55,19 +56,19 @@ class WeaponMagicAbilitySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class WeaponMagicAbilityFeatSerializer(serializers.ModelSerializer):
+class WeaponMagicAbilityFeatSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponMagicAbilityFeat
         fields = "__all__"
 
 
-class WeaponMagicAbilitySpellSerializer(serializers.ModelSerializer):
+class WeaponMagicAbilitySpellSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponMagicAbilitySpell
         fields = "__all__"
 
 
-class ArmorMagicAbilitySerializer(serializers.ModelSerializer):
+class ArmorMagicAbilitySerializer(ReferenceModelSerializer):
     feats_required = serializers.PrimaryKeyRelatedField(
         queryset=Feat.objects.all(), many=True, required=False
     )
@@ -80,25 +81,25 @@ class ArmorMagicAbilitySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class ArmorMagicAbilityFeatSerializer(serializers.ModelSerializer):
+class ArmorMagicAbilityFeatSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ArmorMagicAbilityFeat
         fields = "__all__"
 
 
-class ArmorMagicAbilitySpellSerializer(serializers.ModelSerializer):
+class ArmorMagicAbilitySpellSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ArmorMagicAbilitySpell
         fields = "__all__"
 
 
-class WeaponCategorySerializer(serializers.ModelSerializer):
+class WeaponCategorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponCategory
         fields = "__all__"
 
 
-class WeaponDamageTypeSerializer(serializers.ModelSerializer):
+class WeaponDamageTypeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponDamageType
         fields = "__all__"
@@ -117,31 +118,31 @@ class WeaponSerializer(ItemSerializer):
         fields = "__all__"
 
 
-class WeaponWeaponCategorySerializer(serializers.ModelSerializer):
+class WeaponWeaponCategorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponWeaponCategory
         fields = "__all__"
 
 
-class WeaponWeaponDamageTypeSerializer(serializers.ModelSerializer):
+class WeaponWeaponDamageTypeSerializer(ReferenceModelSerializer):
     class Meta:
         model = WeaponWeaponDamageType
         fields = "__all__"
 
 
-class WeaponWeaponMagicAbilitySerializer(serializers.ModelSerializer):
+class WeaponWeaponMagicAbilitySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = WeaponWeaponMagicAbility
         fields = "__all__"
 
 
-class ArmorTypeSerializer(serializers.ModelSerializer):
+class ArmorTypeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ArmorType
         fields = "__all__"
 
 
-class ArmorSerializer(serializers.ModelSerializer):
+class ArmorSerializer(DynamicFieldsModelSerializer):
     armor_magic_ability = serializers.PrimaryKeyRelatedField(
         queryset=ArmorMagicAbility.objects.all(), many=True, required=False
     )
@@ -151,7 +152,7 @@ class ArmorSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class ArmorArmorMagicAbilitySerializer(serializers.ModelSerializer):
+class ArmorArmorMagicAbilitySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ArmorArmorMagicAbility
         fields = "__all__"
@@ -38,7 +38,8 @@ from item.serializers import (
     ArmorSerializer,
     ArmorArmorMagicAbilitySerializer,
 )
-from utils.views import CustomModelViewSet
+from utils.pagination import KeysetCursorPagination
+from utils.views import CustomModelViewSet, ExportMixin
 
 
 class ItemCategoryViewSet(CustomModelViewSet):
@@ -46,9 +47,10 @@ class ItemCategoryViewSet(CustomModelViewSet):
     serializer_class = ItemCategorySerializer
 
 
-class ItemViewSet(CustomModelViewSet):
+class ItemViewSet(ExportMixin, CustomModelViewSet):
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
+    pagination_class = KeysetCursorPagination
 
 
 class SpecialMaterialViewSet(CustomModelViewSet):
@@ -102,9 +104,10 @@ class WeaponDamageTypeViewSet(CustomModelViewSet):
     custom_view_name = "(Weapon - Damage Type) List"
 
 
-class WeaponViewSet(CustomModelViewSet):
+class WeaponViewSet(ExportMixin, CustomModelViewSet):
     queryset = Weapon.objects.all()
     serializer_class = WeaponSerializer
+    pagination_class = KeysetCursorPagination
 
 
 class WeaponWeaponCategoryViewSet(CustomModelViewSet):
@@ -130,9 +133,10 @@ class ArmorTypeViewSet(CustomModelViewSet):
     serializer_class = ArmorTypeSerializer
 
 
-class ArmorViewSet(CustomModelViewSet):
+class ArmorViewSet(ExportMixin, CustomModelViewSet):
     queryset = Armor.objects.all()
     serializer_class = ArmorSerializer
+    pagination_class = KeysetCursorPagination
 
 
 class ArmorArmorMagicAbilityViewSet(CustomModelViewSet):
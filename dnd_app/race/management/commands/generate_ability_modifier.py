@@ -1,7 +1,7 @@
-from django.conf import settings
 from django.core.management.base import BaseCommand
 from race.models import AbilityModifier
 from common.models import Ability
+from utils.importers import BulkUpserter, write_import_result
 
 
 class Command(BaseCommand):
@@ -19,33 +19,12 @@ class Command(BaseCommand):
         min_value = kwargs["min_value"]
         max_value = kwargs["max_value"]
 
-        created = 0
-        exists = 0
-        for ability in Ability.objects.all():
-            for value in range(min_value, max_value + 1):
-                if value == 0:
-                    continue
-                ability_modifier, created_flag = AbilityModifier.objects.get_or_create(
-                    value=value, ability=ability
-                )
-                if created_flag:
-                    created += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Successfully created ability modifier: {ability_modifier}"
-                            )
-                        )
-                else:
-                    exists += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.WARNING(
-                                f"Ability modifier {ability_modifier} already exists"
-                            )
-                        )
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Finished generating ability modifiers... Created: {created}, Exists: {exists}"
-            )
-        )
+        rows = [
+            {"value": value, "ability_id": ability_id}
+            for ability_id in Ability.objects.values_list("id", flat=True)
+            for value in range(min_value, max_value + 1)
+            if value != 0
+        ]
+        result = BulkUpserter(AbilityModifier).run(rows)
+
+        write_import_result(self, "AbilityModifier", result)
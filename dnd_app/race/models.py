@@ -3,6 +3,7 @@ from functools import partial
 from django.db import models
 from common.models import Source, Trait, Ability, Language
 from utils.validators import validate_integer_in_range
+from utils.reference_cache import get_id_by_name
 
 # Validators
 validate_level_adjustment = partial(
@@ -54,10 +55,7 @@ class Size(models.Model):
 
     @staticmethod
     def get_default_size_id():
-        try:
-            return Size.objects.get(name="Medium").id
-        except Size.DoesNotExist:
-            return None
+        return get_id_by_name(Size, "Medium")
 
     def __str__(self):
         return self.name
@@ -14,21 +14,22 @@ from race.models import (
     RaceLanguage,
     RaceFavoredClass,
 )
+from utils.serializers import DynamicFieldsModelSerializer, ReferenceModelSerializer
 
 
-class AbilityModifierSerializer(serializers.ModelSerializer):
+class AbilityModifierSerializer(ReferenceModelSerializer):
     class Meta:
         model = AbilityModifier
         fields = "__all__"
 
 
-class SizeSerializer(serializers.ModelSerializer):
+class SizeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Size
         fields = "__all__"
 
 
-class CharacterTypeSerializer(serializers.ModelSerializer):
+class CharacterTypeSerializer(DynamicFieldsModelSerializer):
     traits = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=Trait.objects.all(),
@@ -40,13 +41,13 @@ class CharacterTypeSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class CharacterTypeTraitSerializer(serializers.ModelSerializer):
+class CharacterTypeTraitSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CharacterTypeTrait
         fields = "__all__"
 
 
-class RaceSerializer(serializers.ModelSerializer):
+class RaceSerializer(ReferenceModelSerializer):
     types = serializers.PrimaryKeyRelatedField(
         many=True,
         queryset=CharacterType.objects.all(),
@@ -78,31 +79,31 @@ class RaceSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class RaceTypeSerializer(serializers.ModelSerializer):
+class RaceTypeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = RaceType
         fields = "__all__"
 
 
-class RaceAbilityModifierSerializer(serializers.ModelSerializer):
+class RaceAbilityModifierSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = RaceAbilityModifier
         fields = "__all__"
 
 
-class RaceTraitSerializer(serializers.ModelSerializer):
+class RaceTraitSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = RaceTrait
         fields = "__all__"
 
 
-class RaceLanguageSerializer(serializers.ModelSerializer):
+class RaceLanguageSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = RaceLanguage
         fields = "__all__"
 
 
-class RaceFavoredClassSerializer(serializers.ModelSerializer):
+class RaceFavoredClassSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = RaceFavoredClass
         fields = "__all__"
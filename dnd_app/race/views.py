@@ -22,7 +22,7 @@ from race.serializers import (
     RaceLanguageSerializer,
     RaceFavoredClassSerializer,
 )
-from utils.views import CustomModelViewSet
+from utils.views import CustomModelViewSet, ExportMixin
 
 
 class AbilityModifierViewSet(CustomModelViewSet):
@@ -46,7 +46,7 @@ class CharacterTypeTraitViewSet(CustomModelViewSet):
     custom_view_name = "(Character Type - Trait) List"
 
 
-class RaceViewSet(CustomModelViewSet):
+class RaceViewSet(ExportMixin, CustomModelViewSet):
     queryset = Race.objects.all()
     serializer_class = RaceSerializer
 
@@ -3,55 +3,68 @@ import csv
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from common.models import Trait, TraitClassification, Ability
+from common.models import Ability
 from skill.models import Skill
+from utils.importers import (
+    BulkUpserter,
+    ImportLedger,
+    find_import_file,
+    write_import_result,
+    write_import_skipped,
+)
 
 
 class Command(BaseCommand):
     help = "Command to import 'Skill' data from a CSV file into the 'Skill' model"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.IMPORT_BATCH_SIZE,
+            help="Number of rows inserted per query",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-import every row even if the file has not changed",
+        )
+
     def handle(self, *args, **kwargs):
+        csv_path = find_import_file("skill", "skill_list.csv")
+        ledger = ImportLedger(csv_path, force=kwargs["force"])
+        if ledger.is_unchanged():
+            write_import_skipped(self, "Skill", ledger)
+            return
+
         # Cache Ability to avoid querying the database multiple times
         ability_dict = {ability.name: ability.id for ability in Ability.objects.all()}
 
-        with open("dnd_app/skill/initial_data/skill_list.csv", mode="r") as file:
+        with open(csv_path, mode="r") as file:
             reader = csv.DictReader(file, delimiter=";")
-            created = 0
-            exists = 0
-            for row in reader:
-                ability_id = ability_dict.get(row["Ability"])
-
-                if ability_id is None:
-                    self.stdout.write(
-                        self.style.ERROR(f"Ability '{row['Ability']}' not found")
-                    )
-                    continue
-
-                skill, created_flag = Skill.objects.get_or_create(
-                    name=row["Name"],
-                    trained_only=row["Trained Only"],
-                    armor_check_penalty=row["Armor Check Penalty"],
-                    link=row["Link"],
-                    description=row["Description"],
-                    ability_id=ability_id,
-                )
-                if created_flag:
-                    created += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                f"Successfully created Skill: '{skill.name}'"
-                            )
-                        )
-                else:
-                    exists += 1
-                    if settings.IMPORT_DEBUG:
-                        self.stdout.write(
-                            self.style.WARNING(f"Skill '{skill.name}' already exists")
-                        )
-
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Finished importing 'Skill'. Created: {created}, Already exists: {exists}"
-                )
+            result = BulkUpserter(Skill, batch_size=kwargs["batch_size"]).run(
+                self.read_rows(reader, ability_dict), ledger=ledger
             )
+            write_import_result(self, "Skill", result)
+
+    def read_rows(self, reader, ability_dict):
+        """
+        Yields the skill rows of the CSV reader one at a time, skipping rows of unknown abilities.
+        """
+        for row in reader:
+            ability_id = ability_dict.get(row["Ability"])
+
+            if ability_id is None:
+                self.stdout.write(
+                    self.style.ERROR(f"Ability '{row['Ability']}' not found")
+                )
+                continue
+
+            yield {
+                "name": row["Name"],
+                "trained_only": row["Trained Only"],
+                "armor_check_penalty": row["Armor Check Penalty"],
+                "link": row["Link"],
+                "description": row["Description"],
+                "ability_id": ability_id,
+            }
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from skill.models import Skill
+from utils.serializers import ReferenceModelSerializer
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class SkillSerializer(ReferenceModelSerializer):
     class Meta:
         model = Skill
         fields = "__all__"
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class SpellConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "spell"
+
+    def ready(self):
+        from spell.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,64 @@
+"""
+Facet counts of a filtered set of spells.
+
+Every facet is computed with one grouped aggregate query over the spells matching the filters,
+so the number of queries does not depend on how many schools, levels or components exist.
+Counts are the number of matching spells having each value.
+"""
+
+from django.db.models import Count
+
+from spell.models import Spell, SpellLevel, SpellSpellComponent, SpellSpellDescriptor
+
+
+def count_facet(queryset, id_lookup, name_lookup, spell_lookup="pk"):
+    """
+    Returns [{"id", "name", "count"}] of the rows grouped by id_lookup, ordered by name.
+    """
+    rows = (
+        queryset.exclude(**{f"{id_lookup}__isnull": True})
+        .values(id_lookup, name_lookup)
+        .annotate(count=Count(spell_lookup, distinct=True))
+        .order_by(name_lookup, id_lookup)
+    )
+    return [
+        {"id": row[id_lookup], "name": row[name_lookup], "count": row["count"]}
+        for row in rows
+    ]
+
+
+def get_spell_facets(spells, character_classes=None):
+    """
+    Returns facet counts of the spells queryset, keyed by facet name.
+    Level counts are limited to the given character class ids when there are any.
+    """
+    spell_ids = spells.values("pk")
+    matching_spells = Spell.objects.filter(pk__in=spell_ids)
+    spell_levels = SpellLevel.objects.filter(spell__in=spell_ids)
+    if character_classes:
+        spell_levels = spell_levels.filter(character_class__in=character_classes)
+
+    return {
+        "school": count_facet(matching_spells, "school_id", "school__name"),
+        "subschool": count_facet(matching_spells, "subschool_id", "subschool__name"),
+        "casting_time": count_facet(
+            matching_spells, "casting_time_id", "casting_time__name"
+        ),
+        "level": list(
+            spell_levels.values("level")
+            .annotate(count=Count("spell", distinct=True))
+            .order_by("level")
+        ),
+        "component": count_facet(
+            SpellSpellComponent.objects.filter(spell__in=spell_ids),
+            "component_id",
+            "component__name",
+            "spell",
+        ),
+        "descriptor": count_facet(
+            SpellSpellDescriptor.objects.filter(spell__in=spell_ids),
+            "descriptor_id",
+            "descriptor__name",
+            "spell",
+        ),
+    }
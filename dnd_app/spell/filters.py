@@ -0,0 +1,78 @@
+import django_filters
+
+from spell.models import Spell, SpellLevel, SpellSpellComponent, SpellSpellDescriptor
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+class SpellFilter(django_filters.FilterSet):
+    """
+    Filters spells by ids of related rows, given as comma separated lists.
+    `character_class` and `level` filter the same spell level row, so together they select
+    the spells a class casts at that level. `component` and `descriptor` keep spells having
+    all the given rows, `exclude_component` and `exclude_descriptor` drop spells having any.
+    """
+
+    school = NumberInFilter(field_name="school")
+    subschool = NumberInFilter(field_name="subschool")
+    casting_time = NumberInFilter(field_name="casting_time")
+    character_class = NumberInFilter(method="filter_spell_level")
+    level = NumberInFilter(method="filter_spell_level")
+    component = NumberInFilter(method="filter_components")
+    exclude_component = NumberInFilter(method="filter_components")
+    descriptor = NumberInFilter(method="filter_descriptors")
+    exclude_descriptor = NumberInFilter(method="filter_descriptors")
+
+    class Meta:
+        model = Spell
+        fields = []
+
+    def filter_spell_level(self, queryset, name, value):
+        # applied once for both parameters, so they filter the same SpellLevel row
+        if name == "level" and self.form.cleaned_data.get("character_class"):
+            return queryset
+        spell_levels = SpellLevel.objects.all()
+        if self.form.cleaned_data.get("character_class"):
+            spell_levels = spell_levels.filter(
+                character_class__in=self.form.cleaned_data["character_class"]
+            )
+        if self.form.cleaned_data.get("level"):
+            spell_levels = spell_levels.filter(
+                level__in=self.form.cleaned_data["level"]
+            )
+        return queryset.filter(pk__in=spell_levels.values("spell"))
+
+    def filter_components(self, queryset, name, value):
+        return filter_through_rows(
+            queryset,
+            SpellSpellComponent,
+            "component",
+            value,
+            name.startswith("exclude"),
+        )
+
+    def filter_descriptors(self, queryset, name, value):
+        return filter_through_rows(
+            queryset,
+            SpellSpellDescriptor,
+            "descriptor",
+            value,
+            name.startswith("exclude"),
+        )
+
+
+def filter_through_rows(queryset, through, field_name, ids, exclude):
+    """
+    Keeps spells linked to all the ids through the given model, or drops spells linked to any of them.
+    """
+    if exclude:
+        return queryset.exclude(
+            pk__in=through.objects.filter(**{f"{field_name}__in": ids}).values("spell")
+        )
+    for target_id in set(ids):
+        queryset = queryset.filter(
+            pk__in=through.objects.filter(**{field_name: target_id}).values("spell")
+        )
+    return queryset
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from spell.search import update_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search documents of all spells, e.g. after spells were bulk imported"
+
+    def handle(self, *args, **kwargs):
+        changed = update_search_documents()
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated search documents of {changed} spells")
+        )
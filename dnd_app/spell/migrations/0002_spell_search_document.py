@@ -0,0 +1,62 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:45
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+SEARCH_INDEX_NAME = "spell_search_gin"
+
+
+def get_search_index():
+    # must match spell.search.get_search_vector()
+    return GinIndex(
+        SearchVector("name", weight="A", config="english")
+        + SearchVector("search_document", weight="B", config="english"),
+        name=SEARCH_INDEX_NAME,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("spell", "Spell"), get_search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("spell", "Spell"), get_search_index())
+
+
+def fill_search_documents(apps, schema_editor):
+    Spell = apps.get_model("spell", "Spell")
+    spells = Spell.objects.select_related("school", "subschool").prefetch_related(
+        "descriptor", "components"
+    )
+    for spell in spells:
+        parts = [
+            spell.target,
+            spell.effect,
+            spell.school.name,
+            spell.subschool.name if spell.subschool_id else None,
+            *(descriptor.name for descriptor in spell.descriptor.all()),
+            *(component.name for component in spell.components.all()),
+            spell.description,
+        ]
+        spell.search_document = " ".join(part for part in parts if part)
+    Spell.objects.bulk_update(spells, ["search_document"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("spell", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="spell",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
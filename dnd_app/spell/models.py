@@ -117,6 +117,8 @@ class Spell(models.Model):
     duration = models.CharField(max_length=50, blank=True, null=True)
     saving_throw = models.CharField(max_length=100, blank=True, null=True)
     spell_resistance = models.BooleanField(default=False, blank=True, null=True)
+    # text of the related rows and long fields, maintained by spell.signals for spell.search
+    search_document = models.TextField(blank=True, default="", editable=False)
 
     # FK
     source = models.ForeignKey(
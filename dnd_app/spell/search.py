@@ -0,0 +1,205 @@
+"""
+Full-text search over spells.
+
+Every spell keeps a `search_document` with the text of its target, effect, school, subschool,
+descriptors, components and description, rebuilt whenever any of them changes. Spell names are
+ranked above the rest of the document, and every word of a query matches by prefix.
+
+On PostgreSQL, spells are matched with a full-text SearchVector backed by a GIN index
+(see migration 0002_spell_search_document). Other databases use an inverted index built in
+process on first use. Rebuilding search documents or deleting spells bumps the shared version
+of the index once the transaction commits, and every process sharing utils.reference_cache
+versions rebuilds it.
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+
+from spell.models import Spell
+from utils.reference_cache import bump_shared_version, get_shared_version
+
+SEARCH_CONFIG = "english"
+# weights of the name and the search document, the defaults of PostgreSQL's ts_rank for A and B
+NAME_WEIGHT = 1.0
+DOCUMENT_WEIGHT = 0.4
+
+SEARCH_INDEX_VERSION_KEY = "spell-search-index"
+
+# (version, SpellSearchIndex)
+_index = None
+
+
+def get_search_terms(text):
+    """
+    Returns the lowercase words of a search text.
+    """
+    return re.findall(r"\w+", text.lower())
+
+
+def build_search_document(spell):
+    """
+    Returns the searchable text of a spell, apart from its name.
+    Descriptors and components are read with all(), so they can be prefetched.
+    """
+    parts = [
+        spell.target,
+        spell.effect,
+        spell.school.name,
+        spell.subschool.name if spell.subschool_id else None,
+        *(descriptor.name for descriptor in spell.descriptor.all()),
+        *(component.name for component in spell.components.all()),
+        spell.description,
+    ]
+    return " ".join(part for part in parts if part)
+
+
+def update_search_documents(spells=None):
+    """
+    Rebuilds the search documents of the spells in the queryset, or of every spell.
+    """
+    spells = Spell.objects.all() if spells is None else spells
+    spells = (
+        spells.select_related("school", "subschool")
+        .prefetch_related("descriptor", "components")
+        .order_by("pk")
+    )
+    changed = []
+    for spell in spells.iterator(chunk_size=settings.IMPORT_BATCH_SIZE):
+        search_document = build_search_document(spell)
+        if spell.search_document != search_document:
+            spell.search_document = search_document
+            changed.append(spell)
+    Spell.objects.bulk_update(
+        changed, ["search_document"], batch_size=settings.IMPORT_BATCH_SIZE
+    )
+    invalidate_search_index(using=spells.db)
+    return len(changed)
+
+
+def get_search_vector():
+    """
+    Returns the weighted search vector of spells. It must match the GIN index expression.
+    """
+    return SearchVector("name", weight="A", config=SEARCH_CONFIG) + SearchVector(
+        "search_document", weight="B", config=SEARCH_CONFIG
+    )
+
+
+class SpellSearchIndex:
+    """
+    In-process inverted index mapping every word of spell names and search documents
+    to the spells containing it, with the weight of the best place the word appears in.
+    """
+
+    def __init__(self, rows):
+        self.postings = defaultdict(dict)
+        self.names = {}
+        for spell_id, name, search_document in rows:
+            self.names[spell_id] = name
+            for term in get_search_terms(search_document):
+                self.postings[term][spell_id] = DOCUMENT_WEIGHT
+            for term in get_search_terms(name):
+                self.postings[term][spell_id] = NAME_WEIGHT
+        self.terms = sorted(self.postings)
+
+    def match_prefix(self, prefix):
+        """
+        Returns {spell id: weight} of the spells containing a word starting with prefix.
+        """
+        matches = {}
+        for term in self.terms[bisect_left(self.terms, prefix) :]:
+            if not term.startswith(prefix):
+                break
+            for spell_id, weight in self.postings[term].items():
+                matches[spell_id] = max(weight, matches.get(spell_id, 0))
+        return matches
+
+    def search(self, text):
+        """
+        Returns {spell id: rank} of the spells matching every word of the text.
+        """
+        ranks = None
+        for prefix in get_search_terms(text):
+            matches = self.match_prefix(prefix)
+            if ranks is None:
+                ranks = matches
+            else:
+                ranks = {
+                    spell_id: rank + matches[spell_id]
+                    for spell_id, rank in ranks.items()
+                    if spell_id in matches
+                }
+            if not ranks:
+                break
+        return ranks or {}
+
+
+def get_search_index():
+    """
+    Returns the search index of this process, rebuilding it when its shared version changed.
+    """
+    global _index
+    version = get_shared_version(SEARCH_INDEX_VERSION_KEY)
+    if _index is None or _index[0] != version:
+        _index = (
+            version,
+            SpellSearchIndex(
+                Spell.objects.values_list("id", "name", "search_document")
+            ),
+        )
+    return _index[1]
+
+
+def invalidate_search_index(using=None):
+    """
+    Drops the search index of this process right away, and bumps its shared version
+    once the current transaction commits, so every process rebuilds it.
+    """
+    clear_search_index()
+    bump_shared_version(SEARCH_INDEX_VERSION_KEY, using=using)
+
+
+def clear_search_index():
+    """
+    Drops the search index of this process.
+    """
+    global _index
+    _index = None
+
+
+def search_spells(queryset, text, limit):
+    """
+    Returns up to limit spells of the queryset matching every word of the text,
+    best matches first, each with its `search_rank`.
+    """
+    terms = get_search_terms(text)
+    if not terms:
+        return []
+
+    if connection.vendor == "postgresql":
+        vector = get_search_vector()
+        query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        return list(
+            queryset.annotate(search=vector, search_rank=SearchRank(vector, query))
+            .filter(search=query)
+            .order_by("-search_rank", "name")[:limit]
+        )
+
+    index = get_search_index()
+    ranks = index.search(text)
+    best_ids = sorted(
+        ranks, key=lambda spell_id: (-ranks[spell_id], index.names[spell_id])
+    )[:limit]
+    spells = queryset.in_bulk(best_ids)
+    for spell in spells.values():
+        spell.search_rank = ranks[spell.pk]
+    return [spells[spell_id] for spell_id in best_ids if spell_id in spells]
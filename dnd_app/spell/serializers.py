@@ -15,51 +15,52 @@ from .models import (
     SpellLevel,
     SpellSpellComponent,
 )
+from utils.serializers import DynamicFieldsModelSerializer, ReferenceModelSerializer
 
 
-class MagicAuraStrengthSerializer(serializers.ModelSerializer):
+class MagicAuraStrengthSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = MagicAuraStrength
         fields = "__all__"
 
 
-class MagicSchoolSerializer(serializers.ModelSerializer):
+class MagicSchoolSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = MagicSchool
         fields = "__all__"
 
 
-class MagicSubSchoolSerializer(serializers.ModelSerializer):
+class MagicSubSchoolSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = MagicSubSchool
         fields = "__all__"
 
 
-class SpellDescriptorSerializer(serializers.ModelSerializer):
+class SpellDescriptorSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpellDescriptor
         fields = "__all__"
 
 
-class SpellComponentSerializer(serializers.ModelSerializer):
+class SpellComponentSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpellComponent
         fields = "__all__"
 
 
-class CastingTimeSerializer(serializers.ModelSerializer):
+class CastingTimeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = CastingTime
         fields = "__all__"
 
 
-class SpellRangeSerializer(serializers.ModelSerializer):
+class SpellRangeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpellRange
         fields = "__all__"
 
 
-class SpellSerializer(serializers.ModelSerializer):
+class SpellSerializer(ReferenceModelSerializer):
     descriptor = serializers.PrimaryKeyRelatedField(
         queryset=SpellDescriptor.objects.all(), many=True, required=False
     )
@@ -72,23 +73,27 @@ class SpellSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Spell
-        fields = "__all__"
+        exclude = ("search_document",)
+
+
+class SpellSearchResultSerializer(SpellSerializer):
+    rank = serializers.FloatField(source="search_rank", read_only=True)
 
 
-class SpellSpellDescriptorSerializer(serializers.ModelSerializer):
+class SpellSpellDescriptorSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpellSpellDescriptor
         fields = "__all__"
 
 
-class SpellLevelSerializer(serializers.ModelSerializer):
+class SpellLevelSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = SpellLevel
         fields = "__all__"
 
 
 # Serializer for SpellSpellComponent
-class SpellSpellComponentSerializer(serializers.ModelSerializer):
+class SpellSpellComponentSerializer(ReferenceModelSerializer):
     class Meta:
         model = SpellSpellComponent
         fields = "__all__"
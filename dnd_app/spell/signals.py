@@ -0,0 +1,98 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from spell.models import (
+    MagicSchool,
+    MagicSubSchool,
+    Spell,
+    SpellComponent,
+    SpellDescriptor,
+    SpellSpellComponent,
+    SpellSpellDescriptor,
+)
+from spell.search import invalidate_search_index, update_search_documents
+
+# through models of spell descriptors and components, mapped to their non-spell foreign key
+THROUGH_TARGET_FIELDS = {
+    SpellSpellDescriptor: "descriptor_id",
+    SpellSpellComponent: "component_id",
+}
+# models whose names are part of spell search documents, mapped to their lookup from Spell
+RELATED_SPELL_LOOKUPS = {
+    MagicSchool: "school",
+    MagicSubSchool: "subschool",
+    SpellDescriptor: "descriptor",
+    SpellComponent: "components",
+}
+
+
+def update_spell_search_document(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    update_search_documents(Spell.objects.filter(pk=instance.pk))
+
+
+def drop_spell_search_index(sender, **kwargs):
+    invalidate_search_index(using=kwargs.get("using"))
+
+
+def update_through_spell_search_document(sender, instance, raw=False, **kwargs):
+    """
+    Rebuilds the search document of the spell a descriptor or component row was saved or deleted for.
+    """
+    if raw:
+        return
+    update_search_documents(Spell.objects.filter(pk=instance.spell_id))
+
+
+def update_m2m_spell_search_documents(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Rebuilds search documents after descriptors or components are added to or removed from spells.
+    When a descriptor or component is cleared from all its spells, the spells are collected
+    before their rows are deleted.
+    """
+    if action == "pre_clear" and reverse:
+        instance._cleared_spell_ids = set(
+            sender.objects.filter(
+                **{THROUGH_TARGET_FIELDS[sender]: instance.pk}
+            ).values_list("spell_id", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        spell_ids = {instance.pk}
+    elif action == "post_clear":
+        spell_ids = instance.__dict__.pop("_cleared_spell_ids", set())
+    else:
+        spell_ids = pk_set
+    update_search_documents(Spell.objects.filter(pk__in=spell_ids))
+
+
+def update_related_spell_search_documents(
+    sender, instance, created=False, raw=False, **kwargs
+):
+    """
+    Rebuilds the search documents of spells using a school, descriptor or component that was saved.
+    """
+    if raw or created:
+        return
+    update_search_documents(
+        Spell.objects.filter(
+            pk__in=Spell.objects.filter(
+                **{RELATED_SPELL_LOOKUPS[sender]: instance.pk}
+            ).values("pk")
+        )
+    )
+
+
+def connect_signals():
+    post_save.connect(update_spell_search_document, sender=Spell)
+    post_delete.connect(drop_spell_search_index, sender=Spell)
+    for through in THROUGH_TARGET_FIELDS:
+        post_save.connect(update_through_spell_search_document, sender=through)
+        post_delete.connect(update_through_spell_search_document, sender=through)
+        m2m_changed.connect(update_m2m_spell_search_documents, sender=through)
+    for model in RELATED_SPELL_LOOKUPS:
+        post_save.connect(update_related_spell_search_documents, sender=model)
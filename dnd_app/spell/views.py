@@ -1,7 +1,14 @@
 # views.py
+from django_filters.utils import translate_validation
 from rest_framework import viewsets
-
-from utils.views import CustomModelViewSet
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from utils.pagination import KeysetCursorPagination
+from utils.views import CustomModelViewSet, ExportMixin
+from .facets import get_spell_facets
+from .filters import SpellFilter
+from .search import search_spells
 from .models import (
     MagicAuraStrength,
     MagicSchool,
@@ -24,6 +31,7 @@ from .serializers import (
     CastingTimeSerializer,
     SpellRangeSerializer,
     SpellSerializer,
+    SpellSearchResultSerializer,
     SpellSpellDescriptorSerializer,
     SpellLevelSerializer,
     SpellSpellComponentSerializer,
@@ -65,9 +73,53 @@ class SpellRangeViewSet(CustomModelViewSet):
     serializer_class = SpellRangeSerializer
 
 
-class SpellViewSet(CustomModelViewSet):
+class SpellViewSet(ExportMixin, CustomModelViewSet):
     queryset = Spell.objects.all()
     serializer_class = SpellSerializer
+    pagination_class = KeysetCursorPagination
+    filterset_class = SpellFilter
+    search_limit = 20
+    max_search_limit = 100
+
+    @action(detail=False, methods=["get"], serializer_class=SpellSearchResultSerializer)
+    def search(self, request):
+        """
+        Returns spells matching every word of the `q` parameter by prefix, best matches first.
+        Names rank above descriptions, descriptors, components and the rest of a spell.
+        At most `limit` spells are returned.
+        """
+        try:
+            limit = int(request.query_params.get("limit", self.search_limit))
+        except ValueError:
+            limit = self.search_limit
+        limit = min(max(limit, 1), self.max_search_limit)
+        spells = search_spells(
+            self.get_queryset(), request.query_params.get("q", ""), limit
+        )
+        return Response(self.get_serializer(spells, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def browse(self, request):
+        """
+        Returns a page of spells matching the filters (see SpellFilter),
+        together with per-school, subschool, casting time, level, component and descriptor
+        counts of all matching spells.
+        """
+        filterset = SpellFilter(
+            request.query_params, queryset=self.get_queryset(), request=request
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        spells = filterset.qs
+        facets = get_spell_facets(
+            spells, filterset.form.cleaned_data.get("character_class")
+        )
+        page = self.paginator.get_page(spells, request, self)
+        response = self.get_paginated_response(
+            self.get_serializer(page, many=True).data
+        )
+        response.data["facets"] = facets
+        return response
 
 
 class SpellSpellDescriptorViewSet(CustomModelViewSet):
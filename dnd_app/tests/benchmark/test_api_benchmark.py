@@ -0,0 +1,237 @@
+"""
+Benchmark of every router-registered list and detail endpoint.
+
+A world is seeded from the fixture modules and scaled up by BENCHMARK_SCALE copies of every
+character, character class, spell and item, including the rows referencing them. The query count,
+number of rows fetched from the database and wall time of each endpoint are measured on a second
+request, once process-wide caches are filled, and compared with baseline.json: more queries,
+or more rows at the baseline's scale, fail the test. Wall time is only compared when
+BENCHMARK_TIME_TOLERANCE is set, as a multiplier of the baseline time.
+
+Run with BENCHMARK_UPDATE_BASELINE=1 to rewrite baseline.json after an intended change.
+"""
+
+import importlib
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from rest_framework.test import APIClient
+
+from character.models import Character
+from character_class.models import CharacterClass
+from item.models import Armor, Item, Weapon
+from spell.models import Spell
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+FIXTURE_MODULES = [
+    "tests.common_fixtures",
+    "tests.skill_fixtures",
+    "tests.feat_fixtures",
+    "tests.race_fixtures",
+    "tests.character_class_fixtures",
+    "tests.spell_fixtures",
+    "tests.item_fixtures",
+    "tests.character_fixtures",
+]
+
+
+def get_scale():
+    return int(os.environ.get("BENCHMARK_SCALE", 5))
+
+
+def build_clone(obj, suffix, **values):
+    """
+    Returns an unsaved copy of obj, with suffix appended to its unique text fields.
+    """
+    for field in obj._meta.concrete_fields:
+        if field.primary_key or field.attname in values:
+            continue
+        value = getattr(obj, field.attname)
+        if field.unique and isinstance(value, str):
+            value = value[: field.max_length - len(suffix)] + suffix
+        values[field.attname] = value
+    return type(obj)(**values)
+
+
+def clone_with_related_rows(objects, count):
+    """
+    Creates count copies of every object, along with copies of the rows referencing it.
+    """
+    for obj in objects:
+        model = type(obj)
+        clones = [build_clone(obj, f" #{index}") for index in range(1, count + 1)]
+        if model._meta.parents:
+            for clone in clones:
+                clone.save()
+        else:
+            model.objects.bulk_create(clones)
+
+        for relation in model._meta.related_objects:
+            if not relation.one_to_many:
+                continue
+            related_rows = relation.related_model._base_manager.filter(
+                **{relation.field.name: obj}
+            )
+            relation.related_model.objects.bulk_create(
+                [
+                    build_clone(
+                        row, f" #{clone.pk}", **{relation.field.attname: clone.pk}
+                    )
+                    for clone in clones
+                    for row in related_rows
+                ]
+            )
+
+
+@pytest.fixture()
+def benchmark_world(request):
+    fixture_names = [
+        name
+        for module_name in FIXTURE_MODULES
+        for name in dir(importlib.import_module(module_name))
+        if name.endswith("_fixture")
+    ]
+    for name in fixture_names:
+        if not name.startswith("prestige_class"):
+            request.getfixturevalue(name)
+    # character_class_fixture and prestige_class_fixture both create a class named "Grog"
+    CharacterClass.objects.filter(name="Grog").update(name="Grog (base class)")
+    for name in fixture_names:
+        if name.startswith("prestige_class"):
+            request.getfixturevalue(name)
+
+    scale = get_scale()
+    clone_with_related_rows(Character.objects.all(), scale)
+    clone_with_related_rows(CharacterClass.objects.all(), scale)
+    clone_with_related_rows(Spell.objects.all(), scale)
+    clone_with_related_rows(Item.objects.filter(weapon=None, armor=None), scale)
+    clone_with_related_rows(Weapon.objects.all(), scale)
+    clone_with_related_rows(Armor.objects.all(), scale)
+    return scale
+
+
+def get_registered_routes():
+    """
+    Returns (url template, viewset) pairs for the list, detail and extra GET actions of every router.
+    """
+    routes = []
+    for app in settings.MY_APPS:
+        router = importlib.import_module(f"{app}.urls").router
+        for prefix, viewset, basename in router.registry:
+            list_url = f"/api/{app}/{prefix}/"
+            routes.append((list_url, viewset))
+            routes.append((f"{list_url}{{pk}}/", viewset))
+            for extra_action in viewset.get_extra_actions():
+                if "get" not in extra_action.mapping:
+                    continue
+                detail_part = "{pk}/" if extra_action.detail else ""
+                routes.append(
+                    (f"{list_url}{detail_part}{extra_action.url_path}/", viewset)
+                )
+    return routes
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper keeping every executed query with its parameters.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def count_rows(self):
+        """
+        Returns the number of rows returned by the recorded SELECT queries.
+        """
+        rows = 0
+        with connection.cursor() as cursor:
+            for sql, params in self.queries:
+                if sql.lstrip().upper().startswith("SELECT"):
+                    cursor.execute(
+                        f"SELECT COUNT(*) FROM ({sql}) benchmark_rows", params
+                    )
+                    rows += cursor.fetchone()[0]
+        return rows
+
+
+def measure(client, url):
+    # a first request fills process-wide caches, so the steady state is measured
+    client.get(url)
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        started = time.perf_counter()
+        response = client.get(url)
+        if response.streaming:
+            # streamed responses query the database while their content is read
+            b"".join(response.streaming_content)
+        elapsed = time.perf_counter() - started
+    assert response.status_code == 200, f"{url} returned {response.status_code}"
+    return {
+        "queries": len(recorder.queries),
+        "rows": recorder.count_rows(),
+        "time_ms": round(elapsed * 1000, 2),
+    }
+
+
+def find_regressions(results, baseline, scale):
+    regressions = []
+    time_tolerance = os.environ.get("BENCHMARK_TIME_TOLERANCE")
+    for route, result in results.items():
+        expected = baseline["endpoints"].get(route)
+        if expected is None:
+            warnings.warn(f"{route} is not in the benchmark baseline")
+            continue
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{route}: {result['queries']} queries, baseline {expected['queries']}"
+            )
+        if scale == baseline["scale"] and result["rows"] > expected["rows"]:
+            regressions.append(
+                f"{route}: {result['rows']} rows fetched, baseline {expected['rows']}"
+            )
+        if time_tolerance and result["time_ms"] > expected["time_ms"] * float(
+            time_tolerance
+        ):
+            regressions.append(
+                f"{route}: {result['time_ms']}ms, baseline {expected['time_ms']}ms"
+            )
+    return regressions
+
+
+@pytest.mark.django_db
+def test_api_benchmark(benchmark_world):
+    client = APIClient()
+    results = {}
+    for url, viewset in get_registered_routes():
+        if "{pk}" in url:
+            obj = viewset.queryset.model.objects.order_by("pk").first()
+            if obj is None:
+                continue
+            results[url] = measure(client, url.format(pk=obj.pk))
+        else:
+            results[url] = measure(client, url)
+
+    if os.environ.get("BENCHMARK_UPDATE_BASELINE"):
+        BASELINE_FILE.write_text(
+            json.dumps(
+                {"scale": benchmark_world, "endpoints": results},
+                indent=2,
+                sort_keys=True,
+            )
+            + "\n"
+        )
+        return
+
+    baseline = json.loads(BASELINE_FILE.read_text())
+    regressions = find_regressions(results, baseline, benchmark_world)
+    assert not regressions, "Benchmark regressions:\n" + "\n".join(regressions)
@@ -0,0 +1,290 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from character.models import Character, CharacterSkill, Inventory, InventoryItem
+from character.services import add_automatic_languages, add_class_skills
+from character.sheet import CharacterSheet
+from character.skills import load_skill_bonuses
+from character_class.models import BSBProgression, ClassBsbProgression
+from item.models import Item
+
+
+@pytest.fixture()
+def character_sheet_data(
+    character_ability_score_fixture,
+    character_character_class_fixture,
+    character_skill_fixture,
+    character_language_fixture,
+    race_language_fixture,
+):
+    return character_character_class_fixture
+
+
+@pytest.mark.django_db
+def test_character_creation(character_fixture, race_fixture, alignment_fixture):
+    character = character_fixture[0]
+    assert character.name == "Aragorn"
+    assert character.level == 3
+    assert character.race == race_fixture[0]
+    assert character.alignment == alignment_fixture[0]
+    assert str(character) == "Aragorn"
+
+
+@pytest.mark.django_db
+def test_character_derived_stats(character_fixture, character_sheet_data):
+    character = Character.objects.get(id=character_fixture[0].id)
+    assert character.class_levels == 3
+    assert character.get_save_for_ability("Strength") == 6
+    assert character.fortitude_save == 0
+    assert character.reflex_save == 4
+    assert character.will_save == -1
+    assert character.initiative == 5
+    assert character.multiattack_bab == "+3"
+    assert character.list_of_languages == "Common, Elvish"
+
+
+@pytest.mark.django_db
+def test_character_derived_stats_share_one_sheet(
+    character_fixture, character_sheet_data
+):
+    character = Character.objects.get(id=character_fixture[0].id)
+    sheet = character.sheet
+    assert character.fortitude_save == 0
+    assert character.reflex_save == 4
+    assert character.sheet is sheet
+
+    character.initiative_bonus += 2
+    character.save()
+    assert character.sheet is not sheet
+    assert character.initiative == 7
+
+    sheet = character.sheet
+    character.refresh_from_db()
+    assert character.sheet is not sheet
+
+
+@pytest.mark.django_db
+def test_character_sheet(character_fixture, character_sheet_data):
+    sheets = CharacterSheet.for_characters(Character.objects.order_by("id"))
+    assert [sheet.character.name for sheet in sheets] == ["Aragorn", "Boromir"]
+
+    assert sheets[0].skill_totals == {"Coding": 7, "Swimming": 6}
+    assert sheets[0].ability_modifiers == {
+        "Strength": 3,
+        "Dexterity": 3,
+        "Wisdom": -1,
+    }
+
+    assert sheets[1].class_levels == 7
+    assert sheets[1].reflex_save == 6
+    assert sheets[1].multiattack_bab == "+7/+2"
+    assert sheets[1].languages == ["Elvish"]
+
+
+@pytest.mark.django_db
+def test_character_sheet_stats_match_sheet(character_fixture, character_sheet_data):
+    characters = Character.objects.with_sheet_stats().order_by("id")
+    for character, sheet in zip(
+        characters, CharacterSheet.for_characters(Character.objects.order_by("id"))
+    ):
+        assert character.sheet_class_levels == sheet.class_levels
+        assert character.sheet_base_attack_bonus == sheet.base_attack_bonus
+        assert character.sheet_fortitude_save == sheet.fortitude_save
+        assert character.sheet_reflex_save == sheet.reflex_save
+        assert character.sheet_will_save == sheet.will_save
+        assert character.sheet_initiative == sheet.initiative
+
+    with CaptureQueriesContext(connection) as queries:
+        names = list(
+            Character.objects.with_sheet_stats()
+            .filter(sheet_reflex_save__gte=4)
+            .order_by("-sheet_initiative")
+            .values_list("name", flat=True)
+        )
+    assert len(queries) == 1
+    assert sorted(names) == ["Aragorn", "Boromir"]
+
+
+@pytest.mark.django_db
+def test_character_sheet_stats_count_first_progression_per_ability(
+    character_fixture,
+    character_sheet_data,
+    character_class_fixture,
+    ability_fixture,
+):
+    ClassBsbProgression.objects.create(
+        character_class=character_class_fixture[0],
+        bsb_progression=BSBProgression.objects.create(
+            name="Reflex (Good)",
+            save_bonus_table={"1": 2, "2": 3, "3": 3},
+            ability=ability_fixture[1],
+        ),
+    )
+
+    characters = Character.objects.with_sheet_stats().order_by("id")
+    for character, sheet in zip(
+        characters, CharacterSheet.for_characters(Character.objects.order_by("id"))
+    ):
+        assert character.sheet_fortitude_save == sheet.fortitude_save
+        assert character.sheet_reflex_save == sheet.reflex_save
+        assert character.sheet_will_save == sheet.will_save
+
+
+@pytest.mark.django_db
+def test_character_sheet_query_count_is_constant(
+    character_fixture, character_sheet_data
+):
+    def compute_all_sheets():
+        with CaptureQueriesContext(connection) as context:
+            for sheet in CharacterSheet.for_characters(Character.objects.all()):
+                sheet.fortitude_save, sheet.reflex_save, sheet.will_save
+                sheet.initiative, sheet.multiattack_bab, sheet.languages
+                sheet.skill_totals
+        return len(context.captured_queries)
+
+    # the first pass also loads the process-wide progression tables
+    compute_all_sheets()
+    queries_for_two_characters = compute_all_sheets()
+    Character.objects.create(
+        name="Gimli",
+        race=character_fixture[0].race,
+        alignment=character_fixture[0].alignment,
+    )
+
+    assert compute_all_sheets() == queries_for_two_characters
+
+
+@pytest.mark.django_db
+def test_inventory_totals_follow_inventory_items(inventory_item_fixture):
+    backpack, bag = Inventory.objects.order_by("id")
+    assert (backpack.total_weight, backpack.total_value) == (19, 500)
+    assert (bag.total_weight, bag.total_value) == (24, 600)
+    assert backpack.available_capacity == 41
+
+    cookies, keyboard, bag_keyboards = inventory_item_fixture
+    cookies.quantity = 4
+    cookies.save()
+    keyboard.inventory = bag
+    keyboard.save()
+    bag_keyboards.delete()
+
+    backpack.refresh_from_db()
+    bag.refresh_from_db()
+    assert (backpack.total_weight, backpack.total_value) == (22, 600)
+    assert (bag.total_weight, bag.total_value) == (8, 200)
+
+
+@pytest.mark.django_db
+def test_inventory_item_move_reads_no_previous_inventory(inventory_item_fixture):
+    backpack, bag = Inventory.objects.order_by("id")
+    keyboard = InventoryItem.objects.get(id=inventory_item_fixture[1].id)
+
+    for inventory in (bag, backpack, bag):
+        keyboard.inventory = inventory
+        with CaptureQueriesContext(connection) as queries:
+            keyboard.save()
+        assert not any(
+            query["sql"].startswith("SELECT")
+            and 'FROM "character_inventoryitem"' in query["sql"]
+            for query in queries
+        )
+
+    backpack.refresh_from_db()
+    bag.refresh_from_db()
+    assert (backpack.total_weight, backpack.total_value) == (11, 300)
+    assert (bag.total_weight, bag.total_value) == (32, 800)
+
+
+@pytest.mark.django_db
+def test_inventory_totals_follow_item_changes(inventory_item_fixture, item_fixture):
+    keyboard = Item.objects.get(id=item_fixture[1].id)
+    keyboard.weight_in_lb = 10
+    keyboard.price_in_gp = None
+    keyboard.save()
+
+    backpack, bag = Inventory.objects.order_by("id")
+    assert (backpack.total_weight, backpack.total_value) == (21, 300)
+    assert (bag.total_weight, bag.total_value) == (30, 0)
+
+
+@pytest.mark.django_db
+def test_reconcile_inventory_totals(inventory_item_fixture):
+    Inventory.objects.update(total_weight=0, total_value=0)
+    assert Inventory.objects.with_stale_totals().count() == 2
+
+    call_command("reconcile_inventory_totals", stdout=StringIO())
+
+    assert not Inventory.objects.with_stale_totals().exists()
+    assert list(
+        Inventory.objects.order_by("id").values_list("total_weight", flat=True)
+    ) == [19, 24]
+
+
+@pytest.mark.django_db
+def test_skill_totals_include_equipped_armor(
+    character_fixture,
+    character_sheet_data,
+    character_inventory_fixture,
+    armor_fixture,
+):
+    def get_totals():
+        with CaptureQueriesContext(connection) as queries:
+            character_skills = load_skill_bonuses(
+                list(
+                    CharacterSkill.objects.filter(
+                        character=character_fixture[0]
+                    ).select_related("skill")
+                )
+            )
+            totals = {
+                character_skill.skill.name: character_skill.total_bonus
+                for character_skill in character_skills
+            }
+        assert len(queries) == 3
+        character = Character.objects.get(pk=character_fixture[0].pk)
+        assert totals == CharacterSheet(character).skill_totals
+        return totals
+
+    assert get_totals() == {"Coding": 7, "Swimming": 6}
+
+    chain_shirt = InventoryItem.objects.create(
+        inventory=character_inventory_fixture[0].inventory, item=armor_fixture[0]
+    )
+    assert get_totals() == {"Coding": 7, "Swimming": 6}
+
+    chain_shirt.is_equipped = True
+    chain_shirt.save()
+    assert get_totals() == {"Coding": 7, "Swimming": 4}
+    character = Character.objects.get(pk=character_fixture[0].pk)
+    assert CharacterSheet(character).armor_check_penalty == -2
+
+
+@pytest.mark.django_db
+def test_add_class_skills_and_languages_in_bulk(
+    character_fixture,
+    character_character_class_fixture,
+    character_skill_fixture,
+    class_skill_fixture,
+    race_language_fixture,
+    character_language_fixture,
+):
+    with CaptureQueriesContext(connection) as queries:
+        created_skills = add_class_skills(character_character_class_fixture)
+        created_languages = add_automatic_languages(character_fixture)
+    assert len(queries) == 6
+
+    # Aragorn already has both class skills, Boromir is missing Coding from Grog
+    assert [(skill.character, skill.skill.name) for skill in created_skills] == [
+        (character_fixture[1], "Coding")
+    ]
+    assert [
+        (language.character, language.language.name, language.is_automatic)
+        for language in created_languages
+    ] == [(character_fixture[0], "Common", True)]
+
+    assert add_class_skills(character_character_class_fixture) == []
+    assert add_automatic_languages(character_fixture) == []
@@ -0,0 +1,336 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from character.models import Character, CharacterFeat
+from character_class.models import (
+    PrestigeCharacterClass,
+    PrestigeClassFeatRequirement,
+    PrestigeClassLanguageRequirement,
+    PrestigeClassRaceRequirement,
+    PrestigeClassSkillRankRequirement,
+)
+
+
+@pytest.mark.django_db
+def test_character_list_view(client, character_fixture):
+    response = client.get("/api/character/character/")
+
+    assert response.status_code == 200
+    assert {character["name"] for character in response.data} == {
+        character.name for character in character_fixture
+    }
+
+
+@pytest.mark.django_db
+def test_character_sheet_view(
+    client,
+    character_fixture,
+    character_ability_score_fixture,
+    character_character_class_fixture,
+    character_skill_fixture,
+    character_language_fixture,
+    race_language_fixture,
+    inventory_item_fixture,
+    character_inventory_fixture,
+):
+    character = character_fixture[0]
+
+    response = client.get(f"/api/character/character/{character.id}/sheet/")
+
+    assert response.status_code == 200
+    assert response.data["name"] == "Aragorn"
+    assert response.data["race"] == "Human"
+    assert response.data["class_levels"] == 3
+    assert [
+        (character_class["name"], character_class["level"])
+        for character_class in response.data["classes"]
+    ] == [("Fighter", 2), ("Slacker", 1)]
+    assert response.data["saves"] == {"fortitude": 0, "reflex": 4, "will": -1}
+    assert response.data["initiative"] == 5
+    assert response.data["multiattack_bab"] == "+3"
+    assert {
+        skill["name"]: skill["total_bonus"] for skill in response.data["skills"]
+    } == {"Coding": 7, "Swimming": 6}
+    assert response.data["languages"] == ["Common", "Elvish"]
+    assert response.data["inventory_weight"] == "43.00"
+    assert response["ETag"]
+
+
+@pytest.mark.django_db
+def test_character_sheet_view_not_modified(client, character_fixture):
+    url = f"/api/character/character/{character_fixture[0].id}/sheet/"
+    etag = client.get(url)["ETag"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+@pytest.mark.django_db
+def test_character_sheet_view_etag_changes(client, character_fixture):
+    character = character_fixture[0]
+    url = f"/api/character/character/{character.id}/sheet/"
+    etag = client.get(url)["ETag"]
+
+    character.initiative_bonus = 10
+    character.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_character_sheet_view_not_found(client):
+    response = client.get("/api/character/character/999/sheet/")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_character_eligible_feats_view(
+    client,
+    character_fixture,
+    character_ability_score_fixture,
+    character_skill_fixture,
+    feat_fixture,
+    feat_ability_prerequisite_fixture,
+    feat_feat_prerequisite_fixture,
+    feat_skill_prerequisite_fixture,
+):
+    character = character_fixture[0]
+    url = f"/api/character/character/{character.id}/eligible_feats/"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [feat["name"] for feat in response.data] == ["Feat 2", "Feat 4"]
+
+    CharacterFeat.objects.create(character=character, feat=feat_fixture[1])
+    response = client.get(url)
+    assert [feat["name"] for feat in response.data] == ["Feat 4", "Feat 1"]
+
+
+@pytest.mark.django_db
+def test_character_prestige_eligibility_view(
+    client,
+    django_assert_max_num_queries,
+    character_fixture,
+    character_character_class_fixture,
+    character_skill_fixture,
+    character_language_fixture,
+    race_language_fixture,
+    race_fixture,
+    language_fixture,
+    skill_fixture,
+    feat_fixture,
+    die_fixture,
+    bab_progression_fixture,
+):
+    warden = PrestigeCharacterClass.objects.create(
+        name="Warden",
+        max_level=10,
+        hit_die=die_fixture[2],
+        bab_progression=bab_progression_fixture[0],
+        required_bab=3,
+    )
+    PrestigeClassSkillRankRequirement.objects.create(
+        prestige_class=warden, skill=skill_fixture[0], required_ranks=4
+    )
+    PrestigeClassRaceRequirement.objects.create(
+        prestige_class=warden, race=race_fixture[0]
+    )
+    PrestigeClassLanguageRequirement.objects.create(
+        prestige_class=warden, language=language_fixture[0]
+    )
+    loremaster = PrestigeCharacterClass.objects.create(
+        name="Loremaster",
+        max_level=10,
+        hit_die=die_fixture[2],
+        bab_progression=bab_progression_fixture[1],
+        required_bab=5,
+    )
+    PrestigeClassFeatRequirement.objects.create(
+        prestige_class=loremaster, feat=feat_fixture[0]
+    )
+
+    with django_assert_max_num_queries(12):
+        response = client.get("/api/character/character/prestige_eligibility/")
+    assert response.status_code == 200
+    eligibility = {character["name"]: character for character in response.data}
+    assert eligibility["Aragorn"]["prestige_classes"] == [
+        {
+            "id": loremaster.id,
+            "name": "Loremaster",
+            "eligible": False,
+            "missing": {"base_attack_bonus": 5, "feats": [feat_fixture[0].id]},
+        },
+        {"id": warden.id, "name": "Warden", "eligible": True, "missing": {}},
+    ]
+    assert eligibility["Boromir"]["prestige_classes"][1]["missing"] == {
+        "skill_ranks": {skill_fixture[0].id: 4},
+        "race": [race_fixture[0].id],
+        "languages": [language_fixture[0].id],
+    }
+
+
+@pytest.mark.django_db
+def test_character_skill_list_view(
+    client,
+    django_assert_num_queries,
+    character_ability_score_fixture,
+    character_skill_fixture,
+):
+    with django_assert_num_queries(3):
+        response = client.get("/api/character/character_skill/")
+
+    assert response.status_code == 200
+    assert {
+        (skill["character"], skill["skill"]): skill["total_bonus"]
+        for skill in response.data
+    } == {
+        (skill.character_id, skill.skill_id): total
+        for skill, total in zip(character_skill_fixture, (7, 6, 2))
+    }
+
+
+@pytest.mark.django_db
+def test_character_list_view_fields_keeps_select_related_columns(
+    client, character_fixture
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            "/api/character/character/", {"fields": "name,race", "expand": "race"}
+        )
+
+    assert response.status_code == 200
+    assert {
+        (character["name"], character["race"]["name"]) for character in response.data
+    } == {(character.name, character.race.name) for character in character_fixture}
+    # the characters, joined to their races, then the races' many-to-many fields
+    assert len(queries) == 6
+    assert '"race_race"."name"' in queries[0]["sql"]
+    assert "initiative_bonus" not in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_character_skill_list_view_fields_loads_every_column_for_properties(
+    client,
+    django_assert_num_queries,
+    character_ability_score_fixture,
+    character_skill_fixture,
+):
+    with django_assert_num_queries(3):
+        response = client.get(
+            "/api/character/character_skill/", {"fields": "id,total_bonus"}
+        )
+
+    assert response.status_code == 200
+    assert {skill["id"]: skill["total_bonus"] for skill in response.data} == {
+        skill.id: total for skill, total in zip(character_skill_fixture, (7, 6, 2))
+    }
+
+
+@pytest.mark.django_db
+def test_character_document_view(
+    client,
+    race_fixture,
+    alignment_fixture,
+    ability_fixture,
+    class_skill_fixture,
+    character_class_fixture,
+    skill_fixture,
+    feat_fixture,
+    language_fixture,
+    race_language_fixture,
+    item_fixture,
+):
+    document = {
+        "name": "Gimli",
+        "race": race_fixture[0].id,
+        "alignment": alignment_fixture[0].id,
+        "ability_scores": [{"ability": ability_fixture[0].id, "value": 16}],
+        "character_classes": [
+            {"character_class": character_class_fixture[0].id, "level": 2}
+        ],
+        "skills": [{"skill": skill_fixture[1].id, "ranks": 3}],
+        "feats": [{"feat": feat_fixture[0].id}],
+        "languages": [{"language": language_fixture[1].id}],
+        "inventories": [
+            {
+                "name": "Pack",
+                "capacity": 50,
+                "items": [{"item": item_fixture[0].id, "quantity": 2}],
+            }
+        ],
+    }
+
+    response = client.post(
+        "/api/character/character/document/", document, content_type="application/json"
+    )
+
+    assert response.status_code == 201
+    assert response.data["name"] == "Gimli"
+    assert {(skill["skill"], skill["ranks"]) for skill in response.data["skills"]} == {
+        (skill_fixture[0].id, 0),
+        (skill_fixture[1].id, 3),
+    }
+    assert {
+        (language["language"], language["is_automatic"])
+        for language in response.data["languages"]
+    } == {(language_fixture[0].id, True), (language_fixture[1].id, False)}
+    assert response.data["inventories"][0]["total_weight"] == "11.00"
+    assert response.data["inventories"][0]["items"][0]["quantity"] == 2
+
+    document["name"] = "Gimli II"
+    document["inventories"][0]["name"] = "Other Pack"
+    document["ability_scores"] *= 2
+    response = client.post(
+        "/api/character/character/document/", document, content_type="application/json"
+    )
+
+    assert response.status_code == 400
+    assert "ability_scores" in response.data
+    assert not Character.objects.filter(name="Gimli II").exists()
+
+
+@pytest.mark.django_db
+def test_character_character_class_create_view_adds_class_skills(
+    client, character_fixture, character_class_fixture, class_skill_fixture
+):
+    response = client.post(
+        "/api/character/character_character_class/",
+        {
+            "character": character_fixture[1].id,
+            "character_class": character_class_fixture[0].id,
+            "level": 1,
+        },
+    )
+
+    assert response.status_code == 201
+    assert set(
+        character_fixture[1].characterskill_set.values_list("skill__name", flat=True)
+    ) == {"Coding", "Swimming"}
+
+
+@pytest.mark.django_db
+def test_character_character_class_batch_view_adds_class_skills(
+    client, character_fixture, character_class_fixture, class_skill_fixture
+):
+    response = client.post(
+        "/api/character/character_character_class/batch/",
+        [
+            {"character": character.id, "character_class": character_class.id}
+            for character in character_fixture
+            for character_class in character_class_fixture[:2]
+        ],
+        content_type="application/json",
+    )
+
+    assert response.status_code == 201
+    assert len(response.data) == 4
+    for character in character_fixture:
+        assert set(
+            character.characterskill_set.values_list("skill__name", flat=True)
+        ) == {"Coding", "Swimming"}
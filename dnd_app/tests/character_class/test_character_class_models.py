@@ -1,4 +1,13 @@
+import uuid
+
 import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from character_class.models import BSBProgression
+from character_class.progressions import get_level_table, get_version_key
+from utils.reference_cache import VERSION_KEY
 
 
 @pytest.mark.django_db
@@ -32,6 +41,48 @@ def test_bab_progression_creation(bab_progression_fixture, ability_fixture):
     }
 
 
+@pytest.mark.django_db
+def test_progression_lookup_tables(
+    django_capture_on_commit_callbacks, bsb_progression_fixture, bab_progression_fixture
+):
+    bsb_progression = BSBProgression.objects.get(id=bsb_progression_fixture[0].id)
+    with CaptureQueriesContext(connection) as queries:
+        assert bsb_progression.get_save_bonus_for_lvl(3) == 3
+        assert bsb_progression.get_save_bonus_for_lvl("7") == 5
+        assert bsb_progression.get_save_bonus_for_lvl(8) is None
+        assert bsb_progression.get_save_bonus_for_lvl(0) is None
+        str(bsb_progression)
+    assert len(queries) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        bsb_progression.save_bonus_table = {"1": 1, "3": 9}
+        bsb_progression.save()
+    assert get_level_table(bsb_progression, "save_bonus_table") == (None, 1, None, 9)
+    assert bsb_progression.get_save_bonus_for_lvl(2) is None
+
+    bab_progression = bab_progression_fixture[0]
+    assert bab_progression.get_attack_bonus_for_lvl(6) == 5
+
+
+@pytest.mark.django_db
+def test_progression_tables_reload_after_other_process_changes(
+    settings, bsb_progression_fixture
+):
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    bsb_progression = BSBProgression.objects.get(id=bsb_progression_fixture[0].id)
+    assert bsb_progression.get_save_bonus_for_lvl(1) == 2
+
+    # another process changes the table and bumps the shared version on commit
+    BSBProgression.objects.filter(pk=bsb_progression.pk).update(
+        save_bonus_table={"1": 7}
+    )
+    assert bsb_progression.get_save_bonus_for_lvl(1) == 2
+    caches[settings.REFERENCE_CACHE_ALIAS].set(
+        VERSION_KEY.format(key=get_version_key(BSBProgression)), uuid.uuid4().hex, None
+    )
+    assert bsb_progression.get_save_bonus_for_lvl(1) == 7
+
+
 @pytest.mark.django_db
 def test_character_class_creation(
     character_class_fixture, source_fixture, die_fixture, bab_progression_fixture
@@ -213,6 +213,32 @@ def test_character_class_list_view(client, character_class_fixture):
     }
 
 
+@pytest.mark.django_db
+def test_character_class_list_view_query_count_is_constant(
+    client,
+    django_assert_num_queries,
+    class_alignment_fixture,
+    class_skill_fixture,
+    class_bsb_progression_fixture,
+    class_bonus_language_fixture,
+):
+    # 1 query for classes + 1 prefetch query per M2M field
+    with django_assert_num_queries(6):
+        response = client.get("/api/character_class/character_classes/")
+
+    assert response.status_code == 200
+    assert {
+        char_class["name"]: char_class["class_skills"] for char_class in response.data
+    } == {
+        "Fighter": [
+            class_skill_fixture[0].skill.id,
+            class_skill_fixture[1].skill.id,
+        ],
+        "Grog": [class_skill_fixture[3].skill.id],
+        "Slacker": [class_skill_fixture[2].skill.id],
+    }
+
+
 @pytest.mark.django_db
 def test_character_class_create_view_success(
     client, source_fixture, die_fixture, bab_progression_fixture
@@ -0,0 +1,152 @@
+import pytest
+
+from character.models import (
+    Character,
+    CharacterAbilityScore,
+    CharacterCharacterClass,
+    CharacterLanguage,
+    CharacterSkill,
+    CharacterInventory,
+    Inventory,
+    InventoryItem,
+)
+
+
+@pytest.fixture()
+def character_fixture(race_fixture, alignment_fixture):
+    return [
+        Character.objects.create(
+            name="Aragorn",
+            level=3,
+            race=race_fixture[0],
+            alignment=alignment_fixture[0],
+            reflex_save_bonus=1,
+            initiative_bonus=2,
+        ),
+        Character.objects.create(
+            name="Boromir",
+            race=race_fixture[1],
+            alignment=alignment_fixture[1],
+        ),
+    ]
+
+
+@pytest.fixture()
+def character_ability_score_fixture(character_fixture, ability_fixture):
+    return CharacterAbilityScore.objects.bulk_create(
+        [
+            CharacterAbilityScore(
+                character=character_fixture[0], ability=ability_fixture[0], value=16
+            ),
+            CharacterAbilityScore(
+                character=character_fixture[0],
+                ability=ability_fixture[1],
+                value=14,
+                bonus=2,
+            ),
+            CharacterAbilityScore(
+                character=character_fixture[0], ability=ability_fixture[2], value=9
+            ),
+            CharacterAbilityScore(
+                character=character_fixture[1], ability=ability_fixture[1], value=12
+            ),
+        ]
+    )
+
+
+@pytest.fixture()
+def character_character_class_fixture(
+    character_fixture, character_class_fixture, class_bsb_progression_fixture
+):
+    return CharacterCharacterClass.objects.bulk_create(
+        [
+            CharacterCharacterClass(
+                character=character_fixture[0],
+                character_class=character_class_fixture[0],
+                level=2,
+            ),
+            CharacterCharacterClass(
+                character=character_fixture[0],
+                character_class=character_class_fixture[1],
+                level=1,
+            ),
+            CharacterCharacterClass(
+                character=character_fixture[1],
+                character_class=character_class_fixture[2],
+                level=7,
+            ),
+        ]
+    )
+
+
+@pytest.fixture()
+def character_skill_fixture(character_fixture, skill_fixture):
+    return CharacterSkill.objects.bulk_create(
+        [
+            CharacterSkill(
+                character=character_fixture[0], skill=skill_fixture[0], ranks=4
+            ),
+            CharacterSkill(
+                character=character_fixture[0],
+                skill=skill_fixture[1],
+                ranks=2,
+                misc_bonus=1,
+            ),
+            CharacterSkill(
+                character=character_fixture[1], skill=skill_fixture[1], ranks=1
+            ),
+        ]
+    )
+
+
+@pytest.fixture()
+def character_language_fixture(character_fixture, language_fixture):
+    return CharacterLanguage.objects.bulk_create(
+        [
+            CharacterLanguage(
+                character=character_fixture[0], language=language_fixture[1]
+            ),
+            CharacterLanguage(
+                character=character_fixture[1], language=language_fixture[1]
+            ),
+        ]
+    )
+
+
+@pytest.fixture()
+def inventory_fixture():
+    return Inventory.objects.bulk_create(
+        [
+            Inventory(name="Backpack", capacity=60),
+            Inventory(name="Bag of Holding", capacity=250),
+        ]
+    )
+
+
+@pytest.fixture()
+def inventory_item_fixture(inventory_fixture, item_fixture):
+    return [
+        InventoryItem.objects.create(
+            inventory=inventory_fixture[0], item=item_fixture[0], quantity=2
+        ),
+        InventoryItem.objects.create(
+            inventory=inventory_fixture[0], item=item_fixture[1]
+        ),
+        InventoryItem.objects.create(
+            inventory=inventory_fixture[1], item=item_fixture[1], quantity=3
+        ),
+    ]
+
+
+@pytest.fixture()
+def character_inventory_fixture(character_fixture, inventory_fixture):
+    return CharacterInventory.objects.bulk_create(
+        [
+            CharacterInventory(
+                character=character_fixture[0], inventory=inventory_fixture[0]
+            ),
+            CharacterInventory(
+                character=character_fixture[0], inventory=inventory_fixture[1]
+            ),
+        ]
+    )
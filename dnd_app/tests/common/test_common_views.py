@@ -1,6 +1,8 @@
 from datetime import datetime
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from common.models import (
@@ -25,6 +27,21 @@ def test_source_list_view(client, source_fixture):
     }
 
 
+@pytest.mark.django_db
+def test_source_list_view_page_number_pagination(client, source_fixture):
+    response = client.get("/api/common/sources/", {"page_size": 1})
+
+    assert response.status_code == 200
+    assert response.data["count"] == 2
+    assert len(response.data["results"]) == 1
+
+    response = client.get("/api/common/sources/", {"page_size": 1, "page": 2})
+
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is None
+
+
 @pytest.mark.django_db
 def test_source_create_view_success(client):
     data = {"name": "Player's Handbook", "year": 2022}
@@ -546,3 +563,72 @@ def test_language_delete_view(client, language_fixture):
 
     assert response.status_code == 204
     assert not Language.objects.filter(id=language.id).exists()
+
+
+@pytest.mark.django_db
+def test_language_batch_views(client, source_fixture, race_language_fixture):
+    url = "/api/common/languages/batch/"
+    new_languages = [
+        {"name": f"Language {number}", "source": source_fixture[0].id}
+        for number in range(20)
+    ]
+
+    response = client.post(
+        url,
+        new_languages + [{"name": "Common", "source": 999}],
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert response.data[:20] == [{}] * 20
+    assert set(response.data[20]) == {"name", "source"}
+    assert not Language.objects.filter(name="Language 0").exists()
+
+    response = client.post(
+        url, new_languages[:2] + new_languages[1:2], content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert response.data == [
+        {},
+        {},
+        {"detail": "This object conflicts with an existing object."},
+    ]
+    assert not Language.objects.filter(name="Language 0").exists()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, new_languages, content_type="application/json")
+    assert response.status_code == 201
+    assert sum(query["sql"].startswith("INSERT") for query in queries) == 1
+    created_ids = [language["id"] for language in response.data]
+    assert Language.objects.filter(id__in=created_ids).count() == 20
+
+    response = client.patch(
+        url,
+        [
+            {"id": created_ids[0], "alphabet": "Runes"},
+            {"id": created_ids[1], "alphabet": "Glyphs"},
+        ],
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert Language.objects.get(id=created_ids[1]).alphabet == "Glyphs"
+
+    response = client.patch(
+        url, [{"id": created_ids[0]}, {"id": 0}], content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert response.data == [{}, {"id": ["Not found."]}]
+
+    common = Language.objects.get(name="Common")
+    response = client.delete(
+        url, [created_ids[0], common.id], content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert response.data == [
+        {},
+        {"detail": "This object cannot be deleted because it has dependent objects."},
+    ]
+    assert Language.objects.filter(id=created_ids[0]).exists()
+
+    response = client.delete(url, created_ids, content_type="application/json")
+    assert response.status_code == 204
+    assert not Language.objects.filter(id__in=created_ids).exists()
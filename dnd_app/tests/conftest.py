@@ -1,5 +1,10 @@
 import pytest
 from rest_framework.test import APIClient
+
+from character_class.progressions import clear_progression_tables
+from feat.prerequisites import clear_prerequisite_graph
+from spell.search import clear_search_index
+from utils.reference_cache import clear_reference_cache
 from .common_fixtures import *
 from .skill_fixtures import *
 from .feat_fixtures import *
@@ -7,8 +12,18 @@ from .race_fixtures import *
 from .character_class_fixtures import *
 from .spell_fixtures import *
 from .item_fixtures import *
+from .character_fixtures import *
 
 
 @pytest.fixture()
 def client():
     return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    # ids are reused between tests, so process-wide caches must not outlive a test
+    clear_progression_tables()
+    clear_prerequisite_graph()
+    clear_reference_cache()
+    clear_search_index()
@@ -0,0 +1,229 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from character.models import (
+    Character,
+    CharacterAbilityScore,
+    CharacterCharacterClass,
+    Inventory,
+    InventoryItem,
+)
+from character_class.models import CharacterClass
+from common.models import Ability, Trait
+from core.management.commands.run_all_import_commands import (
+    IMPORT_COMMANDS,
+    Command,
+    get_critical_path,
+    get_import_dependencies,
+    get_import_stages,
+)
+from feat.models import Feat, FeatFeatPrerequisite
+from item.models import Item
+from race.models import Race
+from skill.models import Skill
+from spell.models import Spell, SpellLevel
+
+
+def test_get_import_dependencies():
+    dependencies = get_import_dependencies(IMPORT_COMMANDS)
+
+    assert dependencies.keys() == dict(IMPORT_COMMANDS).keys()
+    assert dependencies["common.Trait"] == {"common.TraitClassification"}
+    assert dependencies["spell.MagicSubSchool"] == {"spell.MagicSchool"}
+    assert dependencies["skill.Skill"] == {"common.Ability"}
+    assert dependencies["common.Ability"] == set()
+
+
+def test_get_import_dependencies_ignores_models_not_imported():
+    commands = [
+        (label, args) for label, args in IMPORT_COMMANDS if label != "common.Ability"
+    ]
+
+    assert get_import_dependencies(commands)["skill.Skill"] == set()
+
+
+def test_get_import_stages():
+    dependencies = {
+        "a": set(),
+        "b": {"a"},
+        "c": {"b"},
+        "d": set(),
+        "e": {"a", "d"},
+    }
+
+    assert get_import_stages(dependencies) == [["a", "d"], ["b", "e"], ["c"]]
+
+
+def test_get_import_stages_orders_every_import_after_its_dependencies():
+    dependencies = get_import_dependencies(IMPORT_COMMANDS)
+    stage_of = {
+        label: index
+        for index, stage in enumerate(get_import_stages(dependencies))
+        for label in stage
+    }
+
+    assert stage_of.keys() == dependencies.keys()
+    for label, label_dependencies in dependencies.items():
+        assert all(
+            stage_of[dependency] < stage_of[label] for dependency in label_dependencies
+        )
+
+
+def test_get_import_stages_rejects_circular_and_missing_dependencies():
+    dependencies = {"a": set(), "b": {"a", "c"}, "c": {"b"}, "d": {"missing"}}
+
+    with pytest.raises(CommandError, match="dependencies: b, c, d$"):
+        get_import_stages(dependencies)
+
+
+def test_run_all_import_commands_parallel_rejects_unresolved_dependencies():
+    with pytest.raises(CommandError, match="dependencies: a, b$"):
+        Command().run_parallel(
+            {"a": ("import_a",), "b": ("import_b",)},
+            {"a": {"b"}, "b": {"a"}},
+            workers=2,
+            force=False,
+        )
+
+
+def test_get_critical_path():
+    dependencies = {
+        "a": set(),
+        "b": {"a"},
+        "c": {"b"},
+        "d": set(),
+        "e": {"a", "d"},
+    }
+    durations = {"a": 1.0, "b": 1.0, "c": 1.0, "d": 5.0, "e": 0.5}
+
+    assert get_critical_path(dependencies, durations) == (["d", "e"], 5.5)
+
+    durations["c"] = 4.0
+    assert get_critical_path(dependencies, durations) == (["a", "b", "c"], 6.0)
+
+
+@pytest.mark.django_db
+def test_run_all_import_commands_serial():
+    stdout = StringIO()
+
+    call_command("run_all_import_commands", "--serial", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "All commands ran successfully" in output
+    assert "Critical path" in output
+    assert Ability.objects.exists()
+    assert Skill.objects.exists()
+    assert Trait.objects.exists()
+
+
+@pytest.fixture()
+def world_reference_data(
+    ability_fixture,
+    alignment_fixture,
+    language_fixture,
+    skill_fixture,
+    size_fixture,
+    die_fixture,
+    bab_progression_fixture,
+    bsb_progression_fixture,
+    magic_school_fixture,
+    casting_time_fixture,
+    spell_range_fixture,
+    item_category_fixture,
+    type_of_feat_fixture,
+):
+    pass
+
+
+def generate_world(seed):
+    call_command(
+        "generate_world",
+        "--seed",
+        str(seed),
+        "--characters",
+        "10",
+        "--races",
+        "2",
+        "--classes",
+        "3",
+        "--spells",
+        "5",
+        "--classes-per-spell",
+        "2",
+        "--feats",
+        "6",
+        "--feat-chain-depth",
+        "3",
+        "--items",
+        "4",
+        "--inventories",
+        "2",
+        "--inventory-size",
+        "3",
+        "--batch-size",
+        "4",
+        stdout=StringIO(),
+    )
+
+
+def get_world_snapshot():
+    return [
+        list(Race.objects.order_by("id").values_list("name", "size__name")),
+        list(
+            Character.objects.order_by("id").values_list(
+                "name", "level", "age", "race__name", "alignment__name"
+            )
+        ),
+        list(
+            CharacterCharacterClass.objects.order_by("id").values_list(
+                "character__name", "character_class__name", "level"
+            )
+        ),
+        list(
+            SpellLevel.objects.order_by("id").values_list(
+                "spell__name", "character_class__name", "level"
+            )
+        ),
+        list(
+            InventoryItem.objects.order_by("id").values_list(
+                "inventory__name", "item__name", "quantity"
+            )
+        ),
+    ]
+
+
+@pytest.mark.django_db
+def test_generate_world(world_reference_data, ability_fixture):
+    generate_world(seed=7)
+
+    assert Race.objects.filter(name__startswith="World 7 ").count() == 2
+    assert CharacterClass.objects.filter(name__startswith="World 7 ").count() == 3
+    assert Spell.objects.filter(name__startswith="World 7 ").count() == 5
+    assert Feat.objects.filter(name__startswith="World 7 ").count() == 6
+    assert Item.objects.filter(name__startswith="World 7 ").count() == 4
+    assert Character.objects.count() == 10
+    assert CharacterAbilityScore.objects.count() == 10 * len(ability_fixture)
+    assert Inventory.objects.filter(name__startswith="World 7 ").count() == 2
+    assert InventoryItem.objects.count() == 2 * 3
+    # every feat but the first of each chain of three requires the previous one
+    assert FeatFeatPrerequisite.objects.count() >= 4
+
+    with pytest.raises(CommandError):
+        generate_world(seed=7)
+
+
+@pytest.mark.django_db
+def test_generate_world_is_reproducible(world_reference_data):
+    snapshots = []
+    for _ in range(2):
+        with transaction.atomic():
+            generate_world(seed=7)
+            snapshots.append(get_world_snapshot())
+            transaction.set_rollback(True)
+
+    assert snapshots[0] == snapshots[1]
+    assert all(snapshots[0])
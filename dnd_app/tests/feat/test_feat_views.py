@@ -226,3 +226,38 @@ def test_feat_delete_view_fail(
     assert not FeatFeatPrerequisite.objects.filter(prerequisite_for_feat=feat).exists()
     assert FeatFeatPrerequisite.objects.filter(prerequisite=feat).exists()
     assert FeatSkillPrerequisite.objects.filter(feat=feat).exists()
+
+
+@pytest.mark.django_db
+def test_feat_prerequisites_view(client, feat_fixture, feat_feat_prerequisite_fixture):
+    url = f"/api/feat/feats/{feat_fixture[0].id}/prerequisites/"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert [feat["name"] for feat in response.data] == ["Feat 2"]
+
+    FeatFeatPrerequisite.objects.create(
+        prerequisite_for_feat=feat_fixture[1], prerequisite=feat_fixture[3]
+    )
+    response = client.get(url)
+    assert [feat["name"] for feat in response.data] == ["Feat 4", "Feat 2"]
+
+    FeatFeatPrerequisite.objects.create(
+        prerequisite_for_feat=feat_fixture[3], prerequisite=feat_fixture[0]
+    )
+    assert client.get(url).status_code == 400
+
+
+@pytest.mark.django_db
+def test_feat_prerequisites_view_reloads_graph_for_new_feat(client, feat_fixture):
+    assert client.get(f"/api/feat/feats/{feat_fixture[0].id}/prerequisites/").data == []
+
+    # bulk writes, like imports and other processes, do not clear the graph
+    [feat] = Feat.objects.bulk_create([Feat(name="Feat 5", benefit="Benefit 5")])
+    FeatFeatPrerequisite.objects.bulk_create(
+        [FeatFeatPrerequisite(prerequisite_for_feat=feat, prerequisite=feat_fixture[0])]
+    )
+    response = client.get(f"/api/feat/feats/{feat.id}/prerequisites/")
+
+    assert response.status_code == 200
+    assert [feat["name"] for feat in response.data] == ["Feat 1"]
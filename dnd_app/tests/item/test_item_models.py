@@ -1,4 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from item.models import ItemCategory, Weapon
+from race.models import Size
+from utils.reference_cache import bump_shared_version
 
 
 @pytest.mark.django_db
@@ -9,6 +15,17 @@ def test_item_category_creation(item_category_fixture):
     assert str(item_category) == "Pain"
 
 
+@pytest.mark.django_db
+def test_item_defaults_are_cached(item_category_fixture, size_fixture):
+    default_category = ItemCategory.objects.create(name="Item")
+    medium = Size.objects.get(name="Medium")
+    with CaptureQueriesContext(connection) as queries:
+        weapons = [Weapon(name=f"Sword {index}") for index in range(1000)]
+    assert len(queries) == 2
+    assert {weapon.category_id for weapon in weapons} == {default_category.id}
+    assert {weapon.size_id for weapon in weapons} == {medium.id}
+
+
 @pytest.mark.django_db
 def test_item_creation(item_fixture, item_category_fixture):
     item = item_fixture[0]
@@ -215,3 +232,19 @@ def test_armor_armor_magic_ability_creation(
     assert (
         armor_armor_magic_ability.armor_magic_ability == armor_magic_ability_fixture[0]
     )
+
+
+@pytest.mark.django_db
+def test_default_category_created_after_loading_categories(
+    django_capture_on_commit_callbacks, item_category_fixture
+):
+    assert ItemCategory.get_default_category_id() is None
+
+    # added by an import in another process, which bumps the shared version on commit
+    with django_capture_on_commit_callbacks(execute=True):
+        ItemCategory.objects.bulk_create([ItemCategory(name="Item")])
+        bump_shared_version(ItemCategory._meta.label)
+
+    assert ItemCategory.get_default_category_id() == (
+        ItemCategory.objects.get(name="Item").id
+    )
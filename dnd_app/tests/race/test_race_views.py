@@ -326,6 +326,28 @@ def test_race_list_view(client, race_fixture):
     }
 
 
+@pytest.mark.django_db
+def test_race_list_view_query_count_is_constant(
+    client,
+    django_assert_num_queries,
+    race_type_fixture,
+    race_trait_fixture,
+    race_language_fixture,
+    race_favored_class_fixture,
+):
+    # 1 query for races + 1 prefetch query per M2M field
+    with django_assert_num_queries(6):
+        response = client.get("/api/race/race/")
+
+    assert response.status_code == 200
+    assert len(response.data) == 3
+    assert {race["name"]: race["languages"] for race in response.data} == {
+        "Human": [race_language_fixture[0].language.id],
+        "Human222": [race_language_fixture[1].language.id],
+        "Human3333": [race_language_fixture[2].language.id],
+    }
+
+
 @pytest.mark.django_db
 def test_race_create_view_success(client, size_fixture, source_fixture):
     data = {
@@ -1,4 +1,15 @@
+import uuid
+
 import pytest
+from django.core.cache import caches
+
+from spell.models import Spell
+from spell.search import (
+    SEARCH_INDEX_VERSION_KEY,
+    get_search_index,
+    update_search_documents,
+)
+from utils.reference_cache import VERSION_KEY, get_shared_version
 
 
 @pytest.mark.django_db
@@ -102,3 +113,23 @@ def test_spell_spell_component_fixture(
     ssc = spell_spell_component_fixture[0]
     assert ssc.spell == spell_fixture[0]
     assert ssc.component == spell_component_fixture[0]
+
+
+@pytest.mark.django_db
+def test_spell_search_index_reloads_after_other_process_changes(
+    settings, django_capture_on_commit_callbacks, spell_fixture
+):
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    version = get_shared_version(SEARCH_INDEX_VERSION_KEY)
+    with django_capture_on_commit_callbacks(execute=True):
+        update_search_documents()
+    assert get_shared_version(SEARCH_INDEX_VERSION_KEY) != version
+    assert get_search_index().search("thunder") == {}
+
+    # another process rebuilds a search document and bumps the shared version on commit
+    Spell.objects.filter(pk=spell_fixture[0].pk).update(search_document="thunder")
+    assert get_search_index().search("thunder") == {}
+    caches[settings.REFERENCE_CACHE_ALIAS].set(
+        VERSION_KEY.format(key=SEARCH_INDEX_VERSION_KEY), uuid.uuid4().hex, None
+    )
+    assert set(get_search_index().search("thunder")) == {spell_fixture[0].pk}
@@ -1,4 +1,9 @@
+import gzip
+import json
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from spell.models import (
     MagicAuraStrength,
@@ -13,6 +18,7 @@ from spell.models import (
     SpellLevel,
     SpellSpellComponent,
 )
+from spell.search import update_search_documents
 from tests.character_class_fixtures import character_class_fixture
 
 
@@ -450,6 +456,106 @@ def test_spell_list_view(client, spell_fixture):
     }
 
 
+@pytest.mark.django_db
+def test_spell_list_view_cursor_pagination(client, spell_fixture):
+    response = client.get("/api/spell/spells/", {"page_size": 2})
+
+    assert response.status_code == 200
+    assert [spell["name"] for spell in response.data["results"]] == [
+        "Fireball",
+        "Ice Storm",
+    ]
+    assert response.data["previous"] is None
+
+    response = client.get(response.data["next"])
+
+    assert response.status_code == 200
+    assert [spell["name"] for spell in response.data["results"]] == ["Lightning Bolt"]
+    assert response.data["next"] is None
+
+    response = client.get(response.data["previous"])
+
+    assert [spell["name"] for spell in response.data["results"]] == [
+        "Fireball",
+        "Ice Storm",
+    ]
+    assert response.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_spell_list_view_fields(client, spell_fixture):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/spell/spells/", {"fields": "id,name"})
+
+    assert response.status_code == 200
+    assert [spell for spell in response.data] == [
+        {"id": spell.id, "name": spell.name}
+        for spell in sorted(spell_fixture, key=lambda spell: spell.name)
+    ]
+    assert len(queries) == 1
+    assert "description" not in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_spell_list_view_expand(client, django_assert_num_queries, spell_fixture):
+    with django_assert_num_queries(2):
+        response = client.get(
+            "/api/spell/spells/",
+            {"fields": "name,school,components", "expand": "school"},
+        )
+
+    assert response.status_code == 200
+    spell = response.data[0]
+    assert set(spell) == {"name", "school", "components"}
+    assert spell["school"]["name"] == spell_fixture[0].school.name
+    assert isinstance(spell["components"], list)
+
+
+@pytest.mark.django_db
+def test_spell_list_view_unknown_fields(client, spell_fixture):
+    response = client.get(
+        "/api/spell/spells/", {"fields": "name,bogus,other", "expand": "nothing"}
+    )
+
+    assert response.status_code == 400
+    assert response.data == {
+        "fields": ["Unknown fields: bogus, other."],
+        "expand": ["Unknown fields: nothing."],
+    }
+
+
+@pytest.mark.django_db
+def test_spell_list_view_empty_fields(client, spell_fixture):
+    response = client.get("/api/spell/spells/", {"fields": ""})
+
+    assert response.status_code == 200
+    assert "description" in response.data[0]
+
+
+@pytest.mark.django_db
+def test_spell_export_view(client, spell_fixture):
+    response = client.get("/api/spell/spells/export/", {"fields": "id,name"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert sorted(json.loads(line)["name"] for line in lines) == sorted(
+        spell.name for spell in spell_fixture
+    )
+    assert set(json.loads(lines[0])) == {"id", "name"}
+
+
+@pytest.mark.django_db
+def test_spell_export_view_gzip(client, spell_fixture):
+    response = client.get("/api/spell/spells/export/", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+    assert len(lines) == len(spell_fixture)
+    assert "level" in json.loads(lines[0])
+
+
 @pytest.fixture()
 def self_containted_spell_level_fixture(
     spell_range_fixture,
@@ -473,6 +579,117 @@ def self_containted_spell_level_fixture(
     ]
 
 
+@pytest.mark.django_db
+def test_spell_search_view(client, spell_spell_descriptor_fixture):
+    update_search_documents()
+
+    response = client.get("/api/spell/spells/search/", {"q": "fire"})
+    assert response.status_code == 200
+    assert [spell["name"] for spell in response.data] == ["Fireball"]
+    assert "search_document" not in response.data[0]
+
+    response = client.get("/api/spell/spells/search/", {"q": "conj"})
+    assert [spell["name"] for spell in response.data] == ["Ice Storm", "Lightning Bolt"]
+
+    response = client.get("/api/spell/spells/search/", {"q": "ZAP ice", "limit": 1})
+    assert [spell["name"] for spell in response.data] == ["Lightning Bolt"]
+
+    response = client.get("/api/spell/spells/search/", {"q": "storm conj"})
+    assert [spell["name"] for spell in response.data] == ["Ice Storm"]
+    assert response.data[0]["rank"] == 1.4
+
+    assert client.get("/api/spell/spells/search/", {"q": "?"}).data == []
+
+
+@pytest.mark.django_db
+def test_spell_search_follows_changes(
+    client, spell_spell_descriptor_fixture, spell_descriptor_fixture
+):
+    update_search_documents()
+    descriptor = spell_descriptor_fixture[2]
+    descriptor.name = "Thunder"
+    descriptor.save()
+
+    response = client.get("/api/spell/spells/search/", {"q": "thund"})
+    assert [spell["name"] for spell in response.data] == ["Lightning Bolt"]
+
+    spell = Spell.objects.get(name="Ice Storm")
+    spell.descriptor.add(descriptor)
+    response = client.get("/api/spell/spells/search/", {"q": "thund"})
+    assert [spell["name"] for spell in response.data] == [
+        "Ice Storm",
+        "Lightning Bolt",
+    ]
+
+    descriptor.spell_set.clear()
+    assert client.get("/api/spell/spells/search/", {"q": "thund"}).data == []
+
+
+@pytest.mark.django_db
+def test_spell_browse_view(
+    client,
+    spell_level_fixture,
+    spell_spell_component_fixture,
+    spell_spell_descriptor_fixture,
+    spell_component_fixture,
+    magic_school_fixture,
+    character_class_fixture,
+):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/spell/spells/browse/")
+    assert response.status_code == 200
+    # six facet aggregates, the page and three prefetches of its many-to-many fields
+    assert len(queries) == 10
+    assert [spell["name"] for spell in response.data["results"]] == [
+        "Fireball",
+        "Ice Storm",
+        "Lightning Bolt",
+    ]
+    facets = response.data["facets"]
+    assert [(school["name"], school["count"]) for school in facets["school"]] == [
+        ("Abjuration", 1),
+        ("Conjuration", 2),
+    ]
+    assert [(level["level"], level["count"]) for level in facets["level"]] == [
+        (3, 1),
+        (5, 1),
+        (7, 1),
+    ]
+    assert [descriptor["name"] for descriptor in facets["descriptor"]] == [
+        "Fire",
+        "Ice",
+        "Lightning",
+    ]
+
+    response = client.get(
+        "/api/spell/spells/browse/",
+        {
+            "school": magic_school_fixture[1].id,
+            "exclude_component": spell_component_fixture[2].id,
+        },
+    )
+    assert [spell["name"] for spell in response.data["results"]] == ["Lightning Bolt"]
+    assert [
+        (component["name"], component["count"])
+        for component in response.data["facets"]["component"]
+    ] == [("Somatic", 1)]
+
+    fireball_class = character_class_fixture[0].id
+    response = client.get(
+        "/api/spell/spells/browse/", {"character_class": fireball_class, "level": 3}
+    )
+    assert [spell["name"] for spell in response.data["results"]] == ["Fireball"]
+    assert response.data["facets"]["level"] == [{"level": 3, "count": 1}]
+
+    response = client.get(
+        "/api/spell/spells/browse/", {"character_class": fireball_class, "level": 5}
+    )
+    assert response.data["results"] == []
+
+    response = client.get("/api/spell/spells/browse/", {"level": "high"})
+    assert response.status_code == 400
+
+
 @pytest.mark.django_db
 def test_spell_create_view_success(
     client,
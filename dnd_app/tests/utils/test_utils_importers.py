@@ -0,0 +1,91 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from common.models import Die, DurationUnit, Source
+from core.models import ImportedFile
+from utils.importers import BulkUpserter, RejectWriter
+
+
+@pytest.mark.django_db
+def test_bulk_upserter_skips_existing_rows(die_fixture, django_assert_num_queries):
+    rows = [{"Sides": "4"}, {"Sides": "8"}, {"Sides": "10"}, {"Sides": "8"}]
+    with django_assert_num_queries(4):
+        result = BulkUpserter(Die).run(rows)
+    assert result.created == 2
+    assert result.existing == 2
+    assert sorted(Die.objects.values_list("sides", flat=True)) == [2, 4, 6, 8, 10]
+
+
+@pytest.mark.django_db
+def test_bulk_upserter_maps_columns(duration_unit_fixture):
+    rows = [
+        {"Name": "Round", "Name Plural": "Rounds", "Duration In Seconds": "6"},
+        {"Name": "Minute", "Name Plural": "Minutes", "Duration In Seconds": "60"},
+    ]
+    result = BulkUpserter(DurationUnit).run(rows)
+    assert (result.created, result.existing) == (1, 1)
+    assert DurationUnit.objects.get(name="Minute").duration_in_seconds == 60
+
+
+@pytest.mark.django_db
+def test_bulk_upserter_rejects_invalid_rows(tmp_path):
+    rows = [
+        {"Name": "PHB", "Year": "2003", "Link": ""},
+        {"Name": "Homebrew", "Year": "1900", "Link": ""},
+        {"Name": "Wiki", "Year": "", "Link": "not a link"},
+        {"Name": "DMG", "Year": "", "Link": ""},
+    ]
+    with RejectWriter(tmp_path / "rejects.csv") as rejects:
+        result = BulkUpserter(Source, batch_size=2).run(rows, rejects=rejects)
+    assert (result.created, result.rejected) == (2, 2)
+    assert Source.objects.get(name="DMG").year is None
+    reject_lines = (tmp_path / "rejects.csv").read_text().splitlines()
+    assert reject_lines[0] == "Name;Year;Link;Reject Reason"
+    assert reject_lines[1].startswith("Homebrew;1900;;year: Year must be between 1974")
+    assert reject_lines[2] == "Wiki;;not a link;link: Enter a valid URL."
+
+
+@pytest.mark.django_db
+def test_import_csv_skips_unchanged_file_and_rows(settings, tmp_path):
+    settings.BASE_DIR = tmp_path
+    initial_data_dir = tmp_path / "common" / "initial_data"
+    initial_data_dir.mkdir(parents=True)
+    csv_file = initial_data_dir / "Source_list.csv"
+    csv_file.write_text("Name;Year\nPHB;2003\nDMG;2003\n")
+
+    def import_sources():
+        stdout = StringIO()
+        call_command("import_csv", "common", "Source", "source_list.csv", stdout=stdout)
+        return stdout.getvalue()
+
+    assert "Created: 2, Updated: 0, Already exists: 0" in import_sources()
+    assert "is unchanged" in import_sources()
+
+    csv_file.write_text("Name;Year\nPHB;2003\nDMG;2004\nMM;2003\n")
+    assert "Created: 1, Updated: 1, Already exists: 1" in import_sources()
+    assert Source.objects.get(name="DMG").year == 2004
+    assert ImportedFile.objects.get().importedrow_set.count() == 3
+
+
+@pytest.mark.django_db
+def test_import_csv_retries_file_with_rejected_rows(settings, tmp_path, monkeypatch):
+    settings.BASE_DIR = tmp_path
+    monkeypatch.chdir(tmp_path)
+    initial_data_dir = tmp_path / "common" / "initial_data"
+    initial_data_dir.mkdir(parents=True)
+    (initial_data_dir / "Source_list.csv").write_text(
+        "Name;Year\nPHB;2003\nHomebrew;1900\n"
+    )
+
+    def import_sources():
+        stdout = StringIO()
+        call_command("import_csv", "common", "Source", "source_list.csv", stdout=stdout)
+        return stdout.getvalue()
+
+    assert "Rejected 1 invalid rows" in import_sources()
+    output = import_sources()
+    assert "is unchanged" not in output
+    assert "Created: 0, Updated: 0, Already exists: 1" in output
+    assert "Rejected 1 invalid rows" in output
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from item.models import Item
+from utils.pagination import KeysetCursorPagination
+
+
+def paginate(params, view):
+    paginator = KeysetCursorPagination()
+    request = Request(APIRequestFactory().get("/api/item/items/", params))
+    page = paginator.paginate_queryset(Item.objects.all(), request, view)
+    return paginator, page
+
+
+def get_cursor(link):
+    return parse_qs(urlparse(link).query)["cursor"][0]
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_pagination_walks_equal_values_both_ways(item_category_fixture):
+    Item.objects.bulk_create(
+        [
+            Item(
+                name=f"Item {index}",
+                hardness=hardness,
+                category=item_category_fixture[0],
+            )
+            for index, hardness in enumerate([5, 10, 10, 10, 10, 1])
+        ]
+    )
+    expected = list(Item.objects.order_by("-hardness", "id"))
+    view = SimpleNamespace(cursor_ordering=("-hardness", "id"))
+
+    assert paginate({}, view)[1] is None
+
+    pages = []
+    paginator, page = paginate({"page_size": 2}, view)
+    assert paginator.get_previous_link() is None
+    while True:
+        pages.append(page)
+        if paginator.get_next_link() is None:
+            break
+        paginator, page = paginate(
+            {"page_size": 2, "cursor": get_cursor(paginator.get_next_link())}, view
+        )
+    assert [item for page in pages for item in page] == expected
+
+    previous = paginator.get_previous_link()
+    paginator, page = paginate({"page_size": 2, "cursor": get_cursor(previous)}, view)
+    assert page == pages[1]
+    assert paginator.get_next_link() is not None
+
+    paginator, page = paginate(
+        {"page_size": 2, "cursor": get_cursor(paginator.get_previous_link())}, view
+    )
+    assert page == pages[0]
+    assert paginator.get_previous_link() is None
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_pagination_rejects_invalid_cursor():
+    with pytest.raises(NotFound):
+        paginate({"cursor": "bogus"}, SimpleNamespace(cursor_ordering=("name", "id")))
@@ -0,0 +1,99 @@
+import uuid
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from common.models import Ability, Die
+from utils.reference_cache import (
+    VERSION_KEY,
+    get_by_id,
+    get_by_name,
+    get_id_by_name,
+)
+from utils.serializers import ReferenceRelatedField
+
+
+@pytest.mark.django_db
+def test_reference_cache_lookups(
+    django_capture_on_commit_callbacks, ability_fixture, die_fixture
+):
+    strength = Ability.objects.get(name="Strength")
+    with CaptureQueriesContext(connection) as queries:
+        assert get_by_id(Ability, strength.id) == strength
+        assert get_by_name(Ability, "Dexterity").abbreviation == "DEX"
+        assert get_id_by_name(Ability, "Strength") == strength.id
+        assert get_by_name(Ability, "Luck") is None
+        assert str(get_by_name(Die, 6)) == "d6"
+    assert len(queries) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        strength.name = "Might"
+        strength.save()
+        assert get_by_id(Ability, strength.id).name == "Strength"
+    assert get_by_id(Ability, strength.id).name == "Might"
+
+
+@pytest.mark.django_db
+def test_reference_cache_reloads_tables_changed_by_other_processes(
+    settings, ability_fixture
+):
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    strength = Ability.objects.get(name="Strength")
+    assert get_by_id(Ability, strength.id).name == "Strength"
+
+    # another process renames the row and bumps the shared version on commit
+    Ability.objects.filter(pk=strength.id).update(name="Might")
+    assert get_by_id(Ability, strength.id).name == "Strength"
+    caches[settings.REFERENCE_CACHE_ALIAS].set(
+        VERSION_KEY.format(key=Ability._meta.label), uuid.uuid4().hex, None
+    )
+    assert get_by_id(Ability, strength.id).name == "Might"
+
+
+@pytest.mark.django_db
+def test_reference_cache_name_miss_reloads_only_newer_versions(
+    settings, django_assert_num_queries, ability_fixture
+):
+    assert get_by_name(Ability, "Luck") is None
+    Ability.objects.bulk_create([Ability(name="Luck", abbreviation="LCK")])
+    with django_assert_num_queries(0):
+        assert get_by_name(Ability, "Luck") is None
+        assert get_by_name(Ability, "Luck") is None
+
+    # another process added the row and bumped the shared version, within the check interval
+    caches[settings.REFERENCE_CACHE_ALIAS].set(
+        VERSION_KEY.format(key=Ability._meta.label), uuid.uuid4().hex, None
+    )
+    assert get_by_name(Ability, "Fate") is None
+    with django_assert_num_queries(0):
+        assert get_by_name(Ability, "Luck").abbreviation == "LCK"
+
+
+@pytest.mark.django_db
+def test_reference_related_field_uses_cache(ability_fixture):
+    field = ReferenceRelatedField(queryset=Ability.objects.all())
+    strength = Ability.objects.get(name="Strength")
+    assert field.to_internal_value(str(strength.id)) == strength
+    with CaptureQueriesContext(connection) as queries:
+        assert field.to_internal_value(strength.id) == strength
+        with pytest.raises(ValidationError):
+            field.to_internal_value(0)
+        with pytest.raises(ValidationError):
+            field.to_internal_value("Strength")
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_reference_related_field_returns_copies(ability_fixture):
+    field = ReferenceRelatedField(queryset=Ability.objects.all())
+    strength = Ability.objects.get(name="Strength")
+
+    ability = field.to_internal_value(strength.id)
+    assert ability is not get_by_id(Ability, strength.id)
+    ability.name = "Might"
+
+    assert get_by_id(Ability, strength.id).name == "Strength"
+    assert field.to_internal_value(strength.id).name == "Strength"
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "utils"
+
+    def ready(self):
+        from utils.reference_cache import connect_signals
+
+        connect_signals()
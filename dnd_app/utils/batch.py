@@ -0,0 +1,127 @@
+"""
+Bulk writes of validated serializer data, used by the batch action of CustomModelViewSet.
+
+Rows are written with bulk_create and bulk_update, whose SQL sends no model signals.
+post_save is sent for every written row of models with receivers, so inventory totals,
+search documents and process-wide caches stay up to date.
+Models whose serializer overrides create or update, and multi-table inherited models,
+which bulk_create does not support, are saved one by one.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_save
+from rest_framework import serializers
+
+
+def split_many_to_many(model, validated_data):
+    """
+    Returns (field values, many-to-many values) of validated data.
+    """
+    values = {}
+    many_to_many = {}
+    for name, value in validated_data.items():
+        if model._meta.get_field(name).many_to_many:
+            many_to_many[name] = value
+        else:
+            values[name] = value
+    return values, many_to_many
+
+
+def _overrides(serializer, method_name):
+    return getattr(type(serializer), method_name) is not getattr(
+        serializers.ModelSerializer, method_name
+    )
+
+
+def can_write_in_bulk(model, serializer):
+    """
+    Returns whether rows of the serializer's model can be written with bulk_create and bulk_update.
+    """
+    return not model._meta.parents and not (
+        _overrides(serializer, "create") or _overrides(serializer, "update")
+    )
+
+
+def send_post_save(model, instances, created, update_fields=None):
+    if not post_save.has_listeners(model):
+        return
+    for instance in instances:
+        post_save.send(
+            sender=model,
+            instance=instance,
+            created=created,
+            update_fields=update_fields,
+            raw=False,
+            using=instance._state.db,
+        )
+
+
+def bulk_create(serializer):
+    """
+    Creates the rows of a validated `many=True` model serializer and returns them.
+    """
+    child = serializer.child
+    model = child.Meta.model
+    if not can_write_in_bulk(model, child):
+        return serializer.save()
+
+    rows = [
+        split_many_to_many(model, validated_data)
+        for validated_data in serializer.validated_data
+    ]
+    instances = model.objects.bulk_create(model(**values) for values, _ in rows)
+    for instance, (_, many_to_many) in zip(instances, rows):
+        for name, value in many_to_many.items():
+            getattr(instance, name).set(value)
+    send_post_save(model, instances, created=True)
+    serializer.instance = instances
+    return instances
+
+
+def bulk_update(partial_serializers):
+    """
+    Applies every validated partial serializer to its instance and saves them all at once.
+    Returns the updated instances.
+    """
+    if not partial_serializers:
+        return []
+    model = type(partial_serializers[0].instance)
+    if not can_write_in_bulk(model, partial_serializers[0]):
+        return [serializer.save() for serializer in partial_serializers]
+
+    fields = set()
+    many_to_many = []
+    for serializer in partial_serializers:
+        values, related_values = split_many_to_many(model, serializer.validated_data)
+        for name, value in values.items():
+            setattr(serializer.instance, name, value)
+        fields.update(values)
+        many_to_many.append((serializer.instance, related_values))
+
+    instances = [serializer.instance for serializer in partial_serializers]
+    if fields:
+        model.objects.bulk_update(instances, sorted(fields))
+    for instance, related_values in many_to_many:
+        for name, value in related_values.items():
+            getattr(instance, name).set(value)
+    send_post_save(
+        model, instances, created=False, update_fields=frozenset(fields) or None
+    )
+    return instances
+
+
+def find_integrity_errors(items, write):
+    """
+    Writes every item on its own and returns the indexes of items failing with an IntegrityError.
+    Every write is rolled back.
+    """
+    failed = []
+    with transaction.atomic():
+        for index, item in enumerate(items):
+            try:
+                with transaction.atomic():
+                    write(item)
+            except IntegrityError:
+                failed.append(index)
+        transaction.set_rollback(True)
+    return failed
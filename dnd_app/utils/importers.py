@@ -0,0 +1,526 @@
+import csv
+import hashlib
+import json
+import operator
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+from core.models import ImportedFile, ImportedRow
+from utils.reference_cache import (
+    get_by_id,
+    invalidate_reference_cache,
+    is_reference_model,
+)
+
+
+def get_natural_key_fields(model):
+    """
+    Returns the fields identifying a model row apart from its primary key:
+    the first unique field, or the first unique_together set.
+    """
+    for model_field in model._meta.concrete_fields:
+        if model_field.unique and not model_field.primary_key:
+            return [model_field]
+    for unique_together in model._meta.unique_together:
+        return [model._meta.get_field(name) for name in unique_together]
+    raise ValueError(f"Model '{model.__name__}' has no natural key")
+
+
+def batched(iterable, batch_size):
+    """
+    Yields lists of at most batch_size items from the iterable.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def get_hash(content):
+    """
+    Returns the sha256 hex digest of bytes, or of the JSON representation of any other value.
+    """
+    if not isinstance(content, bytes):
+        content = json.dumps(content, sort_keys=True, default=str).encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_file_hash(path, chunk_size=1024 * 1024):
+    """
+    Returns the sha256 hex digest of a file, reading it in chunks.
+    """
+    file_hash = hashlib.sha256()
+    with open(path, mode="rb") as file:
+        while chunk := file.read(chunk_size):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def find_import_file(app_name, file_name):
+    """
+    Returns the path of a file in <app>/initial_data/, matching its name case-insensitively.
+    """
+    initial_data_dir = settings.BASE_DIR / app_name / "initial_data"
+    if initial_data_dir.is_dir():
+        for path in initial_data_dir.iterdir():
+            if path.name.lower() == file_name.lower():
+                return path
+    raise FileNotFoundError(initial_data_dir / file_name)
+
+
+class ImportLedger:
+    """
+    Tracks the content hash of an imported file and of each of its rows, so that re-imports
+    can skip an unchanged file entirely and apply only added or changed rows.
+    """
+
+    def __init__(self, path, force=False):
+        self.path = str(path.relative_to(settings.BASE_DIR))
+        self.force = force
+        self.content_hash = get_file_hash(path)
+        self.imported_file = ImportedFile.objects.filter(path=self.path).first()
+        self.started = timezone.now()
+
+    def is_unchanged(self):
+        return (
+            not self.force
+            and self.imported_file is not None
+            and self.imported_file.content_hash == self.content_hash
+        )
+
+    def start(self):
+        if self.imported_file is None:
+            self.imported_file = ImportedFile.objects.create(
+                path=self.path, content_hash=""
+            )
+
+    def get_row_hashes(self, row_keys):
+        """
+        Returns the row hashes recorded by the previous import for the given row keys.
+        """
+        if self.force:
+            return {}
+        return dict(
+            self.imported_file.importedrow_set.filter(row_key__in=row_keys).values_list(
+                "row_key", "row_hash"
+            )
+        )
+
+    def save_rows(self, row_hashes):
+        ImportedRow.objects.bulk_create(
+            [
+                ImportedRow(
+                    imported_file=self.imported_file,
+                    row_key=row_key,
+                    row_hash=row_hash,
+                    imported_at=self.started,
+                )
+                for row_key, row_hash in row_hashes.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["imported_file", "row_key"],
+            update_fields=["row_hash", "imported_at"],
+        )
+
+    def finish(self, result):
+        """
+        Drops the rows that were not seen during this import and records the file hash.
+        The hash is cleared when rows were rejected, so the next import retries them
+        instead of skipping the file.
+        """
+        self.imported_file.importedrow_set.filter(imported_at__lt=self.started).delete()
+        self.imported_file.content_hash = "" if result.rejected else self.content_hash
+        self.imported_file.save()
+
+
+class RejectWriter:
+    """
+    Writes rows that failed validation, with the reason, to a CSV file opened on the first reject.
+    """
+
+    reason_column = "Reject Reason"
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, row, reason):
+        if self._writer is None:
+            self._file = open(self.path, mode="w", newline="")
+            self._writer = csv.DictWriter(
+                self._file,
+                fieldnames=[*row.keys(), self.reason_column],
+                delimiter=";",
+                extrasaction="ignore",
+            )
+            self._writer.writeheader()
+        self._writer.writerow({**row, self.reason_column: reason})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def format_validation_error(error):
+    if hasattr(error, "error_dict"):
+        return "; ".join(
+            f"{name}: {' '.join(messages)}"
+            for name, messages in error.message_dict.items()
+        )
+    return " ".join(error.messages)
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    existing: int = 0
+    rejected: int = 0
+    # (status, object or row) pairs, only collected when settings.IMPORT_DEBUG is on
+    debug_items: list = field(default_factory=list)
+
+    def add(self, status, items):
+        setattr(self, status, getattr(self, status) + len(items))
+        if settings.IMPORT_DEBUG:
+            self.debug_items.extend((status, item) for item in items)
+
+
+class BulkUpserter:
+    """
+    Streams rows into a model in batches inside a single transaction. Every row is validated
+    against the model's field validators, rows that fail go to the reject writer, and valid new rows
+    are inserted with bulk_create. Rows whose natural key already exists are skipped, unless an
+    ImportLedger is given, in which case rows that changed since the previous import are updated.
+    """
+
+    def __init__(self, model, unique_fields=None, batch_size=None):
+        self.model = model
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.unique_fields = (
+            [model._meta.get_field(name) for name in unique_fields]
+            if unique_fields
+            else get_natural_key_fields(model)
+        )
+        self.fields = {}
+        for model_field in model._meta.concrete_fields:
+            self.fields[model_field.name] = model_field
+            self.fields[model_field.attname] = model_field
+        self.update_fields = [
+            model_field.name
+            for model_field in model._meta.concrete_fields
+            if not model_field.primary_key
+            and model_field not in self.unique_fields
+            and not (model_field.one_to_one and model_field.remote_field.parent_link)
+        ]
+        self.foreign_keys = [
+            model_field
+            for model_field in model._meta.concrete_fields
+            if model_field.many_to_one
+            or (model_field.one_to_one and not model_field.remote_field.parent_link)
+        ]
+        # JSON values can't be reliably matched in SQL, so keys containing them are loaded up front
+        self._existing_keys = (
+            self.get_existing_keys()
+            if any(isinstance(f, models.JSONField) for f in self.unique_fields)
+            else None
+        )
+        self._column_names = {}
+
+    def get_field_name(self, column):
+        """
+        Returns the model field name for a source column such as "Name Plural", or None.
+        """
+        if column not in self._column_names:
+            formatted_column = column.strip().lower().replace(" ", "_")
+            self._column_names[column] = (
+                formatted_column if formatted_column in self.fields else None
+            )
+        return self._column_names[column]
+
+    def clean_row(self, row):
+        """
+        Maps source columns of a row onto model field names, dropping unknown columns.
+        """
+        data = {}
+        for column, value in row.items():
+            field_name = self.get_field_name(column)
+            if field_name is not None:
+                data[field_name] = value
+        return data
+
+    def build_object(self, data):
+        """
+        Returns an unsaved model instance for cleaned row data, raising ValidationError if a value
+        fails its field's validators. Foreign keys are checked per batch in check_foreign_keys().
+        """
+        values = {}
+        for name, value in data.items():
+            model_field = self.fields[name]
+            if (
+                value == ""
+                and model_field.null
+                and not model_field.empty_strings_allowed
+            ):
+                value = None
+            if model_field in self.foreign_keys:
+                try:
+                    value = model_field.to_python(value)
+                except ValidationError as e:
+                    raise ValidationError({model_field.name: e.messages})
+            values[model_field.attname] = value
+
+        obj = self.model(**values)
+        obj.clean_fields(
+            exclude={
+                model_field.name
+                for model_field in self.model._meta.concrete_fields
+                if model_field in self.foreign_keys or model_field.attname not in values
+            }
+        )
+        return obj
+
+    def check_foreign_keys(self, objects):
+        """
+        Returns a dict mapping natural keys of objects referencing missing rows to ValidationErrors.
+        """
+        errors = {}
+        for model_field in self.foreign_keys:
+            values = {
+                getattr(obj, model_field.attname)
+                for obj in objects.values()
+                if getattr(obj, model_field.attname) is not None
+            }
+            if not values:
+                continue
+            related_model = model_field.related_model
+            if (
+                is_reference_model(related_model)
+                and model_field.target_field.primary_key
+            ):
+                found = {
+                    value
+                    for value in values
+                    if get_by_id(related_model, value) is not None
+                }
+            else:
+                found = set(
+                    related_model._base_manager.filter(
+                        **{f"{model_field.target_field.attname}__in": values}
+                    ).values_list(model_field.target_field.attname, flat=True)
+                )
+            for key, obj in objects.items():
+                value = getattr(obj, model_field.attname)
+                if value is not None and value not in found:
+                    errors[key] = ValidationError(
+                        {
+                            model_field.name: f"{model_field.related_model.__name__} "
+                            f"'{value}' does not exist."
+                        }
+                    )
+        return errors
+
+    def _key_value(self, model_field, value):
+        value = model_field.to_python(value)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, sort_keys=True)
+        return value
+
+    def get_key(self, obj):
+        """
+        Returns the natural key of a model instance.
+        """
+        return tuple(
+            self._key_value(model_field, getattr(obj, model_field.attname))
+            for model_field in self.unique_fields
+        )
+
+    def get_existing_keys(self, keys=None):
+        """
+        Returns the natural keys that already exist in the database, out of keys if given.
+        """
+        if keys is not None and self._existing_keys is not None:
+            return self._existing_keys & set(keys)
+
+        attnames = [model_field.attname for model_field in self.unique_fields]
+        queryset = self.model.objects.all()
+        if keys is not None:
+            if not keys:
+                return set()
+            queryset = queryset.filter(
+                reduce(
+                    operator.or_, (models.Q(**dict(zip(attnames, key))) for key in keys)
+                )
+            )
+        return {
+            tuple(
+                self._key_value(model_field, value)
+                for model_field, value in zip(self.unique_fields, key)
+            )
+            for key in queryset.values_list(*attnames)
+        }
+
+    def run(self, rows, ledger=None, rejects=None):
+        """
+        Imports an iterable of rows (dicts of source columns or field names) batch by batch,
+        so memory use does not grow with the number of rows, and returns an ImportResult.
+        """
+        result = ImportResult()
+        with transaction.atomic():
+            if ledger is not None:
+                ledger.start()
+            for batch in batched(rows, self.batch_size):
+                self.import_batch(batch, result, ledger, rejects)
+            if ledger is not None:
+                ledger.finish(result)
+            # bulk writes send no signals, so a cached reference model is dropped on commit here
+            invalidate_reference_cache(self.model)
+        return result
+
+    def import_batch(self, batch, result, ledger=None, rejects=None):
+        objects = {}
+        source_rows = {}
+        row_hashes = {}
+        duplicates = []
+        for row in batch:
+            data = self.clean_row(row)
+            row_hash = get_hash(data)
+            try:
+                obj = self.build_object(data)
+            except ValidationError as e:
+                self.reject(row, e, result, rejects)
+                continue
+            key = self.get_key(obj)
+            if key in objects:
+                duplicates.append(data)
+                continue
+            objects[key] = obj
+            source_rows[key] = row
+            row_hashes[key] = row_hash
+        result.add("existing", duplicates)
+
+        for key, error in self.check_foreign_keys(objects).items():
+            del objects[key]
+            self.reject(source_rows[key], error, result, rejects)
+
+        existing_keys = self.get_existing_keys(list(objects))
+        row_keys = {key: json.dumps(key, default=str) for key in objects}
+        previous_row_hashes = (
+            ledger.get_row_hashes(row_keys.values()) if ledger is not None else {}
+        )
+        new_objects = []
+        changed_objects = []
+        unchanged_objects = []
+        for key, obj in objects.items():
+            if key not in existing_keys:
+                new_objects.append(obj)
+            elif (
+                ledger is not None
+                and previous_row_hashes.get(row_keys[key]) != row_hashes[key]
+            ):
+                changed_objects.append(obj)
+            else:
+                unchanged_objects.append(obj)
+
+        if new_objects:
+            result.add("created", self._create(new_objects))
+            if self._existing_keys is not None:
+                self._existing_keys.update(self.get_key(obj) for obj in new_objects)
+        if changed_objects:
+            result.add("updated", self._update(changed_objects))
+        result.add("existing", unchanged_objects)
+        if ledger is not None:
+            ledger.save_rows({row_keys[key]: row_hashes[key] for key in objects})
+
+    def reject(self, row, error, result, rejects):
+        reason = format_validation_error(error)
+        result.add("rejected", [(row, reason)])
+        if rejects is not None:
+            rejects.write(row, reason)
+
+    def _create(self, objects):
+        if self.model._meta.parents:
+            # bulk_create does not support multi-table inherited models
+            for obj in objects:
+                obj.save(force_insert=True)
+            return objects
+        if self.update_fields:
+            return self.model.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=[model_field.name for model_field in self.unique_fields],
+                update_fields=self.update_fields,
+            )
+        return self.model.objects.bulk_create(objects, ignore_conflicts=True)
+
+    def _update(self, objects):
+        if not self.model._meta.parents:
+            return self._create(objects)
+        for obj in objects:
+            key_lookup = {
+                model_field.attname: getattr(obj, model_field.attname)
+                for model_field in self.unique_fields
+            }
+            self.model.objects.filter(**key_lookup).update(
+                **{
+                    name: getattr(obj, self.fields[name].attname)
+                    for name in self.update_fields
+                }
+            )
+        return objects
+
+
+def write_import_result(command, model_name, result, rejects=None):
+    """
+    Writes the outcome of an import to the output of a management command.
+    """
+    for status, item in result.debug_items:
+        if status == "created":
+            message = command.style.SUCCESS(
+                f"Successfully created '{model_name}' object: '{item}'"
+            )
+        elif status == "updated":
+            message = command.style.SUCCESS(
+                f"Successfully updated '{model_name}' object: '{item}'"
+            )
+        elif status == "rejected":
+            row, reason = item
+            message = command.style.ERROR(
+                f"Rejected '{model_name}' row {row}: {reason}"
+            )
+        else:
+            message = command.style.WARNING(
+                f"'{model_name}' object '{item}' already exists"
+            )
+        command.stdout.write(message)
+
+    command.stdout.write(
+        command.style.SUCCESS(
+            f"Finished importing '{model_name}'. Created: {result.created}, "
+            f"Updated: {result.updated}, Already exists: {result.existing}"
+        )
+    )
+    if result.rejected:
+        location = f", see '{rejects.path}'" if rejects is not None else ""
+        command.stdout.write(
+            command.style.ERROR(f"Rejected {result.rejected} invalid rows{location}")
+        )
+
+
+def write_import_skipped(command, model_name, ledger):
+    command.stdout.write(
+        command.style.SUCCESS(
+            f"Skipped importing '{model_name}', '{ledger.path}' is unchanged"
+        )
+    )
@@ -0,0 +1,158 @@
+import binascii
+import json
+from base64 import b64decode, b64encode
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination that is applied only when the client asks for a page,
+    so small lookup tables keep returning plain lists.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.page_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        return super().paginate_queryset(queryset, request, view)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination for large catalogs, applied only when the client sends
+    `cursor` or `page_size`, so list endpoints keep returning plain lists by default.
+    Paginated responses are `{"next", "previous", "results"}`, where the links hold a cursor.
+
+    Rows are ordered on the view's `cursor_ordering`, which must end with a unique field.
+    A cursor holds the ordering values of the row a page starts after, and the next page is
+    filtered with `(name, id) > (last name, last id)`, so a deep page costs the same as the first
+    one, even through many equal names.
+    """
+
+    ordering = ("name", "id")
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "cursor_ordering", self.ordering))
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE
+        if self.page_size_query_param in request.query_params:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+            except ValueError:
+                pass
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        """
+        Returns (ordering values, whether the page goes backwards) of the request's cursor,
+        or None for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode(), altchars=b"-_"))
+            values, reverse = list(cursor["v"]), bool(cursor["r"])
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, obj, reverse):
+        values = [getattr(obj, name.lstrip("-")) for name in self.ordering]
+        cursor = json.dumps({"v": values, "r": reverse}, cls=DjangoJSONEncoder)
+        encoded = b64encode(cursor.encode(), altchars=b"-_").decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_keyset_filter(self, values, reverse):
+        """
+        Returns the condition of the rows coming after the given ordering values,
+        or before them when going backwards.
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            field_name = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") != reverse else "gt"
+            condition |= equal & Q(**{f"{field_name}__{lookup}": value})
+            equal &= Q(**{field_name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+        return self.get_page(queryset, request, view)
+
+    def get_page(self, queryset, request, view=None):
+        """
+        Returns the page of the request's cursor, whether or not the client asked for one.
+        """
+        self.ordering = self.get_ordering(view)
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[1]
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(*cursor))
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_link = (
+            self.encode_cursor(rows[-1], reverse=False) if rows and has_next else None
+        )
+        self.previous_link = (
+            self.encode_cursor(rows[0], reverse=True) if rows and has_previous else None
+        )
+        return rows
+
+    def get_next_link(self):
+        return self.next_link
+
+    def get_previous_link(self):
+        return self.previous_link
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.next_link,
+                "previous": self.previous_link,
+                "results": data,
+            }
+        )
@@ -0,0 +1,130 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+
+def _get_relation(model, name):
+    """
+    Returns the relation of the model accessed by the attribute name, or None.
+    """
+    try:
+        model_field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        model_field = next(
+            (
+                related_object
+                for related_object in model._meta.related_objects
+                if related_object.get_accessor_name() == name
+            ),
+            None,
+        )
+    if model_field is None or not model_field.is_relation:
+        return None
+    return model_field
+
+
+def _resolve_relations(model, source):
+    """
+    Returns (attribute name, relation) pairs traversed by a dotted serializer field source,
+    stopping at the first attribute that is not a relation.
+    """
+    relations = []
+    for name in source.split("."):
+        relation = _get_relation(model, name)
+        if relation is None:
+            break
+        relations.append((name, relation))
+        model = relation.related_model
+    return relations
+
+
+def get_related_lookups(serializer, prefix="", prefetch_only=False):
+    """
+    Inspects relational fields of a model serializer and returns a tuple of
+    (select_related, prefetch_related) lookups needed to serialize it without N+1 queries.
+
+    Arguments:
+    - serializer: Serializer instance to inspect.
+    - prefix: Lookup path of the serializer relative to the root model.
+    - prefetch_only: Whether the serializer sits below a multi-valued relation,
+      in which case every lookup has to be prefetched.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        return [], []
+
+    select_related = []
+    prefetch_related = []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        relations = _resolve_relations(model, field.source)
+        is_nested = isinstance(field, serializers.BaseSerializer)
+        reaches_relation = len(relations) == len(field.source.split("."))
+        if (
+            reaches_relation
+            and isinstance(field, PrimaryKeyRelatedField)
+            and not relations[-1][1].auto_created
+        ):
+            # Primary key of a forward relation is read from its "<name>_id" column
+            relations = relations[:-1]
+        if not relations:
+            continue
+
+        lookup = "__".join(
+            ([prefix] if prefix else []) + [name for name, _ in relations]
+        )
+        multi_valued = prefetch_only or any(
+            relation.many_to_many or relation.one_to_many for _, relation in relations
+        )
+        (prefetch_related if multi_valued else select_related).append(lookup)
+
+        if is_nested and reaches_relation:
+            nested_select, nested_prefetch = get_related_lookups(
+                field, lookup, prefetch_only=multi_valued
+            )
+            select_related.extend(nested_select)
+            prefetch_related.extend(nested_prefetch)
+
+    return _deduplicate(select_related), _deduplicate(prefetch_related)
+
+
+def get_loaded_fields(serializer):
+    """
+    Returns the names of the model fields read by a model serializer, to be loaded with `only()`,
+    or None when the serializer reads attributes that are not model fields.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = serializer.Meta.model
+    names = {model._meta.pk.name}
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            return None
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            model_field = _get_relation(model, name)
+        if model_field is None:
+            return None
+        if model_field.concrete and not model_field.many_to_many:
+            names.add(name)
+    return names
+
+
+def _deduplicate(lookups):
+    """
+    Removes duplicated lookups and lookups already covered by a longer one.
+    """
+    unique_lookups = list(dict.fromkeys(lookups))
+    return [
+        lookup
+        for lookup in unique_lookups
+        if not any(other.startswith(f"{lookup}__") for other in unique_lookups)
+    ]
@@ -0,0 +1,171 @@
+"""
+In-process cache of small reference tables listed in settings.REFERENCE_CACHE_MODELS.
+
+The first lookup of a model loads all of its rows in one query; later lookups by id or name are
+dictionary reads. Every model has a version, bumped once a transaction saving or deleting its rows,
+or bulk importing them, commits. Versions live in the cache alias named by
+settings.REFERENCE_CACHE_ALIAS, which must be shared by every process: a file based cache shares
+them between the processes of one host, a database, Memcached or Redis cache between hosts.
+A process reads the shared version of a table at most once every
+settings.REFERENCE_CACHE_CHECK_INTERVAL seconds, and reloads the table when it changed.
+Without an alias, versions are kept per process, and other processes keep their rows until restarted.
+
+Cached instances are shared between callers and must not be modified.
+"""
+
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+VERSION_KEY = "reference-cache:{key}"
+
+# {model: (version, rows by id, rows by name, names missed under the version)}
+_tables = {}
+# {version key: (time the shared version was read, version)}
+_versions = {}
+
+
+def get_cached_models():
+    """
+    Returns a dict mapping every cached reference model to the field its rows are named by.
+    """
+    return {
+        apps.get_model(label): name_field
+        for label, name_field in settings.REFERENCE_CACHE_MODELS.items()
+    }
+
+
+def is_reference_model(model):
+    return model._meta.label in settings.REFERENCE_CACHE_MODELS
+
+
+def _get_backend():
+    alias = settings.REFERENCE_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def get_shared_version(key, refresh=False):
+    """
+    Returns the version of a process-wide table shared between processes, reading it from the
+    REFERENCE_CACHE_ALIAS cache at most once every REFERENCE_CACHE_CHECK_INTERVAL seconds,
+    or right away with `refresh`. A table loaded under another version is stale.
+    """
+    backend = _get_backend()
+    now = time.monotonic()
+    checked = _versions.get(key)
+    if backend is not None and (
+        refresh
+        or checked is None
+        or now - checked[0] >= settings.REFERENCE_CACHE_CHECK_INTERVAL
+    ):
+        checked = (now, backend.get(VERSION_KEY.format(key=key)))
+        _versions[key] = checked
+    return None if checked is None else checked[1]
+
+
+def bump_shared_version(key, using=None):
+    """
+    Gives a process-wide table a new version once the current transaction commits,
+    so this process and the others sharing REFERENCE_CACHE_ALIAS reload it.
+    """
+
+    def bump():
+        version = uuid.uuid4().hex
+        _versions[key] = (time.monotonic(), version)
+        backend = _get_backend()
+        if backend is not None:
+            backend.set(VERSION_KEY.format(key=key), version, None)
+
+    transaction.on_commit(bump, using=using)
+
+
+def _get_table(model, refresh=False):
+    if not is_reference_model(model):
+        raise LookupError(f"{model._meta.label} is not a cached reference model")
+    version = get_shared_version(model._meta.label, refresh=refresh)
+    table = _tables.get(model)
+    if table is None or table[0] != version:
+        name_field = settings.REFERENCE_CACHE_MODELS[model._meta.label]
+        rows = list(model._base_manager.all())
+        table = (
+            version,
+            {row.pk: row for row in rows},
+            {getattr(row, name_field): row for row in rows},
+            set(),
+        )
+        _tables[model] = table
+    return table
+
+
+def get_by_id(model, pk):
+    """
+    Returns the cached row of a reference model with the given id, or None.
+    """
+    return _get_table(model)[1].get(pk)
+
+
+def get_by_name(model, name):
+    """
+    Returns the cached row of a reference model with the given name, or None.
+    The first miss of a name re-reads the shared version right away, and reloads the table if
+    another process changed it since it was loaded; later misses of the name under the same version
+    are answered from the table.
+    """
+    table = _get_table(model)
+    row = table[2].get(name)
+    if row is None and name not in table[3]:
+        table[3].add(name)
+        row = _get_table(model, refresh=True)[2].get(name)
+    return row
+
+
+def get_id_by_name(model, name):
+    """
+    Returns the id of the reference model row with the given name, or None.
+    """
+    row = get_by_name(model, name)
+    return None if row is None else row.pk
+
+
+def get_all(model):
+    """
+    Returns all cached rows of a reference model, ordered by id.
+    """
+    return sorted(_get_table(model)[1].values(), key=lambda row: row.pk)
+
+
+def invalidate_reference_cache(sender, **kwargs):
+    """
+    Bumps the versions of a reference model, or of the reference models it inherits from,
+    once the current transaction commits, so every process reloads their rows.
+    Nothing changes when the transaction is rolled back.
+    """
+    models = [
+        model
+        for model in (sender, *sender._meta.get_parent_list())
+        if is_reference_model(model)
+    ]
+    for model in models:
+        bump_shared_version(model._meta.label, using=kwargs.get("using"))
+
+
+def clear_reference_cache():
+    """
+    Drops the cached rows of every reference model and every shared version read in this process.
+    """
+    _tables.clear()
+    _versions.clear()
+
+
+def connect_signals():
+    cached_models = get_cached_models()
+    for model in apps.get_models():
+        if cached_models.keys().isdisjoint({model, *model._meta.get_parent_list()}):
+            continue
+        post_save.connect(invalidate_reference_cache, sender=model)
+        post_delete.connect(invalidate_reference_cache, sender=model)
@@ -0,0 +1,113 @@
+import copy
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from utils.reference_cache import get_by_id, is_reference_model
+
+
+class ReferenceRelatedField(PrimaryKeyRelatedField):
+    """
+    Primary key related field reading unfiltered reference models from utils.reference_cache
+    instead of querying the database for every value. Other querysets are looked up as usual.
+    Validated data gets a copy of the cached row, so changing it leaves the cache untouched.
+    """
+
+    def to_internal_value(self, data):
+        queryset = self.get_queryset()
+        if not is_reference_model(queryset.model) or queryset.query.has_filters():
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = queryset.model._meta.pk.to_python(data)
+        except (TypeError, ValueError, ValidationError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        obj = get_by_id(queryset.model, pk)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return copy.copy(obj)
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    Model serializer keeping only the field names given in `fields`, and replacing the related
+    fields named in `expand` with read-only nested serializers of the related objects.
+    Empty `fields` keep every field, and unknown names raise a ValidationError.
+    CustomModelViewSet passes both from the `?fields=` and `?expand=` query parameters,
+    and selects or prefetches expanded objects like any nested serializer.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_fields = fields or None
+        self.requested_expand = expand or ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        errors = {}
+        for parameter, names in (
+            ("fields", self.requested_fields or ()),
+            ("expand", self.requested_expand),
+        ):
+            unknown = [name for name in names if name not in fields]
+            if unknown:
+                errors[parameter] = [f"Unknown fields: {', '.join(unknown)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        for name in self.requested_expand:
+            fields[name] = get_expanded_field(self.Meta.model, name, fields[name])
+        if self.requested_fields is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in self.requested_fields
+            }
+        return fields
+
+
+_expanded_serializers = {}
+
+
+def get_expanded_serializer_class(model):
+    """
+    Returns a serializer of all fields of the model, used for expanded relations.
+    """
+    if model not in _expanded_serializers:
+        meta = type("Meta", (), {"model": model, "fields": "__all__"})
+        _expanded_serializers[model] = type(
+            f"Expanded{model.__name__}Serializer",
+            (DynamicFieldsModelSerializer,),
+            {"Meta": meta},
+        )
+    return _expanded_serializers[model]
+
+
+def get_expanded_field(model, name, field):
+    """
+    Returns a read-only nested serializer replacing the related field, or the field itself
+    when it is not a model relation.
+    """
+    source = field.source or name
+    if source == "*" or "." in source:
+        return field
+    try:
+        relation = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return field
+    if not relation.is_relation:
+        return field
+    source = {} if source == name else {"source": source}
+    return get_expanded_serializer_class(relation.related_model)(
+        many=relation.many_to_many or relation.one_to_many, read_only=True, **source
+    )
+
+
+class ReferenceModelSerializer(DynamicFieldsModelSerializer):
+    """
+    Model serializer resolving related reference model rows through utils.reference_cache.
+    """
+
+    serializer_related_field = ReferenceRelatedField
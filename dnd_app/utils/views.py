@@ -1,14 +1,65 @@
-from django.db import IntegrityError
+import hashlib
+import json
+import re
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.utils.text import compress_sequence
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from utils.batch import bulk_create, bulk_update, find_integrity_errors
+from utils.prefetch import get_loaded_fields, get_related_lookups
+from utils.serializers import DynamicFieldsModelSerializer
+
+DELETE_INTEGRITY_ERROR = (
+    "This object cannot be deleted because it has dependent objects."
+)
+SAVE_INTEGRITY_ERROR = "This object conflicts with an existing object."
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+
+
+def get_content_etag(data):
+    """
+    Returns a strong ETag built from the hash of the serialized response data.
+    """
+    content = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return f'"{hashlib.sha256(content.encode()).hexdigest()}"'
 
 
 class CustomModelViewSet(viewsets.ModelViewSet):
     """
     Custom viewset to override the get_view_name method.
+    Set `pagination_class = KeysetCursorPagination` to let clients page through large catalogs
+    with a keyset cursor ordered on `cursor_ordering`. Lists stay plain unless `cursor`
+    or `page_size` is given, then they return `{"next", "previous", "results"}`.
+
+    Related objects used by the serializer are joined or prefetched automatically.
+    Set `select_related_fields` or `prefetch_related_fields` to override the automatic plan.
+
+    Read requests of DynamicFieldsModelSerializer serializers accept `?fields=` with the comma
+    separated fields to return, which are the only columns loaded when all of them are model
+    fields, and `?expand=` with the related fields to return as nested objects.
+
+    The `batch/` action creates, partially updates or deletes up to `batch_max_size` objects
+    in one transaction, see `batch`.
     """
 
     custom_view_name = None
+    cursor_ordering = ("name", "id")
+    select_related_fields = None
+    prefetch_related_fields = None
+    batch_max_size = 1000
+
+    _related_lookups_cache = {}
 
     def get_view_name(self):
         return (
@@ -17,6 +68,106 @@ class CustomModelViewSet(viewsets.ModelViewSet):
             else self.custom_view_name
         )
 
+    def get_requested_names(self, parameter):
+        """
+        Returns the comma separated names of a query parameter of a read request,
+        or None when the parameter is missing or empty.
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(parameter, "")
+        return [name.strip() for name in value.split(",") if name.strip()] or None
+
+    def get_requested_serializer(self):
+        """
+        Returns the serializer trimmed or expanded by the `fields` and `expand` query parameters,
+        or None when neither is given.
+        """
+        serializer_class = self.get_serializer_class()
+        fields = self.get_requested_names("fields")
+        expand = self.get_requested_names("expand")
+        if not issubclass(serializer_class, DynamicFieldsModelSerializer) or (
+            fields is None and not expand
+        ):
+            return None
+        return serializer_class(
+            context=self.get_serializer_context(), fields=fields, expand=expand
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), DynamicFieldsModelSerializer):
+            kwargs.setdefault("fields", self.get_requested_names("fields"))
+            kwargs.setdefault("expand", self.get_requested_names("expand"))
+        return super().get_serializer(*args, **kwargs)
+
+    def get_related_lookups(self, serializer=None):
+        """
+        Returns (select_related, prefetch_related) lookups for the current serializer.
+        Lookups of a trimmed or expanded serializer are added to the overrides, and not cached.
+        """
+        if serializer is not None:
+            select_related, prefetch_related = get_related_lookups(serializer)
+            return (
+                list(
+                    dict.fromkeys(
+                        [*(self.select_related_fields or ()), *select_related]
+                    )
+                ),
+                list(
+                    dict.fromkeys(
+                        [*(self.prefetch_related_fields or ()), *prefetch_related]
+                    )
+                ),
+            )
+
+        serializer_class = self.get_serializer_class()
+        cache_key = (type(self), serializer_class)
+        if cache_key not in self._related_lookups_cache:
+            select_related, prefetch_related = get_related_lookups(
+                serializer_class(context=self.get_serializer_context())
+            )
+            if self.select_related_fields is not None:
+                select_related = list(self.select_related_fields)
+            if self.prefetch_related_fields is not None:
+                prefetch_related = list(self.prefetch_related_fields)
+            self._related_lookups_cache[cache_key] = (select_related, prefetch_related)
+        return self._related_lookups_cache[cache_key]
+
+    def get_loaded_fields(self, serializer, select_related):
+        """
+        Returns the fields to load for a trimmed serializer, or None to load every field.
+        Relations followed by select_related and the cursor ordering are always loaded.
+        """
+        if serializer.requested_fields is None:
+            return None
+        fields = get_loaded_fields(serializer)
+        if fields is None:
+            return None
+        model = serializer.Meta.model
+        concrete_names = {field.name for field in model._meta.concrete_fields}
+        fields.update(lookup.split("__")[0] for lookup in select_related)
+        fields.update(
+            name.lstrip("-")
+            for name in self.cursor_ordering
+            if name.lstrip("-") in concrete_names
+        )
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_requested_serializer()
+        select_related, prefetch_related = self.get_related_lookups(serializer)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if serializer is not None:
+            loaded_fields = self.get_loaded_fields(serializer, select_related)
+            if loaded_fields:
+                queryset = queryset.only(*loaded_fields)
+        return queryset
+
     def destroy(self, request, *args, **kwargs):
         object = self.get_object()
         try:
@@ -24,8 +175,181 @@ class CustomModelViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_204_NO_CONTENT)
         except IntegrityError:
             return Response(
-                {
-                    "detail": "This object cannot be deleted because it has dependent objects."
-                },
+                {"detail": DELETE_INTEGRITY_ERROR},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def batch(self, request):
+        """
+        Writes many objects in one transaction: POST a list of new objects, PATCH a list of
+        partial objects with their `id`, or DELETE a list of ids.
+        Every item is validated before anything is written. When any item is invalid nothing
+        is written, and the 400 response lists the errors of every item, in payload order.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"detail": "Expected a list of items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.batch_max_size:
+            return Response(
+                {"detail": f"At most {self.batch_max_size} items can be sent at once."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.method == "POST":
+            return self.batch_create(items)
+        if request.method == "PATCH":
+            return self.batch_update(items)
+        return self.batch_destroy(items)
+
+    def batch_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                self.perform_batch_create(serializer)
+        except IntegrityError:
+            failed = find_integrity_errors(
+                serializer.validated_data,
+                lambda validated_data: serializer.child.create(dict(validated_data)),
+            )
+            return self.get_batch_error_response(items, failed, SAVE_INTEGRITY_ERROR)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def batch_update(self, items):
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        instances, errors = self.get_batch_instances(ids)
+        serializers = []
+        for index, (item, instance) in enumerate(zip(items, instances)):
+            if errors[index]:
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if serializer.is_valid():
+                serializers.append(serializer)
+            else:
+                errors[index] = serializer.errors
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                instances = self.perform_batch_update(serializers)
+        except IntegrityError:
+            failed = find_integrity_errors(
+                serializers, lambda serializer: serializer.save()
+            )
+            return self.get_batch_error_response(items, failed, SAVE_INTEGRITY_ERROR)
+        return Response(self.get_serializer(instances, many=True).data)
+
+    def batch_destroy(self, items):
+        instances, errors = self.get_batch_instances(items)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            with transaction.atomic():
+                self.perform_batch_destroy(instances)
+        except IntegrityError:
+            failed = find_integrity_errors(
+                instances, lambda instance: instance.delete()
+            )
+            return self.get_batch_error_response(items, failed, DELETE_INTEGRITY_ERROR)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def get_batch_instances(self, ids):
+        """
+        Returns the objects with the given ids, in one query, and the error of every id
+        that is missing, invalid, unknown or listed more than once.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        pk_field = queryset.model._meta.pk
+        pks = []
+        errors = []
+        for pk in ids:
+            try:
+                pk = None if pk is None else pk_field.to_python(pk)
+            except ValidationError:
+                pk = None
+            if pk is None:
+                errors.append({"id": ["A valid id is required."]})
+            elif pk in pks:
+                errors.append({"id": ["This id is listed more than once."]})
+            else:
+                errors.append({})
+            pks.append(pk)
+
+        found = queryset.in_bulk([pk for pk in pks if pk is not None])
+        for index, pk in enumerate(pks):
+            if not errors[index] and pk not in found:
+                errors[index] = {"id": ["Not found."]}
+        return [found.get(pk) for pk in pks], errors
+
+    def get_batch_error_response(self, items, failed, message):
+        errors = [{} for _ in items]
+        for index in failed:
+            errors[index] = {"detail": message}
+        if not failed:
+            errors = {"detail": message}
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def perform_batch_create(self, serializer):
+        return bulk_create(serializer)
+
+    def perform_batch_update(self, serializers):
+        return bulk_update(serializers)
+
+    def perform_batch_destroy(self, instances):
+        self.get_queryset().model._default_manager.filter(
+            pk__in=[instance.pk for instance in instances]
+        ).delete()
+
+    def get_conditional_response(self, request, data):
+        """
+        Returns the data with a content-hash ETag, or an empty 304 response
+        if the client already has the current version.
+        """
+        etag = get_content_etag(data)
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(data, headers={"ETag": etag})
+
+
+class ExportMixin:
+    """
+    Adds an `export/` action to a CustomModelViewSet, streaming every object of the filtered
+    queryset as newline delimited JSON, for clients downloading a whole catalog.
+    Rows are read `export_chunk_size` at a time, `IMPORT_BATCH_SIZE` by default.
+    """
+
+    export_chunk_size = None
+
+    def get_export_lines(self, queryset, serializer):
+        """
+        Yields every object of the queryset serialized as one line of JSON.
+        """
+        chunk_size = self.export_chunk_size or settings.IMPORT_BATCH_SIZE
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            data = serializer.to_representation(obj)
+            yield json.dumps(
+                data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+            ).encode() + b"\n"
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Streams every object matching the filters as NDJSON, one object per line.
+        Objects are serialized one by one while the response is sent, so memory use does not grow
+        with the catalog. The stream is gzipped when the client accepts gzip.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        lines = self.get_export_lines(queryset, self.get_serializer())
+        gzipped = ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if gzipped:
+            lines = compress_sequence(lines)
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        if gzipped:
+            response.headers["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response